@@ -0,0 +1,203 @@
+"""
+Exhaustive model counting sharded over a process pool.
+
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from bertrand.language_services.dictionaries.errors import Errors
+from bertrand.analytical_engine.boole_table import (bitwise_form,
+    run_bitwise, variable_mask, verdict)
+
+# log2 of the rows evaluated per bit-parallel block
+_BLOCK_BITS = 16
+
+class ModelCount:
+    """
+    Result of an exhaustive count: identifiers, the number of rows, the
+    number of satisfying rows, and the first satisfying row and first
+    counterexample (row indexes numbered as Boole numbers them; None when
+    there is none).
+    """
+    __slots__ = ("identifiers", "rows", "satisfying", "first_satisfying",
+        "first_counterexample")
+
+    def __init__(self, identifiers, rows, satisfying, first_satisfying,
+        first_counterexample):
+        self.identifiers = identifiers
+        self.rows = rows
+        self.satisfying = satisfying
+        self.first_satisfying = first_satisfying
+        self.first_counterexample = first_counterexample
+
+    @property
+    def verdict(self):
+        """'tautology', 'contradiction' or 'contingency'."""
+        return verdict(self.satisfying, self.rows)
+
+    def assignment(self, row):
+        """The identifiers' values in row, as a name -> bool dict."""
+        count = len(self.identifiers)
+        return {name: bool((row >> (count - 1 - i)) & 1) for i, name in
+            enumerate(self.identifiers)}
+
+    def report(self):
+        """One-line summary, as the evaluator prints it."""
+        line = f"{self.verdict} ({self.satisfying} of {self.rows} rows true)"
+        if self.first_counterexample is not None and self.satisfying:
+            falsified = ", ".join(f"{name}={value}" for name, value in
+                self.assignment(self.first_counterexample).items())
+            line += f"; first counterexample: {falsified}"
+        return line
+
+    def to_map(self):
+        """Summary as a JSON-ready dict."""
+        return {
+            "identifiers": list(self.identifiers),
+            "rows": self.rows,
+            "satisfying": self.satisfying,
+            "verdict": self.verdict,
+            "first_satisfying": self.first_satisfying,
+            "first_counterexample": self.first_counterexample,
+        }
+
+def _prepare(code, slots, values, keys, count):
+    # rebuild the bitwise forms from the opcodes' truth tables; lambdas do
+    # not pickle, so workers get the tables
+    bitwise = [None if key is None else bitwise_form(key) for key in keys]
+    arity = [0 if key is None else (1 if len(key) == 2 else 2) for key in
+        keys]
+    return code, slots, values, bitwise, arity, count
+
+# The statement a worker process counts, set once per worker by the pool
+# initializer
+_STATEMENT = None
+
+def _load_statement(*statement):
+    global _STATEMENT # pylint: disable=global-statement
+    _STATEMENT = _prepare(*statement)
+
+def _count_range(bounds):
+    return _count(_STATEMENT, bounds)
+
+def _count(prepared, bounds):
+    """
+    Count rows lo .. hi - 1 of a prepared statement, block by block, lo
+    being a multiple of the block size; return (satisfying, first
+    satisfying row, first counterexample row), the rows None when there
+    are none.
+    """
+    lo, hi = bounds
+    code, slots, values, bitwise, arity, count = prepared
+    block = 1 << min(_BLOCK_BITS, count)
+    full = (1 << block) - 1
+    low_bits = min(_BLOCK_BITS, count)
+    # identifiers on the low bits repeat the same pattern in every block;
+    # the others are constant across a block
+    low = {count - 1 - i: variable_mask(i - (count - low_bits), low_bits)
+        for i in range(count - low_bits, count)}
+
+    satisfying = 0
+    first_sat = first_cex = None
+    for start in range(lo, hi, block):
+        masks = [low[bit] if bit in low else (full if (start >> bit) & 1
+            else 0) for bit in range(count - 1, -1, -1)]
+        leaves = [masks[slot] if slot is not None else (full if value else 0)
+            for slot, value in zip(slots, values)]
+        result = run_bitwise(code, leaves, full, bitwise, arity)
+        # a last block cut short by hi only counts the rows before hi
+        rows = full if hi - start >= block else (1 << (hi - start)) - 1
+        result &= rows
+
+        satisfying += result.bit_count()
+        if first_sat is None and result:
+            first_sat = start + (result & -result).bit_length() - 1
+        missed = rows ^ result
+        if first_cex is None and missed:
+            first_cex = start + (missed & -missed).bit_length() - 1
+    return satisfying, first_sat, first_cex
+
+def _shards(rows, workers):
+    """
+    Row ranges for a pool of workers: about eight per worker, so a slow
+    range does not hold up the rest, each a whole number of blocks.
+    """
+    block = 1 << _BLOCK_BITS
+    shard = max(block, rows // (workers * 8) // block * block)
+    return [(lo, min(lo + shard, rows)) for lo in range(0, rows, shard)]
+
+class Amdahl:
+    """
+    Sharded model counter. The 2^n rows of a statement are split into
+    independent index ranges, counted bit-parallel in a ProcessPoolExecutor
+    and merged into the satisfying count, the first satisfying row and the
+    first counterexample. Each worker receives the lowered statement once,
+    through the pool initializer, and then only row ranges.
+
+    count() is what the evaluator calls for each statement: it counts in
+    this process up to the truth-table limit of the Boole engine and goes
+    to count_batch() above it. count_batch() takes statements of up to
+    max_variables identifiers and starts a pool for those with more than
+    parallel_threshold.
+    """
+
+    parallel_threshold = 25
+    max_variables = 40
+
+    def __init__(self, boole, workers=None):
+        self.boole = boole
+        self.workers = workers or os.cpu_count() or 1
+
+    def _statement(self, rpn, limit):
+        # (identifiers, the statement as _prepare() takes it), or None
+        lowered = self.boole.lower(rpn)
+        if lowered is None:
+            return None
+        program, identifiers, slots = lowered
+        count = len(identifiers)
+        if count > limit:
+            raise Errors("Too many identifiers to count exhaustively: " +
+                f"{count} (at most {limit})")
+        return identifiers, (program.code, slots, program.values,
+            self.boole.keys, count)
+
+    def count(self, rpn):
+        """
+        ModelCount of rpn, or None if it has no truth table: counted in
+        this process up to the Boole engine's limit, and as count_batch()
+        counts it above.
+        """
+        shape = self._statement(rpn, self.max_variables)
+        if shape is None:
+            return None
+        identifiers, statement = shape
+        if len(identifiers) > self.boole.max_variables:
+            return self._sharded(identifiers, statement)
+        rows = 1 << len(identifiers)
+        return ModelCount(identifiers, rows,
+            *_count(_prepare(*statement), (0, rows)))
+
+    def count_batch(self, rpn):
+        """
+        ModelCount of rpn, sharded over a pool of self.workers processes
+        above parallel_threshold identifiers, or None if it has no truth
+        table.
+        """
+        shape = self._statement(rpn, self.max_variables)
+        if shape is None:
+            return None
+        return self._sharded(*shape)
+
+    def _sharded(self, identifiers, statement):
+        count = len(identifiers)
+        rows = 1 << count
+        if count <= self.parallel_threshold or self.workers == 1:
+            parts = [_count(_prepare(*statement), (0, rows))]
+        else:
+            with ProcessPoolExecutor(self.workers, initializer=_load_statement,
+                initargs=statement) as pool:
+                parts = list(pool.map(_count_range, _shards(rows,
+                    self.workers)))
+
+        return ModelCount(identifiers, rows, sum(part[0] for part in parts),
+            next((part[1] for part in parts if part[1] is not None), None),
+            next((part[2] for part in parts if part[2] is not None), None))
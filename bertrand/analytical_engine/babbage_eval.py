@@ -2,13 +2,175 @@
 Step 3. Evaluation of the parsed list.
 
 """
+from bisect import bisect_left
+from operator import itemgetter
 from bertrand.language_services.dictionaries.errors import Errors
+from bertrand.language_services.dictionaries.operators import (OPERATORS,
+    BY_OPCODE, operator_of)
+from bertrand.language_services.dictionaries.hashing_func import \
+    canonical_string
+from bertrand.analytical_engine.lovelace_compile import Lovelace
+from bertrand.analytical_engine.jacquard_vm import Jacquard
+from bertrand.analytical_engine.boole_table import Boole
+from bertrand.analytical_engine.hollerith_batch import Hollerith
+from bertrand.analytical_engine.gray_pages import Gray
+from bertrand.analytical_engine.amdahl_shards import Amdahl
+from bertrand.analytical_engine.davis_sat import Davis
+from bertrand.analytical_engine.bryant_bdd import Bryant
+from bertrand.analytical_engine.frege_terms import Frege, Term
+from bertrand.analytical_engine.quine_simplify import Quine
+
+# Selectable evaluators; "knuth" is the dict-per-token interpreter (with the
+# Lovelace statement compiler), "jacquard" the bytecode VM and "boole" the
+# truth-table mode, which reports each statement's model count instead of
+# its value; "davis" reports whether each statement is a tautology, a
+# contradiction or a contingency, with a counterexample, from a SAT solver;
+# "bryant" reports each statement in canonical form, from its decision
+# diagram, so equivalent statements print the same.
+EVAL_ENGINES = ("knuth", "jacquard", "boole", "davis", "bryant")
+
+_SUBST = OPERATORS['/'].opcode
+_MEMBERSHIP = frozenset({OPERATORS['∈'].opcode, OPERATORS['∉'].opcode})
+
+# What evaluation reads off a token
+_TOKEN_KEY = itemgetter('token_type', 'lexeme', 'value')
+
+def _token_key(tok):
+    """
+    Hashable key of what evaluation reads off a token; unhashable lexemes
+    (sets) go through canonical_string().
+    """
+    key = (tok['token_type'], tok.get('lexeme'), tok.get('value', "unknown"))
+    try:
+        hash(key)
+    except TypeError:
+        return canonical_string(key)
+    return key
+
+def _statement_key(rpn):
+    """Hashable key of what evaluation reads off every token of rpn."""
+    try:
+        key = tuple(map(_TOKEN_KEY, rpn))
+        hash(key)
+    except (KeyError, TypeError):
+        return tuple(map(_token_key, rpn))
+    return key
+
+# Connectives a left operand decides whatever the right one is: the left
+# value that decides each, and the result, as its Knuth method gives them
+_DECIDED = {'and_': (False, False), 'inc_or': (True, True), 'imp': (False,
+    True), 'nand': (False, True), 'nor': (True, False)}
+_SHORT_CIRCUIT = {op.opcode: _DECIDED[op.evaluator] for op in BY_OPCODE if
+    op is not None and op.evaluator in _DECIDED}
+
+def _lexeme_key(lex):
+    # lexemes that cannot be dict keys (sets) are keyed by their contents
+    try:
+        hash(lex)
+    except TypeError:
+        return canonical_string(lex)
+    return lex
+
+class _Occurrences:
+    """
+    Where Knuth.subst() finds its targets in one statement: the positions
+    of the identifiers by lexeme, and of the tokens carrying an 'index' by
+    its value. Built once per statement and kept in step as substitutions
+    respell identifiers, so a substitution costs time in proportion to the
+    tokens it rewrites.
+    """
+
+    def __init__(self, rpn):
+        self.rpn = rpn
+        self.by_lexeme = {}     # lexeme key -> set of positions
+        self.by_index = {}      # index -> ascending positions
+        for pos, tok in enumerate(rpn):
+            if 'index' in tok:
+                self.by_index.setdefault(_lexeme_key(tok['index']),
+                    []).append(pos)
+            if tok.get('token_type') == 'identifier':
+                self.by_lexeme.setdefault(_lexeme_key(tok.get('lexeme')),
+                    set()).add(pos)
+
+    def identifiers(self, lex):
+        """Positions of the identifiers spelled lex."""
+        return self.by_lexeme.get(_lexeme_key(lex), ())
+
+    def indexed(self, index, start):
+        """First position from start of a token with this index, or None."""
+        positions = self.by_index.get(_lexeme_key(index))
+        if not positions:
+            return None
+        i = bisect_left(positions, start)
+        return positions[i] if i < len(positions) else None
+
+    def respell(self, pos, old, new):
+        """The identifier at pos is now spelled new instead of old."""
+        self.by_lexeme[_lexeme_key(old)].discard(pos)
+        self.by_lexeme.setdefault(_lexeme_key(new), set()).add(pos)
+
+    def respell_all(self, old, new):
+        """Every identifier spelled old is now spelled new."""
+        moved = self.by_lexeme.pop(_lexeme_key(old), None)
+        if moved:
+            self.by_lexeme.setdefault(_lexeme_key(new), set()).update(moved)
+
+def _set_to_string(d):
+    # module-level, as a recursive closure would leave a reference cycle
+    # behind for every line printed
+    parts = []
+    for v in d.values():
+        parts.append(_set_to_string(v) if isinstance(v, dict) else str(v))
+    return '{' + ', '.join(parts) + '}'
 
 # pylint: disable=missing-function-docstring
 class Knuth:
     """The Spock Evaluator/Interpreter."""
-    def __init__(self, code):
+
+    # statement compiler shared across requests, so formulas that keep
+    # coming back are compiled once; None interprets every statement
+    jit = Lovelace()
+
+    # simplifier run over each statement before the knuth and jacquard
+    # engines evaluate it (the reporting engines keep every identifier);
+    # None evaluates statements as written
+    simplifier = Quine()
+
+    # subterm values are shared across a document until this many of its
+    # statements have been evaluated without reusing one; from then on its
+    # statements are evaluated on their own (whole statements still are)
+    sharing_probe = 64
+
+    # bytecode VM, built from the operator methods on first use, and the
+    # truth-table, batch, paging, counting and SAT engines built over it
+    _jacquard = None
+    _boole = None
+    _hollerith = None
+    _gray = None
+    _amdahl = None
+    _davis = None
+
+    def __init__(self, code, eval_engine="knuth"):
         self.code = code
+        self.eval_engine = eval_engine
+        # decision diagrams of this document, shared by its statements
+        self._bryant = None
+        # residual terms of this document (of one statement when
+        # streaming), spelled only when printed
+        self.terms = Frege()
+        # results shared across this document's statements: by statement
+        # key (None when streaming), and by subterm shape, each shape a
+        # number in _shapes
+        self._results = {}
+        self._values = {}
+        self._shapes = {}
+        self._shared = 0        # subterm values reused, and statements
+        self._probed = 0        # looked at for them
+        # substitution targets of the statement being evaluated
+        self._occurrences = None
+        # evaluator method per opcode, resolved once from the registry
+        self._dispatch = [getattr(self, op.evaluator) if op is not None and
+            op.evaluator else None for op in BY_OPCODE]
 
     def bool_values(self, rpn):
         """
@@ -26,36 +188,40 @@ class Knuth:
                 elif lex in ('⊥', 'F', 'False', 'false', '∅', '0'):
                     t['value'] = False
 
-
-    _unary_ops = ("¬", "!", "∃", "∀", "¬∃", "¬∀", "!∃", "!∀")
-
     def _res_bldr(self, res):
         if isinstance(res, dict):
             return res
         if isinstance(res, bool):
             return {'lexeme': res, 'token_type': 'boolean', 'value': res}
-        if isinstance(res, str):
+        if isinstance(res, (str, Term)):
             return {'lexeme': res, 'token_type': 'identifier', 'value': "unknown"}
         return {'lexeme': repr(res), 'token_type': 'identifier', 'value': "unknown"}
 
     def _eval_unary(self, op, a):
+        operator = OPERATORS.get(op)
+        if operator is None or operator.arity != 1:
+            raise Errors(f"Unknown unary operator: {op}")
+        return self._dispatch[operator.opcode](a)
+
+    def neg(self, a):
         a_val = a.get("value")
-        a_lex = a.get("lexeme")
+        return self.terms.term("¬", a.get('lexeme')) if a_val == "unknown" else (not a_val)
 
-        if op in ("¬", "!"):
-            return f"(¬{a_lex})" if a_val == "unknown" else (not a_val)
+    def exists(self, a):
+        a_val = a.get("value")
+        return self.terms.term("∃", a.get('lexeme')) if a_val == "unknown" else a_val
 
-        if op in ("∃", "¬∃", "!∃"):
-            if op in ("¬∃", "!∃"):
-                return f"(¬∃{a_lex})" if a_val == "unknown" else (not a_val)
-            return f"(∃{a_lex})" if a_val == "unknown" else a_val
+    def not_exists(self, a):
+        a_val = a.get("value")
+        return self.terms.term("¬∃", a.get('lexeme')) if a_val == "unknown" else (not a_val)
 
-        if op in ("∀", "¬∀", "!∀"):
-            if op in ("¬∀", "!∀"):
-                return f"(¬∀{a_lex})" if a_val == "unknown" else (not a_val)
-            return f"(∀{a_lex})" if a_val == "unknown" else a_val
+    def for_all(self, a):
+        a_val = a.get("value")
+        return self.terms.term("∀", a.get('lexeme')) if a_val == "unknown" else a_val
 
-        raise Errors(f"Unknown unary operator: {op}")
+    def not_for_all(self, a):
+        a_val = a.get("value")
+        return self.terms.term("¬∀", a.get('lexeme')) if a_val == "unknown" else (not a_val)
 
     def and_(self, a, b):
         a_val = a["value"]
@@ -65,7 +231,7 @@ class Knuth:
 
         if ((a_val == "unknown") and (b_val in ("unknown", True))) or \
            ((b_val == "unknown") and (a_val in ("unknown", True))):
-            return f"({a_lex} ∧ {b_lex})"
+            return self.terms.term(" ∧ ", a_lex, b_lex)
         if False in (a_val, b_val):
             return False
         return (a_val and b_val)
@@ -78,7 +244,7 @@ class Knuth:
 
         if ((a_val == "unknown") and (b_val in ("unknown", False))) or \
            ((b_val == "unknown") and (a_val in ("unknown", False))):
-            return f"({a_lex} ∨ {b_lex})"
+            return self.terms.term(" ∨ ", a_lex, b_lex)
         if True in (a_val, b_val):
             return True
         return (a_val or b_val)
@@ -91,7 +257,7 @@ class Knuth:
 
         if ((a_val == "unknown") and (b_val in ("unknown", True))) or \
            ((b_val == "unknown") and (a_val in ("unknown", True))):
-            return f"({a_lex} ↑ {b_lex})"
+            return self.terms.term(" ↑ ", a_lex, b_lex)
         if False in (a_val, b_val):
             return True
         return not (a_val and b_val)
@@ -104,7 +270,7 @@ class Knuth:
 
         if ((a_val == "unknown") and (b_val in ("unknown", False))) or \
            ((b_val == "unknown") and (a_val in ("unknown", False))):
-            return f"({a_lex} ↓ {b_lex})"
+            return self.terms.term(" ↓ ", a_lex, b_lex)
         if True in (a_val, b_val):
             return False
         return not (a_val or b_val)
@@ -116,7 +282,7 @@ class Knuth:
         b_lex = b.get("lexeme")
 
         if (a_val == "unknown") or (b_val == "unknown"):
-            return f"({a_lex} ⨁ {b_lex})"
+            return self.terms.term(" ⨁ ", a_lex, b_lex)
         return (a_val and (not b_val)) or ((not a_val) and b_val)
 
     def imp(self, a, b):
@@ -131,7 +297,7 @@ class Knuth:
             return True
         if (a_val != "unknown") and (b_val != "unknown"):
             return (not a_val) or b_val
-        return f"({a_lex} → {b_lex})"
+        return self.terms.term(" → ", a_lex, b_lex)
 
     def bi_imp(self, a, b):
         a_val = a["value"]
@@ -140,7 +306,7 @@ class Knuth:
         b_lex = b.get("lexeme")
 
         if (a_val == "unknown") or (b_val == "unknown"):
-            return f"({a_lex} ↔ {b_lex})"
+            return self.terms.term(" ↔ ", a_lex, b_lex)
         return (a_val and b_val) or ((not a_val) and (not b_val))
 
     def eqv(self, a, b):
@@ -150,13 +316,13 @@ class Knuth:
         b_lex = b.get("lexeme")
 
         if (a_val == "unknown") or (b_val == "unknown"):
-            return f"({a_lex} ≡ {b_lex})"
+            return self.terms.term(" ≡ ", a_lex, b_lex)
         return (a_val and b_val) or ((not a_val) and (not b_val))
 
     def memb(self, op, a, b):
         a_lex = a.get("lexeme")
         b_lex = b.get("lexeme")
-        return f"({a_lex} {op} {b_lex})"
+        return self.terms.term(f" {op} ", a_lex, b_lex)
 
     def subst(self, rpn, a, b):
         a_val = a.get("value")
@@ -164,22 +330,17 @@ class Knuth:
         a_lex = a.get("lexeme")
         b_lex = b.get("lexeme")
 
-        def next_pos_by_index_value(start_pos, target_index, key='index'):
-            return next(
-                (i for i in range(start_pos, len(rpn)) if rpn[i].get(key) == target_index),
-                None
-            )
+        occurrences = self._occurrences
+        if occurrences is None or occurrences.rpn is not rpn:
+            occurrences = self._occurrences = _Occurrences(rpn)
 
-        def rewrite_sequence_by_index(start_pos=0, first_index=b_val,
-                                      index_key='index',
+        def rewrite_sequence_by_index(first_index=b_val,
                                       substitute_field='lexeme',
                                       substitute_with=a_lex):
             """
             If first_index is an int, substitute by sequential index values.
             If not, substitute by matching identifier lexeme (b_lex).
             """
-            rewritten_positions = []
-
             def as_bool(x):
                 if isinstance(x, bool):
                     return x
@@ -195,60 +356,275 @@ class Knuth:
             eff_value = bool_target if bool_target is not None else substitute_with
 
             if isinstance(first_index, int):
-                pos = next_pos_by_index_value(start_pos, first_index, key=index_key)
-                if pos is None:
-                    return rewritten_positions
-
+                pos = occurrences.indexed(first_index, 0)
                 current_index = first_index
                 while pos is not None:
-                    if eff_field in rpn[pos]:
-                        rpn[pos][eff_field] = eff_value
-                        rewritten_positions.append(pos)
+                    tok = rpn[pos]
+                    if eff_field in tok:
+                        if eff_field == 'lexeme' and \
+                            tok.get('token_type') == 'identifier':
+                            occurrences.respell(pos, tok['lexeme'], eff_value)
+                        tok[eff_field] = eff_value
                     current_index += 1
-                    pos = next_pos_by_index_value(pos, current_index, key=index_key)
-
-                return rewritten_positions
+                    pos = occurrences.indexed(current_index, pos)
+                return
 
-            target_lex = b_lex
-            for i in range(start_pos, len(rpn)):
-                if rpn[i].get('token_type') == 'identifier' and rpn[i].get('lexeme') == target_lex:
-                    # if the target field doesn't exist yet, create it (keeps change scoped)
-                    if eff_field not in rpn[i]:
-                        rpn[i][eff_field] = "unknown"
-                    rpn[i][eff_field] = eff_value
-                    rewritten_positions.append(i)
-            return rewritten_positions
+            for i in occurrences.identifiers(b_lex):
+                rpn[i][eff_field] = eff_value
+            if eff_field == 'lexeme':
+                occurrences.respell_all(b_lex, eff_value)
 
         rewrite_sequence_by_index()
-        return f"({a_lex} / {b_lex})"
+        return self.terms.term(" / ", a_lex, b_lex)
 
     def _eval_binary(self, op, a, b, rpn):
-        res = None
-
-        if op == '/':
-            res = self.subst(rpn, a, b)
-
-        elif op in ('∈', '∉'):
-            res = self.memb(op, a, b)
+        """Evaluate binary Operator op, dispatched by its opcode."""
+        func = self._dispatch[op.opcode]
+        if func is None or op.arity != 2:
+            raise Errors(f"Unknown binary operator: {op.lexeme}")
+
+        if op.opcode == _SUBST:
+            return func(rpn, a, b)
+
+        if op.opcode in _MEMBERSHIP:
+            return func(op.lexeme, a, b)
+
+        return func(a, b)
+
+    def _check_engine(self):
+        if self.eval_engine not in EVAL_ENGINES:
+            raise Errors(f"Unknown evaluator engine '{self.eval_engine}'; " +
+                f"expected one of {', '.join(EVAL_ENGINES)}")
+
+    def vm(self):
+        """The shared Jacquard VM, built on first use."""
+        cls = type(self)
+        if cls._jacquard is None:
+            cls._jacquard = Jacquard(self)
+        return cls._jacquard
+
+    def truth_tables(self):
+        """The shared Boole truth-table engine, built on first use."""
+        cls = type(self)
+        if cls._boole is None:
+            cls._boole = Boole(self.vm())
+        return cls._boole
+
+    def tabulator(self):
+        """
+        The shared Hollerith batch evaluator, built on first use; it uses
+        NumPy when installed.
+        """
+        cls = type(self)
+        if cls._hollerith is None:
+            cls._hollerith = Hollerith(self.truth_tables())
+        return cls._hollerith
+
+    def pager(self):
+        """The shared Gray truth-table pager, built on first use."""
+        cls = type(self)
+        if cls._gray is None:
+            cls._gray = Gray(self.truth_tables())
+        return cls._gray
+
+    def model_counter(self):
+        """The shared Amdahl model counter, built on first use."""
+        cls = type(self)
+        if cls._amdahl is None:
+            cls._amdahl = Amdahl(self.truth_tables())
+        return cls._amdahl
+
+    def sat_solver(self):
+        """The shared Davis SAT engine, built on first use."""
+        cls = type(self)
+        if cls._davis is None:
+            cls._davis = Davis(self.truth_tables())
+        return cls._davis
+
+    def decision_diagrams(self):
+        """
+        This document's Bryant BDD manager, built on first use; every
+        statement of the document shares its nodes.
+        """
+        if self._bryant is None:
+            self._bryant = Bryant(self.truth_tables())
+        return self._bryant
 
-        else:
-            func = {
-                '∧': self.and_,
-                '∨': self.inc_or,
-                '↑': self.nand,
-                '↓': self.nor,
-                '⨁': self.exc_or,
-                '→': self.imp,
-                '↔': self.bi_imp,
-                '≡': self.eqv,
-            }.get(op)
+    def eval_statement(self, rpn):
+        """
+        Evaluate one statement with the selected engine: as a truth-table
+        or SAT report, in canonical form, on the Jacquard VM, or through its
+        compiled function once the formula has been promoted. Anything these
+        cannot take falls back to eval_rpn(). A statement that comes back
+        verbatim in the document gets the result it got the first time.
+        """
+        if self._results is None:
+            return self._evaluate(rpn)
+        # keyed before evaluation, which rewrites tokens in place
+        key = _statement_key(rpn)
+        res = self._results.get(key)
+        if res is None:
+            res = self._results[key] = self._evaluate(rpn)
+        return res
 
-            if func is None:
-                raise Errors(f"Unknown binary operator: {op}")
+    def _end_statement(self):
+        """
+        Forget the subterm values and residual terms of the statement just
+        streamed.
+        """
+        self._values.clear()
+        self._shapes.clear()
+        self.terms.clear()
+
+    def _evaluate(self, rpn):
+        if self.simplifier is not None and self.eval_engine in ("knuth",
+            "jacquard"):
+            rpn = self.simplifier.simplify(rpn, self.vm())
+        if self.eval_engine == "boole":
+            count = self.model_counter().count(rpn)
+            if count is not None:
+                return [self._res_bldr(count.report())]
+        elif self.eval_engine == "davis":
+            report = self.sat_solver().report(rpn)
+            if report is not None:
+                return [self._res_bldr(report)]
+        elif self.eval_engine == "bryant":
+            res = self.decision_diagrams().residual(rpn)
+            if res is not None:
+                return [self._res_bldr(res)]
+        elif self.eval_engine == "jacquard":
+            res = self.vm().run(rpn)
+            if res is not None:
+                return res
+        elif self.jit is not None:
+            res = self.jit.run(rpn)
+            if res is not None:
+                return [self._res_bldr(res)]
+        return self.eval_rpn(rpn)
+
+    @staticmethod
+    def _arity(tok):
+        op = operator_of(tok)
+        return 2 if op is None else op.arity
+
+    @staticmethod
+    def _short_circuits(rpn):
+        """
+        Left operand -> (position, deciding value, result) of the connective
+        over it, keyed by the position of the operand's last token, for
+        every connective in _SHORT_CIRCUIT whose right operand can be
+        skipped: it holds no substitution, whose rewrites must still happen,
+        and no operator the evaluator would reject. None if no operand can
+        be decided (rpn has no boolean constant) or rpn underflows, where
+        the operator jail reorders evaluation.
+        """
+        if not any(tok['token_type'] == 'boolean' for tok in rpn):
+            return None
+        shortcuts = {}
+        firsts = []         # first position of each operand on the stack
+        # operators that cannot be skipped, in all and before each position
+        count = 0
+        held = []
+        for pos, tok in enumerate(rpn):
+            held.append(count)
+            if tok['token_type'] != 'operator':
+                firsts.append(pos)
+                continue
+            op = operator_of(tok)
+            arity = 2 if op is None else op.arity
+            if len(firsts) < arity:
+                return None
+            if op is None or op.evaluator is None or op.opcode == _SUBST:
+                count += 1
+            if arity == 1:
+                continue
+            right = firsts.pop()
+            if op is not None and op.opcode in _SHORT_CIRCUIT and \
+                held[pos] == held[right]:
+                shortcuts[right - 1] = (pos,) + _SHORT_CIRCUIT[op.opcode]
+        return shortcuts or None
 
-            res = func(a, b)
+    def _subterms(self, rpn):
+        """
+        The shape of the subterm ending at each position of rpn, and the
+        position of the operator each subterm is the first operand of (None
+        for the others), so the subterms starting at a leaf are the chain
+        of operators up from it. Shapes are numbered per document, so equal
+        subterms anywhere in it have the same shape. None if rpn
+        substitutes, whose rewrites make a subterm's value depend on where
+        it is, or does not evaluate in stack order.
+        """
+        shapes = self._shapes
+        ids = []
+        up = [None] * len(rpn)
+        operands = []       # shape of each operand on the stack
+        roots = []          # and the position of its last token
+        for pos, tok in enumerate(rpn):
+            if tok['token_type'] != 'operator':
+                key = _TOKEN_KEY(tok)
+                try:
+                    shape = shapes.get(key)
+                except TypeError:
+                    key = canonical_string(key)
+                    shape = shapes.get(key)
+                if shape is None:
+                    shape = shapes[key] = len(shapes)
+                ids.append(shape)
+                operands.append(shape)
+                roots.append(pos)
+                continue
 
-        return res
+            op = operator_of(tok)
+            if op is None or op.evaluator is None or op.opcode == _SUBST or \
+                len(operands) < op.arity:
+                return None
+            if op.arity == 1:
+                key = (op.opcode, operands[-1])
+            else:
+                b = operands.pop()
+                roots.pop()
+                key = (op.opcode, operands[-1], b)
+            shape = shapes.get(key)
+            if shape is None:
+                shape = shapes[key] = len(shapes)
+            ids.append(shape)
+            operands[-1] = shape
+            up[roots[-1]] = pos
+            roots[-1] = pos
+        return ids, up
+
+    def _reuse(self, stack, ids, up, pos):
+        """
+        Where to resume at pos: past the outermost subterm starting there
+        whose value is known, with that value pushed, or pos itself.
+        """
+        values = self._values
+        resume = pos
+        last = up[pos]
+        while last is not None:
+            if ids[last] in values:
+                resume = last + 1
+            last = up[last]
+        if resume != pos:
+            stack.append(values[ids[resume - 1]])
+            self._shared += 1
+        return resume
+
+    def _skip_decided(self, stack, shortcuts, pos):
+        """
+        Where to resume once the operand ending before pos is on the stack:
+        past each connective whose right operand its value decides, with
+        the connective's result in its place.
+        """
+        shortcut = shortcuts.get(pos - 1)
+        while shortcut is not None:
+            op_pos, decider, result = shortcut
+            if stack[-1].get('value') is not decider:
+                break
+            stack[-1] = self._res_bldr(result)
+            pos = op_pos + 1
+            shortcut = shortcuts.get(op_pos)
+        return pos
 
     def eval_rpn(self, rpn):
         """The evaluator."""
@@ -256,12 +632,32 @@ class Knuth:
         op_jail = []
 
         self.bool_values(rpn)
+        self._occurrences = None
+        shortcuts = self._short_circuits(rpn)
+        subterms = None
+        if self._shared or self._probed < self.sharing_probe:
+            self._probed += 1
+            subterms = self._subterms(rpn)
+        ids, up = subterms if subterms is not None else (None, None)
 
         # Obtain operator and operands and check for arity underflow -----------
-        for tok in rpn:
+        pos = 0
+        end = len(rpn)
+        while pos < end:
+            if shortcuts:
+                pos = self._skip_decided(stack, shortcuts, pos)
+                if pos == end:
+                    break
+            if ids is not None and up[pos] is not None:
+                resume = self._reuse(stack, ids, up, pos)
+                if resume != pos:
+                    pos = resume
+                    continue
+            tok = rpn[pos]
+            pos += 1
             if tok["token_type"] != "operator":
                 stack.append(tok)
-                if op_jail and op_jail[-1]['lexeme'] in self._unary_ops:
+                if op_jail and self._arity(op_jail[-1]) == 1:
                     tok = op_jail.pop(-1)
                 elif len(stack) < 2:
                     continue
@@ -273,33 +669,32 @@ class Knuth:
                     op_jail.insert(0, tok)
                     tok = op_jail.pop(-1)
 
-                op = tok["lexeme"]
-                arity = 1 if op in self._unary_ops else 2
+                op = operator_of(tok)
+                arity = 2 if op is None else op.arity
 
                 if len(stack) < arity:
                     op_jail.insert(0, tok)
                     continue
 
+                if op is None:
+                    raise Errors(f"Unknown binary operator: {tok['lexeme']}")
+
                 if arity == 1:
                     a = stack.pop(-1)
-                    res = self._eval_unary(op, a)
+                    res = self._dispatch[op.opcode](a)
                 else:
                     b = stack.pop(-1)
                     a = stack.pop(-1)
                     res = self._eval_binary(op, a, b, rpn)
 
                 stack.append(self._res_bldr(res))
+                if ids is not None:
+                    self._values[ids[pos - 1]] = stack[-1]
                 continue
 
         return stack
     def pretty_print(self, result_stack):
         """Format final output. Sets print as their values only."""
-        def _set_to_string(d):
-            parts = []
-            for v in d.values():
-                parts.append(_set_to_string(v) if isinstance(v, dict) else str(v))
-            return '{' + ', '.join(parts) + '}'
-
         def _collapse_set_dict_repr(s, with_braces=True):
             # Replace any repr like {('str','a'): 'a', ('str','b'): 'b'} with "{a, b}"
             out, i, n = [], 0, len(s)
@@ -355,6 +750,9 @@ class Knuth:
                 pretty_string += line + "\n"
                 continue
 
+            if isinstance(lex, Term):
+                lex = str(lex)
+
             # --- everything else: if it's a string, collapse any embedded set dict reprs
             if isinstance(lex, str):
                 lex = _collapse_set_dict_repr(lex, with_braces=True)  # set False to drop braces
@@ -387,13 +785,12 @@ class Knuth:
 
     def engine(self):
         """The hub for evaluation/intepretation."""
+        self._check_engine()
         result = []
-        expr_stmt_stack = self.code
 
-        while expr_stmt_stack:
+        for expr_stmt in self.code:
             try:
-                expr_stmt = expr_stmt_stack.pop(0)
-                result.append(self.eval_rpn(expr_stmt))
+                result.append(self.eval_statement(expr_stmt))
 
             except Exception as e:
                 raise Errors(f"Unexpected evaluation error: {e}") from e
@@ -401,3 +798,25 @@ class Knuth:
         result = self.sep_and_format(result)
 
         return self.pretty_print(result)
+
+    def engine_stream(self):
+        """
+        Streaming counterpart of engine(): self.code may be any iterable of
+        RPN statements (e.g. Turing.parse_stream()), and each statement's
+        formatted result is yielded as soon as it has been evaluated.
+        Results are shared within a statement only, so memory stays bounded
+        by the largest statement however long the stream.
+        """
+        self._check_engine()
+        self._results = None
+        for expr_stmt in self.code:
+            try:
+                result = self.eval_statement(expr_stmt)
+
+            except Exception as e:
+                raise Errors(f"Unexpected evaluation error: {e}") from e
+
+            line = self.pretty_print([result])
+            self._end_statement()
+            if line:
+                yield line
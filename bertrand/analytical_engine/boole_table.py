@@ -0,0 +1,248 @@
+"""
+Truth tables of RPN statements, evaluated bit-parallel.
+
+"""
+from bertrand.language_services.dictionaries.errors import Errors
+from bertrand.analytical_engine.jacquard_vm import (LOAD, RESIDUAL,
+    FIRST_CONSTANT)
+
+# Bitwise form of each two-valued truth table, keyed by its results for
+# (0, 0), (0, 1), (1, 0), (1, 1); a and b are bitsets over every row and
+# full has a bit set for each row.
+_BINARY = {
+    (0, 0, 0, 1): lambda a, b, full: a & b,
+    (0, 1, 1, 1): lambda a, b, full: a | b,
+    (1, 1, 1, 0): lambda a, b, full: full ^ (a & b),
+    (1, 0, 0, 0): lambda a, b, full: full ^ (a | b),
+    (0, 1, 1, 0): lambda a, b, full: a ^ b,
+    (1, 0, 0, 1): lambda a, b, full: full ^ a ^ b,
+    (1, 1, 0, 1): lambda a, b, full: (full ^ a) | b,
+}
+
+# Same for unary tables, keyed by the results for 0 and 1
+_UNARY = {
+    (1, 0): lambda a, full: full ^ a,
+    (0, 1): lambda a, full: a,
+    (0, 0): lambda a, full: 0,
+    (1, 1): lambda a, full: full,
+}
+
+def _minterms(key):
+    # any other two-valued table, as the union of its true rows
+    def bitwise(a, b, full):
+        na = full ^ a
+        nb = full ^ b
+        res = 0
+        for hit, rows in zip(key, (na & nb, na & b, a & nb, a & b)):
+            if hit:
+                res |= rows
+        return res
+    return bitwise
+
+def bitwise_form(key):
+    """Bitwise form of the two-valued truth table key."""
+    if len(key) == 2:
+        return _UNARY[key]
+    return _BINARY.get(key) or _minterms(key)
+
+def run_bitwise(code, leaves, full, bitwise, arity):
+    """
+    Evaluate Jacquard code with leaves as the bitsets of its constants, in
+    order, bitwise as the form and arity the arity of each opcode, and
+    return the result bitset.
+    """
+    stack = []
+    pc = 0
+    end = len(code)
+    while pc < end:
+        opcode = code[pc]
+        if opcode == LOAD:
+            stack.append(leaves[code[pc + 1] - FIRST_CONSTANT])
+            pc += 2
+            continue
+        pc += 1
+        if arity[opcode] == 1:
+            stack[-1] = bitwise[opcode](stack[-1], full)
+        else:
+            b = stack.pop()
+            stack[-1] = bitwise[opcode](stack[-1], b, full)
+    return stack[-1]
+
+def verdict(satisfying, rows):
+    """'tautology', 'contradiction' or 'contingency'."""
+    if satisfying == rows:
+        return "tautology"
+    if not satisfying:
+        return "contradiction"
+    return "contingency"
+
+def variable_mask(index, count):
+    """
+    Bitset of the rows where variable index (0 is the first of count
+    variables) is True. Row r gives variable i the value of bit
+    count - 1 - i of r, so the first variable changes slowest.
+    """
+    rows = 1 << count
+    half = 1 << (count - 1 - index)
+    # one period of 2 * half rows, False then True, doubled until it covers
+    # every row
+    mask = ((1 << half) - 1) << half
+    width = 2 * half
+    while width < rows:
+        mask |= mask << width
+        width *= 2
+    return mask
+
+class TruthTable:
+    """
+    Truth table of one statement: identifiers in order of first appearance,
+    the number of rows, and mask, the bitset of rows where it is True.
+    """
+    __slots__ = ("identifiers", "rows", "mask")
+
+    def __init__(self, identifiers, rows, mask):
+        self.identifiers = identifiers
+        self.rows = rows
+        self.mask = mask
+
+    @property
+    def satisfying(self):
+        """Number of rows where the statement is True."""
+        return self.mask.bit_count()
+
+    @property
+    def verdict(self):
+        """'tautology', 'contradiction' or 'contingency'."""
+        return verdict(self.satisfying, self.rows)
+
+    def row(self, index):
+        """
+        (assignment, result) of row index; the assignment is a tuple of
+        bools in identifier order.
+        """
+        count = len(self.identifiers)
+        assignment = tuple(bool((index >> (count - 1 - i)) & 1) for i in
+            range(count))
+        return assignment, bool((self.mask >> index) & 1)
+
+    def report(self):
+        """One-line summary, as the evaluator prints it."""
+        return f"{self.verdict} ({self.satisfying} of {self.rows} rows true)"
+
+    def to_map(self):
+        """Summary as a JSON-ready dict."""
+        return {
+            "identifiers": list(self.identifiers),
+            "rows": self.rows,
+            "satisfying": self.satisfying,
+            "verdict": self.verdict,
+        }
+
+class Boole:
+    """
+    Truth-table engine. Each distinct identifier in a statement is a
+    variable given a bitset over all 2^n rows, and each operator is one
+    big-int bitwise operation over every row at once.
+
+    Statements are lowered with the Jacquard VM and the bitwise form of each
+    operator is read off the VM's truth tables, so rows agree with what
+    Knuth gives for the same assignment. Statements the VM cannot lower,
+    or that hold sets, numbers or operators without a two-valued table
+    (such as membership), have no truth table.
+    """
+
+    # largest table built: 2^max_variables rows, one bit each
+    max_variables = 24
+
+    def __init__(self, vm):
+        self.vm = vm
+        # two-valued truth table of each opcode, as keyed in _BINARY and
+        # _UNARY, and its bitwise form; None for opcodes without one
+        self.keys = [None] * len(vm.tables)
+        self.bitwise = [None] * len(vm.tables)
+        for opcode, table in enumerate(vm.tables):
+            if table is None:
+                continue
+            if vm.arity[opcode] == 1:
+                key = (table[0], table[1])
+            else:
+                key = (table[0], table[1], table[3], table[4])
+            if RESIDUAL in key:
+                continue
+            self.keys[opcode] = key
+            self.bitwise[opcode] = bitwise_form(key)
+
+    def variables(self, program):
+        """
+        Identifier lexemes of program in order of first appearance and the
+        variable index of each constant (None for a boolean constant), or
+        None if program has a leaf that is neither.
+        """
+        identifiers = {}
+        slots = []
+        for tok, value in zip(program.constants, program.values):
+            if value != RESIDUAL:
+                slots.append(None)
+                continue
+            lex = tok.get('lexeme')
+            if tok.get('token_type') != 'identifier' or not isinstance(lex,
+                str):
+                return None
+            slots.append(identifiers.setdefault(lex, len(identifiers)))
+        return tuple(identifiers), slots
+
+    def lower(self, rpn):
+        """
+        (program, identifiers, slots) for rpn as variables() gives them, or
+        None if rpn has no truth table.
+        """
+        program = self.vm.lower(rpn)
+        if program is None:
+            return None
+        if any(self.bitwise[opcode] is None for opcode in
+            self.opcodes(program.code)):
+            return None
+        shape = self.variables(program)
+        if shape is None:
+            return None
+        return (program,) + shape
+
+    def table(self, rpn):
+        """TruthTable of rpn, or None if it has none."""
+        lowered = self.lower(rpn)
+        if lowered is None:
+            return None
+        program, identifiers, slots = lowered
+        count = len(identifiers)
+        if count > self.max_variables:
+            raise Errors(f"Too many identifiers for a truth table: {count} " +
+                f"(at most {self.max_variables})")
+
+        rows = 1 << count
+        full = (1 << rows) - 1
+        masks = [variable_mask(i, count) for i in range(count)]
+        leaves = [masks[slot] if slot is not None else (full if value else 0)
+            for slot, value in zip(slots, program.values)]
+        return TruthTable(identifiers, rows, self.run(program.code, leaves,
+            full))
+
+    def run(self, code, leaves, full, bitwise=None):
+        """
+        Evaluate code with leaves as the bitsets of its constants, in order,
+        and return the result bitset. bitwise replaces the operator forms,
+        so the same loop can run over other row encodings.
+        """
+        return run_bitwise(code, leaves, full, bitwise or self.bitwise,
+            self.vm.arity)
+
+    @staticmethod
+    def opcodes(code):
+        """The operator opcodes of code, in order."""
+        pc = 0
+        end = len(code)
+        while pc < end:
+            if code[pc] == LOAD:
+                pc += 2
+                continue
+            yield code[pc]
+            pc += 1
@@ -0,0 +1,289 @@
+"""
+Reduced ordered binary decision diagrams of RPN statements.
+
+"""
+from bertrand.language_services.dictionaries.errors import Errors
+from bertrand.analytical_engine.jacquard_vm import LOAD, FIRST_CONSTANT
+
+# The two terminal nodes
+FALSE, TRUE = 0, 1
+
+class Bryant:
+    """
+    BDD manager. Every node is an int: 0 and 1 are the terminals, and any
+    other node tests the variable at its level, with a low (False) and a
+    high (True) child. Nodes are hash-consed through a unique table, so
+    two statements with the same truth function get the same node, and
+    every if-then-else is memoized in a computed table; equivalence of two
+    formulas is then a comparison of two ints.
+
+    Identifiers are ordered by `order` (a sequence of identifier lexemes),
+    then by first appearance; levels are fixed once given, so one manager
+    can share its nodes across every statement of a document.
+
+    Statements are lowered with the Boole engine, so statements without a
+    truth table (see Boole) have no BDD.
+    """
+
+    # largest diagram kept, and most identifiers (the if-then-else recursion
+    # goes one level deeper per identifier)
+    max_nodes = 1 << 20
+    max_variables = 512
+    # longest canonical form residual() spells
+    max_text = 1 << 16
+
+    def __init__(self, boole, order=()):
+        self.boole = boole
+        self.names = []                 # identifier of each level
+        self.levels = {}                # identifier -> level
+        for name in order:
+            self.level_of(name)
+        # level, low and high child of each node; the terminals sit below
+        # every level
+        self.level = [float('inf'), float('inf')]
+        self.low = [FALSE, TRUE]
+        self.high = [FALSE, TRUE]
+        self.unique = {}                # (level, low, high) -> node
+        self.computed = {}              # (f, g, h) -> ite(f, g, h)
+
+    def level_of(self, name):
+        """Level of identifier name, giving it the next one if it is new."""
+        level = self.levels.get(name)
+        if level is None:
+            level = self.levels[name] = len(self.names)
+            self.names.append(name)
+        return level
+
+    def node(self, level, low, high):
+        """The node testing level with children low and high."""
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            node = len(self.level)
+            if node >= self.max_nodes:
+                raise Errors("Statement's decision diagram exceeds " +
+                    f"{self.max_nodes} nodes")
+            self.level.append(level)
+            self.low.append(low)
+            self.high.append(high)
+            self.unique[key] = node
+        return node
+
+    def variable(self, name):
+        """The node of identifier name."""
+        return self.node(self.level_of(name), FALSE, TRUE)
+
+    def ite(self, f, g, h):
+        """If f then g else h."""
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+        key = (f, g, h)
+        res = self.computed.get(key)
+        if res is not None:
+            return res
+
+        level = self.level
+        top = min(level[f], level[g], level[h])
+        f0, f1 = self._cofactors(f, top)
+        g0, g1 = self._cofactors(g, top)
+        h0, h1 = self._cofactors(h, top)
+        res = self.node(top, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        self.computed[key] = res
+        return res
+
+    def _cofactors(self, f, level):
+        if self.level[f] != level:
+            return f, f
+        return self.low[f], self.high[f]
+
+    def negate(self, f):
+        """Not f."""
+        return self.ite(f, FALSE, TRUE)
+
+    def apply(self, key, a, b=None):
+        """
+        The node of the two-valued truth table key (as Boole keys it)
+        applied to a, or to a and b.
+        """
+        if b is None:
+            return self.ite(a, key[1], key[0])
+        return self.ite(a, self.ite(b, key[3], key[2]),
+            self.ite(b, key[1], key[0]))
+
+    def build(self, rpn):
+        """The node of rpn, or None if it has no truth table."""
+        lowered = self.boole.lower(rpn)
+        if lowered is None:
+            return None
+        program, identifiers, slots = lowered
+        if len(self.levels.keys() | set(identifiers)) > self.max_variables:
+            raise Errors("Too many identifiers for a decision diagram " +
+                f"(at most {self.max_variables})")
+
+        variables = [self.variable(name) for name in identifiers]
+        keys = self.boole.keys
+        code = program.code
+        stack = []
+        pc = 0
+        end = len(code)
+        while pc < end:
+            opcode = code[pc]
+            if opcode == LOAD:
+                ref = code[pc + 1] - FIRST_CONSTANT
+                slot = slots[ref]
+                stack.append(variables[slot] if slot is not None else
+                    (TRUE if program.values[ref] else FALSE))
+                pc += 2
+                continue
+            pc += 1
+            key = keys[opcode]
+            if len(key) == 2:
+                stack[-1] = self.apply(key, stack[-1])
+            else:
+                b = stack.pop()
+                stack[-1] = self.apply(key, stack[-1], b)
+        return stack[-1]
+
+    def residual(self, rpn):
+        """
+        The canonical form of rpn: a bool if it is a tautology or a
+        contradiction, its canonical formula otherwise. None if rpn has no
+        truth table, or its diagram or text outgrows the limits.
+        """
+        try:
+            f = self.build(rpn)
+        except Errors:
+            return None
+        if f is None:
+            return None
+        return self.canonical(f, self.max_text)
+
+    def equivalent(self, rpn_a, rpn_b):
+        """
+        Whether rpn_a and rpn_b have the same truth function, or None if
+        either has no truth table.
+        """
+        a = self.build(rpn_a)
+        b = self.build(rpn_b)
+        if a is None or b is None:
+            return None
+        return a == b
+
+    def support(self, f):
+        """The identifiers f depends on, in level order."""
+        seen = set()
+        levels = set()
+        pending = [f]
+        while pending:
+            u = pending.pop()
+            if u <= TRUE or u in seen:
+                continue
+            seen.add(u)
+            levels.add(self.level[u])
+            pending += (self.low[u], self.high[u])
+        return [self.names[level] for level in sorted(levels)]
+
+    def count(self, f, identifiers=None):
+        """
+        Number of assignments to identifiers (by default the ones f depends
+        on) that make f True.
+        """
+        if identifiers is None:
+            identifiers = self.support(f)
+        total = len(self.names)
+        # models over the levels from the node's own down, memoized
+        memo = {FALSE: 0, TRUE: 1}
+        pending = [f]
+        while pending:
+            u = pending[-1]
+            if u in memo:
+                pending.pop()
+                continue
+            low, high = self.low[u], self.high[u]
+            if low not in memo or high not in memo:
+                pending += (low, high)
+                continue
+            pending.pop()
+            memo[u] = self._weight(low, u, memo) + self._weight(high, u, memo)
+        models = memo[f] << (self.level[f] if f > TRUE else total)
+        # f does not depend on the levels outside identifiers
+        return models >> (total - len(identifiers))
+
+    def _weight(self, child, parent, memo):
+        # models of child scaled over the levels skipped below parent
+        level = self.level[child] if child > TRUE else len(self.names)
+        return memo[child] << (level - self.level[parent] - 1)
+
+    def size(self, f):
+        """Number of nodes reachable from f, terminals included."""
+        seen = set()
+        pending = [f]
+        while pending:
+            u = pending.pop()
+            if u in seen:
+                continue
+            seen.add(u)
+            if u > TRUE:
+                pending += (self.low[u], self.high[u])
+        return len(seen)
+
+    def canonical(self, f, limit=None):
+        """
+        Canonical formula of f, spelled as Knuth spells residuals: the same
+        text for every formula with the same truth function, under this
+        manager's order. A bool for the terminals; None if the text would
+        be longer than limit characters.
+        """
+        if f <= TRUE:
+            return f == TRUE
+        # text length first, so an exponentially long text is never built
+        lengths = {}
+        for u in self._postorder(f):
+            lengths[u] = len(self._spell(u, lambda v: '\0' * (lengths[v] if
+                v > TRUE else 0)))
+            if limit is not None and lengths[u] > limit:
+                return None
+        text = {}
+        for u in self._postorder(f):
+            text[u] = self._spell(u, text.__getitem__)
+        return text[f]
+
+    def _postorder(self, f):
+        # nodes reachable from f, children before parents, terminals left out
+        order = []
+        seen = set()
+        pending = [(f, False)]
+        while pending:
+            u, expanded = pending.pop()
+            if expanded:
+                order.append(u)
+            elif u > TRUE and u not in seen:
+                seen.add(u)
+                pending += ((u, True), (self.high[u], False),
+                    (self.low[u], False))
+        return order
+
+    def _spell(self, u, text):
+        name = self.names[self.level[u]]
+        low, high = self.low[u], self.high[u]
+        if low == FALSE and high == TRUE:
+            return name
+        if low == TRUE and high == FALSE:
+            return f"(¬{name})"
+        if low == FALSE:
+            return f"({name} ∧ {text(high)})"
+        if high == TRUE:
+            return f"({name} ∨ {text(low)})"
+        if high == FALSE:
+            return f"((¬{name}) ∧ {text(low)})"
+        if low == TRUE:
+            return f"({name} → {text(high)})"
+        return f"(({name} ∧ {text(high)}) ∨ ((¬{name}) ∧ {text(low)}))"
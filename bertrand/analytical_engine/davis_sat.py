@@ -0,0 +1,462 @@
+"""
+Satisfiability and tautology checking by CDCL over a Tseitin CNF.
+
+"""
+import heapq
+from bertrand.language_services.dictionaries.errors import Errors
+from bertrand.analytical_engine.jacquard_vm import LOAD, FIRST_CONSTANT
+
+def _luby(i):
+    # i-th term (1-based) of the Luby restart sequence 1 1 2 1 1 2 4 ...
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+# truth tables (as Boole keys them) the encoder treats as n-ary gates
+_AND = (0, 0, 0, 1)
+_OR = (0, 1, 1, 1)
+_NAND = (1, 1, 1, 0)
+_NOR = (1, 0, 0, 0)
+_IMP = (1, 1, 0, 1)
+
+def _negate(item):
+    # items are literals or flat ('and' | 'or', [items]) nodes; negation is
+    # pushed inside by De Morgan, so it never nests deeper than it was
+    if isinstance(item, int):
+        return -item
+    kind, parts = item
+    return ('or' if kind == 'and' else 'and', [_negate(p) for p in parts])
+
+class CNF:
+    """
+    Tseitin encoding of one statement. Identifiers are variables 1..n in
+    order of first appearance. Chains of ∧ and ∨ (with the negated forms ↑,
+    ↓ and →) are kept as flat n-ary nodes, and only get a fresh variable,
+    tied to its operands in both directions, when another operator needs
+    them as an operand; every other binary operator gets one clause per row
+    of its truth table. root is what is left on top: a literal or a node of
+    at most two levels, asserted directly by assert_root(), so a statement
+    already in conjunctive normal form encodes to its own clauses.
+    """
+    __slots__ = ("identifiers", "variables", "clauses", "root")
+
+    def __init__(self, identifiers, variables, clauses, root):
+        self.identifiers = identifiers
+        self.variables = variables
+        self.clauses = clauses
+        self.root = root
+
+    @classmethod
+    def from_lowered(cls, lowered, keys):
+        """Encode a Boole.lower() result, with keys the opcode tables."""
+        program, identifiers, slots = lowered
+        code = program.code
+        cnf = cls(identifiers, len(identifiers), [], None)
+        true = None
+        stack = []
+
+        pc = 0
+        end = len(code)
+        while pc < end:
+            opcode = code[pc]
+            if opcode == LOAD:
+                ref = code[pc + 1] - FIRST_CONSTANT
+                pc += 2
+                if slots[ref] is not None:
+                    stack.append(slots[ref] + 1)
+                    continue
+                if true is None:
+                    true = cnf.fresh()
+                    cnf.clauses.append([true])
+                stack.append(true if program.values[ref] else -true)
+                continue
+
+            pc += 1
+            key = keys[opcode]
+            if len(key) == 2:
+                a = stack.pop()
+                if key[0] == key[1]:
+                    if true is None:
+                        true = cnf.fresh()
+                        cnf.clauses.append([true])
+                    stack.append(true if key[0] else -true)
+                else:
+                    stack.append(a if key[1] else _negate(a))
+                continue
+
+            b = stack.pop()
+            a = stack.pop()
+            if key in (_AND, _NAND):
+                item = cnf.join('and', a, b)
+                stack.append(item if key == _AND else _negate(item))
+            elif key in (_OR, _NOR):
+                item = cnf.join('or', a, b)
+                stack.append(item if key == _OR else _negate(item))
+            elif key == _IMP:
+                stack.append(cnf.join('or', _negate(a), b))
+            else:
+                stack.append(cnf.gate(key, cnf.literal(a), cnf.literal(b)))
+
+        cnf.root = stack[-1]
+        return cnf
+
+    def fresh(self):
+        """A new variable."""
+        self.variables += 1
+        return self.variables
+
+    def join(self, kind, a, b):
+        """
+        The kind node of a and b. Operands of the same kind are merged, and
+        flat nodes of the other kind kept as parts; anything deeper gets a
+        variable, so nodes stay at most two levels deep.
+        """
+        parts = []
+        for item in (a, b):
+            if isinstance(item, int):
+                parts.append(item)
+            elif item[0] == kind:
+                parts.extend(item[1])
+            elif all(isinstance(p, int) for p in item[1]):
+                parts.append(item)
+            else:
+                parts.append(self.literal(item))
+        return (kind, parts)
+
+    def literal(self, item):
+        """A literal equivalent to item, defining a variable if needed."""
+        if isinstance(item, int):
+            return item
+        kind, parts = item
+        lits = [self.literal(p) for p in parts]
+        gate = self.fresh()
+        if kind == 'and':
+            self.clauses.extend([-gate, lit] for lit in lits)
+            self.clauses.append([gate] + [-lit for lit in lits])
+        else:
+            self.clauses.extend([gate, -lit] for lit in lits)
+            self.clauses.append([-gate] + lits)
+        return gate
+
+    def gate(self, key, a, b):
+        """A variable equal to the truth table key of literals a and b."""
+        gate = self.fresh()
+        for (x, y), res in zip(((0, 0), (0, 1), (1, 0), (1, 1)), key):
+            self.clauses.append([-a if x else a, -b if y else b,
+                gate if res else -gate])
+        return gate
+
+    def assert_root(self, value):
+        """Clauses that hold exactly when the statement has value."""
+        item = self.root if value else _negate(self.root)
+        if isinstance(item, int):
+            return [[item]]
+        kind, parts = item
+        if kind == 'or':
+            return [[self.literal(p) for p in parts]]
+        return [[p] if isinstance(p, int) else [self.literal(q) for q in
+            p[1]] if p[0] == 'or' else [self.literal(p)] for p in parts]
+
+class Solver:
+    """
+    CDCL SAT solver: two watched literals per clause, first-UIP clause
+    learning with non-chronological backjumping, VSIDS-style variable
+    activity with phase saving, and Luby restarts. Literals are non-zero
+    ints, -v being the negation of variable v.
+
+    Only variables 1..decisions are branched on; the rest must be fixed by
+    propagation once those are set, as Tseitin gate variables are.
+    """
+
+    restart_base = 100
+    decay = 0.95
+
+    def __init__(self, variables, clauses, decisions=None):
+        self.variables = variables
+        self.decisions = decisions or variables
+        # value of each literal, indexed by the literal itself (negative
+        # literals from the end): 1 true, -1 false, 0 free
+        self.value = [0] * (2 * variables + 1)
+        self.level = [0] * (variables + 1)
+        self.reason = [None] * (variables + 1)
+        self.activity = [0.0] * (variables + 1)
+        self.phase = [-1] * (variables + 1)
+        self.var_inc = 1.0
+        self.heap = [(0.0, var) for var in range(1, self.decisions + 1)]
+        self.watches = [[] for _ in range(2 * variables + 1)]
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.ok = True
+
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def _enqueue(self, lit, reason):
+        var = abs(lit)
+        self.value[lit] = 1
+        self.value[-lit] = -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def add_clause(self, clause):
+        """Add a clause (an iterable of literals) at decision level 0."""
+        clause = list(dict.fromkeys(clause))
+        if not self.ok or any(-lit in clause for lit in clause):
+            return
+        clause = [lit for lit in clause if self.value[lit] != -1]
+        if any(self.value[lit] == 1 for lit in clause):
+            return
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0], None)
+            self.ok = self.propagate() is None
+        else:
+            self._watch(clause)
+
+    def _watch(self, clause):
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    def propagate(self):
+        """Unit-propagate the trail; return a conflicting clause or None."""
+        value = self.value
+        watches = self.watches
+        trail = self.trail
+        enqueue = self._enqueue
+        while self.qhead < len(trail):
+            false_lit = -trail[self.qhead]
+            self.qhead += 1
+            watching = watches[false_lit]
+            if not watching:
+                continue
+            kept = []
+            watches[false_lit] = kept
+            for i, clause in enumerate(watching):
+                if clause[0] == false_lit:
+                    clause[0] = clause[1]
+                    clause[1] = false_lit
+                first = clause[0]
+                if value[first] == 1:
+                    kept.append(clause)
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if value[lit] != -1:
+                        clause[1] = lit
+                        clause[k] = false_lit
+                        watches[lit].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if value[first] == -1:
+                        kept.extend(watching[i + 1:])
+                        self.qhead = len(trail)
+                        return clause
+                    enqueue(first, clause)
+        return None
+
+    def _bump(self, var):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-self.activity[v], v) for _, v in self.heap]
+            heapq.heapify(self.heap)
+        if var <= self.decisions:
+            heapq.heappush(self.heap, (-self.activity[var], var))
+
+    def _analyze(self, conflict):
+        # first-UIP learnt clause, asserting literal first, and the level
+        # to backjump to
+        level = self.level
+        seen = set()
+        learnt = [None]
+        current = len(self.trail_lim)
+        pending = 0
+        lit = None
+        index = len(self.trail) - 1
+        clause = conflict
+
+        while True:
+            for q in clause if lit is None else clause[1:]:
+                var = abs(q)
+                if var in seen or level[var] == 0:
+                    continue
+                seen.add(var)
+                self._bump(var)
+                if level[var] == current:
+                    pending += 1
+                else:
+                    learnt.append(q)
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            lit = self.trail[index]
+            index -= 1
+            pending -= 1
+            if not pending:
+                break
+            clause = self.reason[abs(lit)]
+
+        learnt[0] = -lit
+        if len(learnt) == 1:
+            return learnt, 0
+        deepest = max(range(1, len(learnt)), key=lambda i:
+            level[abs(learnt[i])])
+        learnt[1], learnt[deepest] = learnt[deepest], learnt[1]
+        return learnt, level[abs(learnt[1])]
+
+    def _backjump(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        stop = self.trail_lim[level]
+        value = self.value
+        for lit in self.trail[stop:]:
+            var = abs(lit)
+            self.phase[var] = 1 if lit > 0 else -1
+            value[lit] = value[-lit] = 0
+            self.reason[var] = None
+            if var <= self.decisions:
+                heapq.heappush(self.heap, (-self.activity[var], var))
+        del self.trail[stop:]
+        del self.trail_lim[level:]
+        self.qhead = stop
+
+    def _decide(self):
+        # most active free decision variable; the heap holds stale entries,
+        # skipped here, alongside the current ones
+        heap = self.heap
+        value = self.value
+        while heap:
+            var = heapq.heappop(heap)[1]
+            if not value[var]:
+                return var
+        for var in range(1, self.variables + 1):
+            if not value[var]:
+                return var
+        return 0
+
+    def solve(self, assumptions=()):
+        """
+        Return a model (variable -> bool for every variable) satisfying the
+        clauses and the assumption literals, or None if there is none. The
+        assumptions are kept as unit clauses.
+        """
+        if not self.ok:
+            return None
+        self._backjump(0)
+        for lit in assumptions:
+            self.add_clause([lit])
+        if not self.ok:
+            return None
+
+        conflicts = 0
+        restarts = 1
+        limit = self.restart_base * _luby(restarts)
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                if not self.trail_lim:
+                    self.ok = False
+                    return None
+                conflicts += 1
+                learnt, level = self._analyze(conflict)
+                self._backjump(level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._watch(learnt)
+                    self._enqueue(learnt[0], learnt)
+                self.var_inc /= self.decay
+                continue
+
+            if conflicts >= limit:
+                conflicts = 0
+                restarts += 1
+                limit = self.restart_base * _luby(restarts)
+                self._backjump(0)
+                continue
+
+            var = self._decide()
+            if not var:
+                return {v: self.value[v] == 1 for v in range(1,
+                    self.variables + 1)}
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(var if self.phase[var] == 1 else -var, None)
+
+class Davis:
+    """
+    SAT engine for statements. A statement is lowered with the Boole engine,
+    Tseitin-encoded to CNF and decided by the CDCL Solver, so it scales to
+    statements with hundreds of identifiers, far past truth tables.
+    Statements without a truth table (see Boole) have no CNF.
+    """
+
+    def __init__(self, boole):
+        self.boole = boole
+
+    def cnf(self, rpn):
+        """CNF of rpn, or None if it has none."""
+        lowered = self.boole.lower(rpn)
+        if lowered is None:
+            return None
+        return CNF.from_lowered(lowered, self.boole.keys)
+
+    def _cnf(self, rpn):
+        cnf = self.cnf(rpn)
+        if cnf is None:
+            raise Errors("Statement has no propositional form to solve")
+        return cnf
+
+    @staticmethod
+    def _model(cnf, value):
+        # assert_root() may define gate variables, so it comes first
+        asserted = cnf.assert_root(value)
+        model = Solver(cnf.variables, cnf.clauses + asserted,
+            len(cnf.identifiers)).solve()
+        if model is None:
+            return None
+        return {name: model[i + 1] for i, name in enumerate(cnf.identifiers)}
+
+    def find_model(self, rpn):
+        """An identifier -> bool assignment making rpn True, or None."""
+        cnf = self._cnf(rpn)
+        return self._model(cnf, True)
+
+    def find_counterexample(self, rpn):
+        """An identifier -> bool assignment making rpn False, or None."""
+        cnf = self._cnf(rpn)
+        return self._model(cnf, False)
+
+    def is_satisfiable(self, rpn):
+        """Whether some assignment makes rpn True."""
+        return self.find_model(rpn) is not None
+
+    def is_tautology(self, rpn):
+        """Whether every assignment makes rpn True."""
+        return self.find_counterexample(rpn) is None
+
+    def report(self, rpn):
+        """
+        One-line verdict for rpn, as the evaluator prints it, naming a
+        counterexample of a contingency; None if rpn has no CNF.
+        """
+        cnf = self.cnf(rpn)
+        if cnf is None:
+            return None
+        counterexample = self._model(cnf, False)
+        if counterexample is None:
+            return "tautology"
+        if self._model(cnf, True) is None:
+            return "contradiction"
+        falsified = ", ".join(f"{name}={value}" for name, value in
+            counterexample.items())
+        return f"contingency; counterexample: {falsified}"
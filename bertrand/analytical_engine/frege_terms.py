@@ -0,0 +1,75 @@
+"""
+Interned symbolic terms for residual results.
+
+"""
+
+class Term:
+    """
+    One residual result: the spelling pieces around its operands, and the
+    operands, each a Term or the text of a leaf. Terms are interned (see
+    Frege), so two Terms are structurally equal only if they are the same
+    object. str() spells the term; nothing else does.
+    """
+    __slots__ = ("pieces", "operands")
+
+    def __init__(self, pieces, operands):
+        self.pieces = pieces
+        self.operands = operands
+
+    def __str__(self):
+        # One walk down the term: text goes straight to the output and
+        # operand terms back on the work stack, so each piece is written
+        # once however deep the term is.
+        out = []
+        emit = out.append
+        work = [self]
+        pop = work.pop
+        push = work.append
+        while work:
+            item = pop()
+            if item.__class__ is not Term:
+                emit(item)
+                continue
+            pieces = item.pieces
+            operands = item.operands
+            for i in range(len(operands), 0, -1):
+                push(pieces[i])
+                push(operands[i - 1])
+            push(pieces[0])
+        return "".join(out)
+
+class Frege:
+    """
+    Unique table of the residual terms of one evaluator: a term is built
+    once per operator and operands, and a residual costs one entry however
+    large its text, which is only spelled when the result is printed.
+    Terms stay in the table until clear(), so a streaming evaluator clears
+    it once each statement's result is printed.
+    """
+
+    def __init__(self):
+        self.unique = {}        # (operator spelling, operands) -> Term
+        self._pieces = {}       # operator spelling -> pieces
+
+    def term(self, spelling, *operands):
+        """
+        The Term of operator spelling over operands: with one operand the
+        spelling is its prefix, as in (¬a); with two it goes between them,
+        as in (a ∧ b). Operands that are not Terms are kept as their text.
+        """
+        operands = tuple(a if a.__class__ is Term else str(a) for a in
+            operands)
+        key = (spelling, operands)
+        term = self.unique.get(key)
+        if term is None:
+            pieces = self._pieces.get((spelling, len(operands)))
+            if pieces is None:
+                pieces = ("(" + spelling, ")") if len(operands) == 1 else \
+                    ("(", spelling, ")")
+                self._pieces[(spelling, len(operands))] = pieces
+            term = self.unique[key] = Term(pieces, operands)
+        return term
+
+    def clear(self):
+        """Drop every term; terms already built stay valid."""
+        self.unique.clear()
@@ -0,0 +1,106 @@
+"""
+Paginated truth tables in Gray-code order.
+
+"""
+from collections import OrderedDict
+from bertrand.language_services.dictionaries.errors import Errors
+
+def gray_mask(bit, start, count):
+    """
+    Bitset over rows start .. start + count - 1 (row start in bit 0) of the
+    rows whose Gray code k ^ (k >> 1) has bit set. That bit is 1 on runs of
+    2^(bit+1) rows, one run every 2^(bit+2) rows, starting at row 2^bit.
+    """
+    period = 4 << bit
+    run = 2 << bit
+    stop = start + count
+    mask = 0
+    # first run that could reach into the page
+    begin = ((start - (1 << bit)) // period) * period + (1 << bit)
+    while begin < stop:
+        lo = max(begin, start)
+        hi = min(begin + run, stop)
+        if lo < hi:
+            mask |= ((1 << (hi - lo)) - 1) << (lo - start)
+        begin += period
+    return mask
+
+class Gray:
+    """
+    Truth-table pager. Row k of a statement's table assigns its identifiers
+    the bits of the Gray code k ^ (k >> 1), the first identifier taking the
+    highest bit, so neighbouring rows differ in exactly one identifier. A
+    page is evaluated on its own, bit-parallel over its rows with the Boole
+    engine, so memory stays bounded by the page and not by the 2^n rows.
+
+    Lowered statements are kept in an LRU cache of up to maxsize entries,
+    so paging through a table compiles its statement once. Keys are kept
+    alive with their entries, so callers key by a digest of the document
+    rather than the document itself.
+    """
+
+    # largest page served
+    max_page_size = 4096
+
+    def __init__(self, boole, maxsize=256):
+        self.boole = boole
+        self.maxsize = maxsize
+        self._lowered = OrderedDict()
+
+    def lower(self, key, rpn):
+        """
+        Boole.lower() for the statement identified by key, from the cache,
+        or from rpn() on a miss. Returns None without a truth table.
+        """
+        lowered = self._lowered.get(key)
+        if lowered is not None:
+            try:
+                self._lowered.move_to_end(key)
+            except KeyError:    # evicted by a concurrent request
+                pass
+            return lowered
+
+        lowered = self.boole.lower(rpn())
+        if lowered is None:
+            return None
+        self._lowered[key] = lowered
+        try:
+            self._lowered.move_to_end(key)
+        except KeyError:        # evicted by a concurrent request
+            pass
+        while len(self._lowered) > self.maxsize:
+            try:
+                self._lowered.popitem(last=False)
+            except KeyError:    # emptied by a concurrent request
+                break
+        return lowered
+
+    def page(self, lowered, page, page_size):
+        """
+        Iterator of (row, values, result) for each row of page, where values
+        are the identifiers' truth values in identifier order. The page is
+        checked here and evaluated when iteration starts.
+        """
+        if page < 0 or not 0 < page_size <= self.max_page_size:
+            raise Errors("Page must be 0 or more and page size 1 to " +
+                f"{self.max_page_size}")
+        return self._rows(lowered, page * page_size, page_size)
+
+    def _rows(self, lowered, start, page_size):
+        program, identifiers, slots = lowered
+        count = len(identifiers)
+        rows = min(page_size, (1 << count) - start)
+        if rows <= 0:
+            return
+
+        masks = [gray_mask(count - 1 - i, start, rows) for i in range(count)]
+        full = (1 << rows) - 1
+        leaves = [masks[slot] if slot is not None else (full if value else 0)
+            for slot, value in zip(slots, program.values)]
+        result = self.boole.run(program.code, leaves, full)
+
+        for j in range(rows):
+            code = (start + j) ^ ((start + j) >> 1)
+            values = [bool((code >> (count - 1 - i)) & 1) for i in
+                range(count)]
+            yield start + j, values, bool((result >> j) & 1)
@@ -0,0 +1,168 @@
+"""
+Batch evaluation of RPN statements over many assignments at once, with
+NumPy when it is installed.
+
+"""
+from bertrand.language_services.dictionaries.errors import Errors
+from bertrand.analytical_engine.boole_table import variable_mask
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _numpy_kernels():
+    # vectorized form of each two-valued truth table, keyed as in
+    # boole_table; full is unused but keeps the Boole.run() signature
+    return {
+        (0, 0, 0, 1): lambda a, b, full: np.logical_and(a, b),
+        (0, 1, 1, 1): lambda a, b, full: np.logical_or(a, b),
+        (1, 1, 1, 0): lambda a, b, full: np.logical_not(np.logical_and(a, b)),
+        (1, 0, 0, 0): lambda a, b, full: np.logical_not(np.logical_or(a, b)),
+        (0, 1, 1, 0): lambda a, b, full: np.logical_xor(a, b),
+        (1, 0, 0, 1): lambda a, b, full: np.logical_not(np.logical_xor(a, b)),
+        (1, 1, 0, 1): lambda a, b, full: np.logical_or(np.logical_not(a), b),
+        (1, 0): lambda a, full: np.logical_not(a),
+        (0, 1): lambda a, full: a,
+    }
+
+def _lookup(key):
+    # any other table, by indexing its results with the operand bits
+    results = np.array(key, dtype=bool)
+    if len(key) == 2:
+        return lambda a, full: results[np.asarray(a, dtype=np.uint8)]
+    return lambda a, b, full: results[(np.asarray(a, dtype=np.uint8) << 1) |
+        np.asarray(b, dtype=np.uint8)]
+
+def _unpack(mask, rows):
+    # bitset -> list of bools, row 0 first
+    if not rows:
+        return []
+    bits = bin(mask)[2:].zfill(rows)
+    return [bit == '1' for bit in reversed(bits)]
+
+class Hollerith:
+    """
+    Batch evaluator. A statement is lowered once by the Boole engine and run
+    over a whole matrix of assignments (rows x variables) in one pass, with
+    NumPy logical kernels when NumPy is installed. Without NumPy each
+    column is packed into a Python int and the pass runs on Boole's bitwise
+    operators instead. Results are a NumPy bool array on the NumPy path and
+    a list of bools otherwise.
+
+    Statements without a truth table (see Boole) give None.
+    """
+
+    # rows per chunk of a generated truth table
+    chunk_rows = 1 << 16
+
+    def __init__(self, boole, use_numpy=True):
+        self.boole = boole
+        self.numpy = use_numpy and np is not None
+        self.kernels = None
+        if self.numpy:
+            kernels = _numpy_kernels()
+            self.kernels = [None if key is None else kernels.get(key) or
+                _lookup(key) for key in boole.keys]
+
+    def identifiers(self, rpn):
+        """Identifiers of rpn in column order, or None without a table."""
+        lowered = self.boole.lower(rpn)
+        return None if lowered is None else lowered[1]
+
+    def evaluate(self, rpn, assignments, identifiers=None):
+        """
+        Evaluate rpn for every row of assignments, a 2-D array or sequence
+        of rows of truth values. identifiers names the columns; by default
+        they are the statement's identifiers in order of first appearance.
+        Columns that do not appear in rpn are ignored.
+        """
+        lowered = self.boole.lower(rpn)
+        if lowered is None:
+            return None
+        program, names, slots = lowered
+
+        columns = list(identifiers) if identifiers is not None else \
+            list(names)
+        index = {name: i for i, name in enumerate(columns)}
+        missing = [name for name in names if name not in index]
+        if missing:
+            raise Errors(f"No assignment column for identifier '{missing[0]}'")
+        picks = [index[name] for name in names]
+
+        shape_error = Errors("Assignments must be a matrix of rows x " +
+            f"{len(columns)} columns")
+        if self.numpy:
+            try:
+                matrix = np.asarray(assignments, dtype=bool)
+            except ValueError as e:     # ragged rows
+                raise shape_error from e
+            if matrix.size == 0 and matrix.ndim != 2:
+                # no rows, however the empty batch was spelled; rows of no
+                # columns (a statement without identifiers) stay rows
+                matrix = matrix.reshape(0, len(columns))
+            if matrix.ndim != 2 or matrix.shape[1] != len(columns):
+                raise shape_error
+            return self._run_numpy(program, slots,
+                [matrix[:, i] for i in picks], matrix.shape[0])
+
+        rows = [tuple(row) for row in assignments]
+        if any(len(row) != len(columns) for row in rows):
+            raise shape_error
+        # column i of the batch as a bitset, row 0 in bit 0
+        variables = [int(''.join('1' if row[i] else '0' for row in
+            reversed(rows)) or '0', 2) for i in picks]
+        return self._run_bitsets(program, slots, variables, len(rows))
+
+    def table_chunks(self, rpn, chunk_rows=None):
+        """
+        Full truth table of rpn in chunks of chunk_rows rows: an iterator of
+        (first row, results), rows ordered as Boole numbers them, or None
+        without a table.
+        """
+        lowered = self.boole.lower(rpn)
+        if lowered is None:
+            return None
+        return self._chunks(lowered, chunk_rows or self.chunk_rows)
+
+    def _chunks(self, lowered, chunk_rows):
+        program, names, slots = lowered
+        count = len(names)
+        total = 1 << count
+
+        if not self.numpy:
+            if count > self.boole.max_variables:
+                raise Errors("Too many identifiers for a truth table: " +
+                    f"{count} (at most {self.boole.max_variables})")
+            masks = [variable_mask(i, count) for i in range(count)]
+            result = _unpack(self._bitsets(program, slots, masks, total),
+                total)
+            for start in range(0, total, chunk_rows):
+                yield start, result[start:start + chunk_rows]
+            return
+
+        if count > 62:
+            raise Errors(f"Too many identifiers for a truth table: {count}")
+        shifts = np.arange(count - 1, -1, -1, dtype=np.int64)
+        for start in range(0, total, chunk_rows):
+            stop = min(start + chunk_rows, total)
+            rows = np.arange(start, stop, dtype=np.int64)
+            bits = ((rows[:, None] >> shifts) & 1).astype(bool)
+            yield start, self._run_numpy(program, slots,
+                [bits[:, i] for i in range(count)], stop - start)
+
+    def _run_numpy(self, program, slots, variables, rows):
+        leaves = [variables[slot] if slot is not None else
+            np.full(rows, bool(value)) for slot, value in zip(slots,
+            program.values)]
+        result = self.boole.run(program.code, leaves, None, self.kernels)
+        return np.broadcast_to(np.asarray(result, dtype=bool), (rows,)).copy()
+
+    def _bitsets(self, program, slots, variables, rows):
+        full = (1 << rows) - 1
+        leaves = [variables[slot] if slot is not None else (full if value
+            else 0) for slot, value in zip(slots, program.values)]
+        return self.boole.run(program.code, leaves, full)
+
+    def _run_bitsets(self, program, slots, variables, rows):
+        return _unpack(self._bitsets(program, slots, variables, rows), rows)
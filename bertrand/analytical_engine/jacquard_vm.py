@@ -0,0 +1,268 @@
+"""
+Bytecode virtual machine for RPN statements.
+
+"""
+from array import array
+from collections import OrderedDict
+from functools import partial
+from bertrand.language_services.dictionaries.operators import (BY_OPCODE,
+    NOT_AN_OPERATOR, opcode_of)
+
+UNKNOWN = "unknown"
+
+# Instruction that pushes a term; every other instruction is an opcode
+LOAD = NOT_AN_OPERATOR
+
+# Term values: known results use the bool's int, residuals are unknown
+_FALSE, _TRUE, RESIDUAL = 0, 1, 2
+_VALUES = (False, True, UNKNOWN)
+
+# Term references: the two known results, then the constant pool
+FIRST_CONSTANT = 2
+_LAST_CONSTANT = 0xFFFF
+
+def leaf_value(tok):
+    """
+    The term value Knuth.bool_values() gives a token, or None if it is not
+    one the truth tables cover.
+    """
+    if tok.get('token_type') == 'boolean':
+        lex = tok.get('lexeme')
+        if lex in ('⊤', 'T', 'True', 'true', '1'):
+            return _TRUE
+        if lex in ('⊥', 'F', 'False', 'false', '∅', '0'):
+            return _FALSE
+    value = tok.get('value', UNKNOWN)
+    if value is True:
+        return _TRUE
+    if value is False:
+        return _FALSE
+    if value == UNKNOWN:
+        return RESIDUAL
+    return None
+
+# pylint: disable=too-few-public-methods
+class Program:
+    """
+    One lowered statement: code is LOAD, term pairs and operator opcodes,
+    constants holds the token behind each constant term and values their
+    term values. The value stack never holds more than every constant.
+    """
+    __slots__ = ("code", "constants", "values")
+
+    def __init__(self, code, constants, values):
+        self.code = code
+        self.constants = constants
+        self.values = values
+
+class Jacquard:
+    """
+    Bytecode VM for Knuth. lower() compiles a statement into an array('H')
+    program over a constant pool, and run() evaluates the program in one
+    dispatch loop, on a value stack allocated once per run; a residual
+    result is a term (spelling pieces and operand references) in a per-run
+    table, and only the final result is rendered to text. The code of a
+    program depends only on the statement's shape (its operators and where
+    its leaves are), so it is assembled once per shape and the last
+    `maxsize` shapes are kept, least recently used first out; lowering a
+    statement of a known shape only collects its leaves. The engines that
+    run a program over many rows (see Boole) share the same code.
+
+    Truth tables and residual spellings are read off the evaluator's own
+    operator methods when the VM is built, so results match Knuth.eval_rpn()
+    exactly. Statements using substitution, operators the evaluator does not
+    know, stack underflow, or token values other than True, False and
+    "unknown" are not lowered and stay with the interpreter.
+    """
+
+    def __init__(self, evaluator, maxsize=1024):
+        size = len(BY_OPCODE)
+        self.arity = bytearray(size)            # 0: cannot be lowered
+        self.tables = [None] * size             # value(s) -> result value
+        self.spelling = [None] * size           # residual text pieces
+        self.maxsize = maxsize
+        self._code = OrderedDict()              # shape -> code
+
+        known = [{'value': value, 'lexeme': value} for value in _VALUES]
+        operand = ({'value': UNKNOWN, 'lexeme': '\0'},
+            {'value': UNKNOWN, 'lexeme': '\1'})
+        for op in BY_OPCODE[1:]:
+            func = evaluator._dispatch[op.opcode] # pylint: disable=protected-access
+            if func is None or op.evaluator == 'subst':
+                continue
+            if op.evaluator == 'memb':
+                func = partial(func, op.lexeme)
+
+            if op.arity == 1:
+                table = [func(a) for a in known]
+                residual = str(func(operand[0]))
+                self.spelling[op.opcode] = tuple(residual.split('\0'))
+            else:
+                table = [func(a, b) for a in known for b in known]
+                residual = str(func(*operand))
+                head, rest = residual.split('\0')
+                self.spelling[op.opcode] = (head,) + tuple(rest.split('\1'))
+
+            self.tables[op.opcode] = bytes(int(r) if isinstance(r, bool)
+                else RESIDUAL for r in table)
+            self.arity[op.opcode] = op.arity
+
+    def lower(self, rpn):
+        """Lower rpn into a Program, or return None if it cannot be."""
+        arities = self.arity
+        shape = bytearray()         # opcode of each token, LOAD for leaves
+        constants = []
+        values = bytearray()
+        mark = shape.append
+        keep = constants.append
+        note = values.append
+        depth = 0
+
+        for tok in rpn:
+            token_type = tok['token_type']
+            if token_type == 'operator':
+                opcode = tok.get('opcode') or opcode_of(tok.get('lexeme'))
+                arity = arities[opcode]
+                if not arity or depth < arity:
+                    return None
+                mark(opcode)
+                depth -= arity - 1
+                continue
+
+            value = tok.get('value', UNKNOWN)
+            if value == UNKNOWN and token_type != 'boolean':
+                value = RESIDUAL
+            else:
+                value = leaf_value(tok)
+                if value is None:
+                    return None
+            mark(LOAD)
+            keep(tok)
+            note(value)
+            depth += 1
+
+        if not depth or len(constants) > _LAST_CONSTANT - FIRST_CONSTANT + 1:
+            return None
+        return Program(self._assembled(bytes(shape)), constants, values)
+
+    def _assembled(self, shape):
+        # the code of shape, from the cache or assembled into it
+        cache = self._code
+        code = cache.get(shape)
+        if code is not None:
+            try:
+                cache.move_to_end(shape)
+            except KeyError:    # evicted by a concurrent request
+                pass
+            return code
+
+        code = array('H')
+        emit = code.append
+        ref = FIRST_CONSTANT
+        for opcode in shape:
+            emit(opcode)
+            if opcode == LOAD:
+                emit(ref)
+                ref += 1
+        cache[shape] = code
+        try:
+            cache.move_to_end(shape)
+        except KeyError:        # evicted by a concurrent request
+            pass
+        while len(cache) > self.maxsize:
+            try:
+                cache.popitem(last=False)
+            except KeyError:    # emptied by a concurrent request
+                break
+        return code
+
+    def run(self, rpn):
+        """
+        Evaluate rpn and return the result stack Knuth.eval_rpn() would
+        report, or None when rpn must be interpreted.
+        """
+        program = self.lower(rpn)
+        if program is None:
+            return None
+        return self.execute(program)
+
+    def execute(self, program):
+        """Evaluate a lowered program and return its result stack."""
+        tables = self.tables
+        arities = self.arity
+        spelling = self.spelling
+        code = program.code
+        constants = program.constants
+        leaves = program.values
+        # the stack never holds more than every constant
+        values = bytearray(len(constants))  # term value of each entry
+        items = [None] * len(constants)     # its token, known result or
+                                            # residual reference
+        terms = []          # each residual's pieces and operands, last first
+        top = -1
+        pc = 0
+        end = len(code)
+
+        while pc < end:
+            opcode = code[pc]
+            if opcode == LOAD:
+                ref = code[pc + 1] - FIRST_CONSTANT
+                top += 1
+                values[top] = leaves[ref]
+                items[top] = constants[ref]
+                pc += 2
+                continue
+
+            pc += 1
+            arity = arities[opcode]
+            if arity == 1:
+                res = tables[opcode][values[top]]
+            else:
+                b = items[top]
+                top -= 1
+                res = tables[opcode][3 * values[top] + values[top + 1]]
+            if res != RESIDUAL:
+                values[top] = res
+                items[top] = bool(res)
+                continue
+
+            # operands are spelled here, known ones as text and residuals
+            # by reference, so no subterm's text is ever built
+            a = items[top]
+            if a.__class__ is not int:
+                a = str(a) if a.__class__ is bool else str(a.get('lexeme'))
+            pieces = spelling[opcode]
+            if arity == 1:
+                terms.append((pieces[1], a, pieces[0]))
+            else:
+                if b.__class__ is not int:
+                    b = str(b) if b.__class__ is bool else str(b.get('lexeme'))
+                terms.append((pieces[2], b, pieces[1], a, pieces[0]))
+            values[top] = RESIDUAL
+            items[top] = len(terms) - 1
+
+        item = items[top]
+        if item.__class__ is bool:
+            return [{'lexeme': item, 'token_type': 'boolean', 'value': item}]
+        if item.__class__ is not int:
+            return [item]
+        return [{'lexeme': self._render(terms, item), 'token_type':
+            'identifier', 'value': UNKNOWN}]
+
+    @staticmethod
+    def _render(terms, ref):
+        # One walk down from the result term: text goes straight to the
+        # output and residual operands back on the work stack, so each
+        # piece is written once.
+        out = []
+        emit = out.append
+        work = list(terms[ref])
+        pop = work.pop
+        extend = work.extend
+        while work:
+            item = pop()
+            if item.__class__ is int:
+                extend(terms[item])
+            else:
+                emit(item)
+        return "".join(out)
@@ -0,0 +1,286 @@
+"""
+Compilation of RPN statements to Python functions for the evaluator.
+
+"""
+from collections import OrderedDict
+from bertrand.language_services.dictionaries.operators import (BY_OPCODE,
+    operator_of)
+
+UNKNOWN = "unknown"
+
+# Python source for each evaluator, over (value, lexeme) pairs: a is
+# (av, al), b is (bv, bl) and the result is (rv, rl). A known result has
+# its lexeme equal to its value, as Knuth._res_bldr() builds it. Each
+# template mirrors the Knuth method of the same name.
+_TEMPLATES = {
+    'neg': """\
+if av == U:
+    rv = U; rl = f"(¬{al})"
+else:
+    rv = rl = (not av)""",
+    'exists': """\
+if av == U:
+    rv = U; rl = f"(∃{al})"
+else:
+    rv = rl = av""",
+    'not_exists': """\
+if av == U:
+    rv = U; rl = f"(¬∃{al})"
+else:
+    rv = rl = (not av)""",
+    'for_all': """\
+if av == U:
+    rv = U; rl = f"(∀{al})"
+else:
+    rv = rl = av""",
+    'not_for_all': """\
+if av == U:
+    rv = U; rl = f"(¬∀{al})"
+else:
+    rv = rl = (not av)""",
+    'and_': """\
+if (av == U and bv in (U, True)) or (bv == U and av in (U, True)):
+    rv = U; rl = f"({al} ∧ {bl})"
+elif False in (av, bv):
+    rv = rl = False
+else:
+    rv = rl = (av and bv)""",
+    'inc_or': """\
+if (av == U and bv in (U, False)) or (bv == U and av in (U, False)):
+    rv = U; rl = f"({al} ∨ {bl})"
+elif True in (av, bv):
+    rv = rl = True
+else:
+    rv = rl = (av or bv)""",
+    'nand': """\
+if (av == U and bv in (U, True)) or (bv == U and av in (U, True)):
+    rv = U; rl = f"({al} ↑ {bl})"
+elif False in (av, bv):
+    rv = rl = True
+else:
+    rv = rl = not (av and bv)""",
+    'nor': """\
+if (av == U and bv in (U, False)) or (bv == U and av in (U, False)):
+    rv = U; rl = f"({al} ↓ {bl})"
+elif True in (av, bv):
+    rv = rl = False
+else:
+    rv = rl = not (av or bv)""",
+    'exc_or': """\
+if av == U or bv == U:
+    rv = U; rl = f"({al} ⨁ {bl})"
+else:
+    rv = rl = (av and (not bv)) or ((not av) and bv)""",
+    'imp': """\
+if av is False or bv is True:
+    rv = rl = True
+elif av == U or bv == U:
+    rv = U; rl = f"({al} → {bl})"
+else:
+    rv = rl = (not av) or bv""",
+    'bi_imp': """\
+if av == U or bv == U:
+    rv = U; rl = f"({al} ↔ {bl})"
+else:
+    rv = rl = (av and bv) or ((not av) and (not bv))""",
+    'eqv': """\
+if av == U or bv == U:
+    rv = U; rl = f"({al} ≡ {bl})"
+else:
+    rv = rl = (av and bv) or ((not av) and (not bv))""",
+}
+
+def _constant_value(lex):
+    # the value Knuth.bool_values() gives a boolean token
+    if lex in ('⊤', 'T', 'True', 'true', '1'):
+        return True
+    if lex in ('⊥', 'F', 'False', 'false', '∅', '0'):
+        return False
+    return UNKNOWN
+
+class Lovelace:
+    """
+    Tiered compiler for RPN statements. A statement is fingerprinted by its
+    shape: operator opcodes, boolean constants, and identifiers numbered by
+    first appearance. Shapes are interpreted by Knuth until they have been
+    seen `threshold` times, then compiled with compile() into a function
+    that takes each distinct identifier's (value, lexeme) as arguments. Up
+    to `maxsize` shapes are kept, least recently used first out.
+
+    A compiled statement is also filed under its lexemes, which fix its
+    shape, so a statement that comes back verbatim is looked up without
+    fingerprinting it again.
+
+    Only statements built from the boolean connectives, identifiers and
+    boolean constants, with well-formed stack use and at most max_operators
+    operators, are compiled. Anything else (substitution, membership, sets,
+    numbers) stays with the interpreter.
+    """
+
+    # largest statement compiled; bigger ones are rare and slow to compile
+    max_operators = 128
+
+    def __init__(self, threshold=3, maxsize=1024):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        # fingerprint -> evaluation count, or the compiled function
+        self._entries = OrderedDict()
+        # lexemes -> (compiled function, positions of its arguments' tokens)
+        self._verbatim = OrderedDict()
+
+    def run(self, rpn):
+        """
+        Evaluate rpn with its compiled function and return the result as
+        Knuth's operator methods would (bool, or the residual string), or
+        None when rpn must be interpreted.
+        """
+        try:
+            lexemes = tuple([tok.get('lexeme') for tok in rpn])
+            hit = self._verbatim.get(lexemes)
+        except TypeError:   # unhashable lexeme, such as a set
+            lexemes = hit = None
+        if hit is not None:
+            func, positions = hit
+            args = []
+            for pos in positions:
+                tok = rpn[pos]
+                args.append(tok.get('value', UNKNOWN))
+                args.append(tok['lexeme'])
+            return func(*args)
+
+        shape = self.fingerprint(rpn, self.max_operators)
+        if shape is None:
+            return None
+        fingerprint, args = shape
+
+        entry = self._entries.get(fingerprint)
+        if callable(entry):
+            _touch(self._entries, fingerprint)
+            func = entry
+        else:
+            count = (entry or 0) + 1
+            if count < self.threshold:
+                _store(self._entries, fingerprint, count, self.maxsize)
+                return None
+            func = self.compile(fingerprint)
+            _store(self._entries, fingerprint, func, self.maxsize)
+
+        if lexemes is not None:
+            _store(self._verbatim, lexemes, (func, _positions(rpn)),
+                self.maxsize)
+        return func(*args)
+
+    @staticmethod
+    def fingerprint(rpn, max_operators=None):
+        """
+        Return (fingerprint, args) for a compilable statement, else None.
+        Fingerprint items are opcodes (positive ints), identifier slots
+        (negative ints) and boolean constant lexemes (str); args holds
+        value, lexeme for each identifier slot in order. Statements with
+        more than max_operators operators are not compilable.
+        """
+        items = []
+        args = []
+        slots = {}
+        depth = 0
+        operators = 0
+
+        for tok in rpn:
+            ttype = tok.get('token_type')
+            lex = tok.get('lexeme')
+            if ttype == 'operator':
+                op = operator_of(tok)
+                if op is None or op.evaluator not in _TEMPLATES or \
+                    depth < op.arity:
+                    return None
+                depth -= op.arity - 1
+                operators += 1
+                if max_operators is not None and operators > max_operators:
+                    return None
+                items.append(op.opcode)
+            elif ttype == 'identifier' and isinstance(lex, str):
+                slot = slots.get(lex)
+                if slot is None:
+                    slot = slots[lex] = len(slots)
+                    args.append(tok.get('value', UNKNOWN))
+                    args.append(lex)
+                depth += 1
+                items.append(-1 - slot)
+            elif ttype == 'boolean' and isinstance(lex, str):
+                depth += 1
+                items.append(lex)
+            else:
+                return None
+
+        if depth != 1 or not operators:
+            return None
+        return tuple(items), args
+
+    @staticmethod
+    def compile(fingerprint):
+        """
+        Generate, compile and return the function for fingerprint. Each
+        result goes to the temporary of the stack position it lands on, so
+        a temporary is overwritten once its value has been used and the
+        function holds no more intermediate results than the stack does.
+        """
+        slots = 1 + max((-1 - item for item in fingerprint if
+            isinstance(item, int) and item < 0), default=-1)
+        params = ", ".join(f"v{i}, l{i}" for i in range(slots))
+
+        body = []
+        stack = []
+        for item in fingerprint:
+            if isinstance(item, str):
+                stack.append((repr(_constant_value(item)), repr(item)))
+                continue
+            if item < 0:
+                stack.append((f"v{-1 - item}", f"l{-1 - item}"))
+                continue
+
+            op = BY_OPCODE[item]
+            if op.arity == 2:
+                b_val, b_lex = stack.pop()
+                a_val, a_lex = stack.pop()
+                body.append(f"bv = {b_val}; bl = {b_lex}")
+            else:
+                a_val, a_lex = stack.pop()
+            body.append(f"av = {a_val}; al = {a_lex}")
+            body.append(_TEMPLATES[op.evaluator])
+            temp = len(stack)
+            body.append(f"t{temp} = rv; s{temp} = rl")
+            stack.append((f"t{temp}", f"s{temp}"))
+
+        body.append(f"return {stack[-1][1]}")
+        source = f"def _statement({params}):\n" + "\n".join(
+            "    " + line for block in body for line in block.split("\n"))
+
+        namespace = {'U': UNKNOWN}
+        exec(compile(source, "<spock statement>", "exec"), namespace) # pylint: disable=exec-used
+        return namespace['_statement']
+
+def _positions(rpn):
+    # position of the first token of each identifier, in slot order
+    seen = set()
+    positions = []
+    for pos, tok in enumerate(rpn):
+        lex = tok.get('lexeme')
+        if tok.get('token_type') == 'identifier' and lex not in seen:
+            seen.add(lex)
+            positions.append(pos)
+    return positions
+
+def _touch(cache, key):
+    try:
+        cache.move_to_end(key)
+    except KeyError:    # evicted by a concurrent request
+        pass
+
+def _store(cache, key, entry, maxsize):
+    cache[key] = entry
+    _touch(cache, key)
+    while len(cache) > maxsize:
+        try:
+            cache.popitem(last=False)
+        except KeyError:    # emptied by a concurrent request
+            break
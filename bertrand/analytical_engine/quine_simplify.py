@@ -0,0 +1,189 @@
+"""
+Algebraic simplification of RPN statements before evaluation.
+
+"""
+from bertrand.language_services.dictionaries.operators import (OPERATORS,
+    BY_OPCODE, opcode_of)
+from bertrand.analytical_engine.jacquard_vm import (UNKNOWN, RESIDUAL,
+    leaf_value)
+
+_NEG = OPERATORS['¬'].opcode
+_AND = OPERATORS['∧'].opcode
+_OR = OPERATORS['∨'].opcode
+_DUAL = {'and_': _OR, 'inc_or': _AND}
+
+# Nodes of the two boolean constants; every other node is a leaf or an
+# operator over nodes
+_FALSE, _TRUE = 0, 1
+
+class Quine:
+    """
+    Simplifier for RPN statements. Constants are folded through the
+    evaluator's own truth tables, read off the Jacquard VM, so ⊤ and ⊥ fold
+    exactly where Knuth's Kleene semantics decide a result: annihilators
+    (p ∧ ⊥) fold to a constant and identities (p ∧ ⊤) to the other operand,
+    or to its negation (p → ⊥). Idempotence (p ∧ p), absorption
+    (p ∧ (p ∨ q)), double negation and De Morgan ((¬p ∧ ¬q) to ¬(p ∨ q))
+    apply to the connectives. Every rule makes the statement smaller and
+    holds in three-valued logic, so results are the ones Knuth gives,
+    with smaller residuals.
+
+    Subterms are hash-consed, so equal subterms are one node and compare in
+    constant time. Rules are applied as each node is built, and to every
+    node they build, so one pass over the statement reaches the fixpoint;
+    at most `budget` rules fire per statement.
+
+    Statements the VM cannot lower (substitution, sets, numbers, stack
+    underflow) are returned as they are.
+    """
+
+    def __init__(self, budget=4096):
+        self.budget = budget
+
+    def simplify(self, rpn, vm):
+        """rpn simplified, or rpn itself if no rule applies."""
+        return _Rewrite(vm, self.budget).run(rpn)
+
+class _Rewrite:
+    """The nodes of one statement being simplified."""
+
+    def __init__(self, vm, budget):
+        self.tables = vm.tables
+        self.arity = vm.arity
+        self.budget = budget
+        self.remaining = budget
+        # opcode (0 for a leaf), token and operand nodes of each node
+        self.opcode = [0, 0]
+        self.token = [None, None]
+        self.operands = [(), ()]
+        self.unique = {}
+
+    def run(self, rpn):
+        stack = []
+        for tok in rpn:
+            token_type = tok['token_type']
+            if token_type == 'operator':
+                opcode = tok.get('opcode') or opcode_of(tok.get('lexeme'))
+                arity = self.arity[opcode]
+                if not arity or len(stack) < arity:
+                    return rpn
+                operands = tuple(stack[-arity:])
+                del stack[-arity:]
+                stack.append(self.make(opcode, tok, operands))
+                continue
+
+            if token_type not in ('identifier', 'boolean'):
+                return rpn
+            value = tok.get('value', UNKNOWN)
+            if value != UNKNOWN or token_type == 'boolean':
+                value = leaf_value(tok)
+                if value is None:
+                    return rpn
+                if value != RESIDUAL:
+                    stack.append(value)
+                    continue
+            lex = tok.get('lexeme')
+            if not isinstance(lex, str):
+                return rpn
+            stack.append(self.intern(0, tok, (token_type, lex)))
+
+        if len(stack) != 1 or self.remaining == self.budget:
+            return rpn
+        return self.emit(stack[0])
+
+    def intern(self, opcode, tok, operands):
+        key = (opcode, operands)
+        node = self.unique.get(key)
+        if node is None:
+            node = self.unique[key] = len(self.opcode)
+            self.opcode.append(opcode)
+            self.token.append(tok)
+            self.operands.append(operands)
+        return node
+
+    def make(self, opcode, tok, operands):
+        """The node of opcode over operands, simplified."""
+        if self.remaining:
+            node = self.rewrite(opcode, operands)
+            if node is not None:
+                self.remaining -= 1
+                return node
+        if tok is None:
+            lexeme = BY_OPCODE[opcode].lexeme
+            tok = {'lexeme': lexeme, 'token_type': 'operator', 'value':
+                UNKNOWN, 'opcode': opcode}
+        return self.intern(opcode, tok, operands)
+
+    def is_a(self, node, evaluator):
+        return node > _TRUE and self.opcode[node] and \
+            BY_OPCODE[self.opcode[node]].evaluator == evaluator
+
+    def rewrite(self, opcode, operands):
+        """What a rule rewrites opcode over operands to, or None."""
+        table = self.tables[opcode]
+        if len(operands) == 1:
+            a = operands[0]
+            if a <= _TRUE:
+                res = table[a]
+                return res if res != RESIDUAL else None
+            if BY_OPCODE[opcode].evaluator == 'neg' and self.is_a(a, 'neg'):
+                return self.operands[a][0]
+            return None
+
+        a, b = operands
+        if a <= _TRUE or b <= _TRUE:
+            res = table[3 * min(a, RESIDUAL) + min(b, RESIDUAL)]
+            if res != RESIDUAL:
+                return res
+            if a <= _TRUE and b <= _TRUE:
+                return None
+            # the two-valued results over the other operand: itself or its
+            # negation
+            if a <= _TRUE:
+                other, results = b, (table[3 * a], table[3 * a + 1])
+            else:
+                other, results = a, (table[b], table[3 + b])
+            if results == (_FALSE, _TRUE):
+                return other
+            if results == (_TRUE, _FALSE):
+                return self.make(_NEG, None, (other,))
+            return None
+
+        evaluator = BY_OPCODE[opcode].evaluator
+        dual = _DUAL.get(evaluator)
+        if dual is None:
+            return None
+        if a == b:
+            return a
+        # absorption
+        dual = BY_OPCODE[dual].evaluator
+        if self.is_a(b, dual) and a in self.operands[b]:
+            return a
+        if self.is_a(a, dual) and b in self.operands[a]:
+            return b
+        # De Morgan
+        if self.is_a(a, 'neg') and self.is_a(b, 'neg'):
+            inner = self.make(_DUAL[evaluator], None, (self.operands[a][0],
+                self.operands[b][0]))
+            return self.make(_NEG, None, (inner,))
+        return None
+
+    def emit(self, root):
+        """RPN of root, each operand before its operator."""
+        if root <= _TRUE:
+            return [{'lexeme': str(bool(root)), 'token_type': 'boolean',
+                'value': bool(root), 'opcode': 0}]
+        out = []
+        pending = [(root, False)]
+        while pending:
+            node, expanded = pending.pop()
+            if node <= _TRUE:
+                out.append({'lexeme': str(bool(node)), 'token_type':
+                    'boolean', 'value': bool(node), 'opcode': 0})
+            elif expanded or not self.opcode[node]:
+                out.append(self.token[node])
+            else:
+                pending.append((node, True))
+                pending.extend((a, False) for a in
+                    reversed(self.operands[node]))
+        return out
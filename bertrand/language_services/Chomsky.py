@@ -5,24 +5,38 @@ Hub to the endpoints
 # pylint: disable=relative-beyond-top-level
 # pylint: disable=invalid-name
 
+import hashlib
 from .scanner import Shannon
 from .turing_parser import Turing
 from ..analytical_engine.babbage_eval import Knuth
+from ..analytical_engine.bryant_bdd import Bryant
 from .dictionaries.tokens import token_dict
 from .dictionaries.errors import Errors
 
 # Project naming theme:
 #  - Shannon: scanner helpers (information theory roots)
 #  - VonNeumann: concrete lexer (machine model)
+#  - Thompson: table-driven lexer (regular expression compilation)
 #  - Turing: parser (computability foundations)
 #  - Hamilton: aux parser / reliability (Apollo-era software)
 #  - Chomsky: entry point over grammars
 #  - Grieg: token “orchestrator” (composer—because code should sing)
 #  - Babbage: The evaluation "engine"
+#  - Lovelace: compiles statements for the engine (its first programmer)
+#  - Jacquard: bytecode VM (the punched cards the engine was to read)
+#  - Boole: truth tables (the algebra of logic)
+#  - Hollerith: batch evaluation (tabulating machines)
+#  - Gray: truth-table pages in Gray-code order (reflected binary code)
+#  - Amdahl: model counting sharded across cores (parallel speedup)
+#  - Davis: SAT solving (the Davis–Putnam procedure)
+#  - Bryant: binary decision diagrams (reduced ordered BDDs)
+#  - Frege: interned residual terms (the Begriffsschrift's concept notation)
+#  - Quine: simplification before evaluation (Quine–McCluskey minimization)
 
-def chomsky(source):
+def chomsky(source, eval_engine="knuth"):
     """
     Main function that ties together the scanner, parser, and evaluator.
+    eval_engine selects the evaluator (see babbage_eval.EVAL_ENGINES).
 
     """
     try:
@@ -44,7 +58,7 @@ def chomsky(source):
 
         # Step 3: Evaluate
         try:
-            evaluator = Knuth(parsed_code)
+            evaluator = Knuth(parsed_code, eval_engine)
             result = evaluator.engine()
         except Errors as e:
             return {"success": False, "stage": "evaluator", "error": \
@@ -55,3 +69,196 @@ def chomsky(source):
     except RuntimeError as e:
         # last-resort guard so failures always produce a dict
         return {"success": False, "stage": "unknown", "error": f"{e}"}
+
+_STAGE_PREFIX = {
+    "scanner": "Scanner error",
+    "parser": "Parser error",
+    "evaluator": "Evaluator error",
+}
+
+def _staged(stage, iterable):
+    """Tag Errors raised while draining `iterable` with the pipeline stage."""
+    try:
+        yield from iterable
+    except Errors as e:
+        if getattr(e, "stage", None) is None:
+            e.stage = stage
+        raise
+
+def chomsky_stream(source, eval_engine="knuth"):
+    """
+    Streaming counterpart of chomsky(). Scanner, parser and evaluator are
+    chained generators, so each statement is evaluated and its result line
+    yielded before the next statement is scanned. Memory is bounded by the
+    largest statement rather than the whole document.
+
+    Because results are produced incrementally, an error in a later statement
+    is reported (as the same dict chomsky() returns) after the results of the
+    statements before it.
+    """
+    try:
+        tokens = _staged("scanner", Shannon(token_dict).iter_tokens(source))
+        statements = _staged("parser", Turing.parse_stream(tokens))
+        yield from _staged("evaluator", Knuth(statements,
+            eval_engine).engine_stream())
+
+    except Errors as e:
+        yield {"success": False, "stage": e.stage, "error": \
+            f"{_STAGE_PREFIX[e.stage]}: {e.error_report()}"}
+
+    except RuntimeError as e:
+        yield {"success": False, "stage": "unknown", "error": f"{e}"}
+
+def _statements(source):
+    """RPN of every statement of source, stage-tagged on error."""
+    try:
+        token_list = Shannon(token_dict).scan_source(source)
+    except Errors as e:
+        e.stage = "scanner"
+        raise
+    try:
+        return Turing(token_list).parse()
+    except Errors as e:
+        e.stage = "parser"
+        raise
+
+def _statement_rpn(source, number, statements=None):
+    """RPN of statement number (1-based) of source, stage-tagged on error."""
+    if statements is None:
+        statements = _statements(source)
+    if not 1 <= number <= len(statements):
+        raise Errors(f"No statement {number}; the source has " +
+            f"{len(statements)}")
+    return statements[number - 1]
+
+def _digest(source):
+    """
+    Fixed-size digest of source, to key caches by a document without
+    keeping the document alive.
+    """
+    return hashlib.blake2b(source.encode('utf-8', 'surrogatepass'),
+        digest_size=16).digest()
+
+def chomsky_truth_table(source, page=0, page_size=256, statement=1):
+    """
+    One page of the truth table of a statement of source, in Gray-code
+    order: a header record with the identifiers, the row and page counts,
+    then one record per row with the identifiers' values and the result.
+    Pages are generated on demand and the lowered statement is cached, so
+    paging through a table of any size takes constant memory.
+
+    Errors are yielded as the same dict chomsky_stream() yields.
+    """
+    try:
+        pager = Knuth([]).pager()
+        lowered = pager.lower((_digest(source), statement),
+            lambda: _statement_rpn(source, statement))
+        if lowered is None:
+            raise Errors(f"Statement {statement} has no truth table")
+
+        identifiers = lowered[1]
+        rows = 1 << len(identifiers)
+        rows_out = pager.page(lowered, page, page_size)
+        yield {"success": True, "identifiers": list(identifiers),
+            "rows": rows, "page": page, "page_size": page_size,
+            "pages": -(-rows // page_size)}
+        for row, values, result in rows_out:
+            yield {"row": row, "values": values, "result": result}
+
+    except Errors as e:
+        stage = getattr(e, "stage", None) or "evaluator"
+        yield {"success": False, "stage": stage, "error": \
+            f"{_STAGE_PREFIX[stage]}: {e.error_report()}"}
+
+    except RuntimeError as e:
+        yield {"success": False, "stage": "unknown", "error": f"{e}"}
+
+def chomsky_batch(source, assignments, identifiers=None, statement=1):
+    """
+    Evaluate a statement of source for every row of assignments, a matrix
+    of truth values (rows x identifiers), in one vectorized pass: a dict
+    with the column identifiers and one result per row. identifiers names
+    the columns; by default they are the statement's identifiers in order
+    of first appearance. For grading many assignments against one formula.
+
+    Errors are returned as the same dict chomsky() returns.
+    """
+    try:
+        tabulator = Knuth([]).tabulator()
+        rpn = _statement_rpn(source, statement)
+        columns = identifiers if identifiers is not None else \
+            tabulator.identifiers(rpn)
+        results = None if columns is None else tabulator.evaluate(rpn,
+            assignments, columns)
+        if results is None:
+            raise Errors(f"Statement {statement} has no truth table")
+        return {"success": True, "identifiers": list(columns),
+            "results": [bool(result) for result in results]}
+
+    except Errors as e:
+        stage = getattr(e, "stage", None) or "evaluator"
+        return {"success": False, "stage": stage, "error": \
+            f"{_STAGE_PREFIX[stage]}: {e.error_report()}"}
+
+    except RuntimeError as e:
+        return {"success": False, "stage": "unknown", "error": f"{e}"}
+
+def chomsky_model_count(source, statement=1):
+    """
+    Exhaustive model count of a statement of source, as a dict: the
+    identifiers, the number of rows and of satisfying rows, the verdict and
+    the first satisfying row and counterexample. Statements with more than
+    Amdahl.parallel_threshold identifiers are sharded across a process
+    pool, as the boole engine shards statements past its truth-table limit.
+
+    Errors are returned as the same dict chomsky() returns.
+    """
+    try:
+        count = Knuth([]).model_counter().count_batch(_statement_rpn(source,
+            statement))
+        if count is None:
+            raise Errors(f"Statement {statement} has no truth table")
+        return {"success": True, **count.to_map()}
+
+    except Errors as e:
+        stage = getattr(e, "stage", None) or "evaluator"
+        return {"success": False, "stage": stage, "error": \
+            f"{_STAGE_PREFIX[stage]}: {e.error_report()}"}
+
+    except RuntimeError as e:
+        return {"success": False, "stage": "unknown", "error": f"{e}"}
+
+def chomsky_equivalence(source, first=1, second=2, order=None):
+    """
+    Whether two statements of source have the same truth function, decided
+    on their decision diagrams: a dict with the verdict and, for each
+    statement, its canonical form (True, False, a formula, or None when too
+    long to spell) and its number of models over the identifiers of both.
+    order lists identifiers to put first in the variable order; by default
+    identifiers are ordered by first appearance.
+
+    Errors are returned as the same dict chomsky() returns.
+    """
+    try:
+        statements = _statements(source)
+        rpns = [_statement_rpn(source, number, statements) for number in
+            (first, second)]
+        bdd = Bryant(Knuth([]).truth_tables(), order or ())
+        nodes = [bdd.build(rpn) for rpn in rpns]
+        if None in nodes:
+            missing = first if nodes[0] is None else second
+            raise Errors(f"Statement {missing} has no truth table")
+        support = set(bdd.support(nodes[0])) | set(bdd.support(nodes[1]))
+        identifiers = [name for name in bdd.names if name in support]
+        return {"success": True, "equivalent": nodes[0] == nodes[1],
+            "identifiers": identifiers,
+            "forms": [bdd.canonical(node, bdd.max_text) for node in nodes],
+            "models": [bdd.count(node, identifiers) for node in nodes]}
+
+    except Errors as e:
+        stage = getattr(e, "stage", None) or "evaluator"
+        return {"success": False, "stage": stage, "error": \
+            f"{_STAGE_PREFIX[stage]}: {e.error_report()}"}
+
+    except RuntimeError as e:
+        return {"success": False, "stage": "unknown", "error": f"{e}"}
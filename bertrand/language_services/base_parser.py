@@ -2,14 +2,34 @@
 Support functions for the parser module.
 
 """
+from array import array
+from bisect import bisect_right
 from .dictionaries.errors import Errors
-from .dictionaries.tokens import op_prec_dict
+from .dictionaries.operators import operator_of
+from .token_stream import TokenStream
+
+# delimiters that separate expressions/statements
+_STMT_DELIMS = frozenset({';', '.', ',', '$$'})
+
+# a nested list is a complete subexpression;
+# a dict with these token_types is an operand
+_OPERAND_TYPES = frozenset({'identifier', 'boolean', 'number', 'container',
+    'set'})
+
+# element kinds, classified once per container by _InfixChecker
+_LIST, _OPERAND, _PREFIX, _INFIX, _OPERATOR, _DELIM, _OTHER = range(7)
 
 class BaseParser:
     """Base class for parsing logic."""
     def __init__(self, token_list):
         self.token_list = token_list
         self.current_position = 0
+        # expressions preceding token_list when it is one statement of a
+        # longer, streamed document, and how many expressions it spans
+        self.expr_offset = 0
+        self.expression_count = 1
+        # expression boundaries, built on first use by _expression_index()
+        self._expr_bounds = None
 
     def current_token(self):
         """Returns the current token or None if out of bounds."""
@@ -20,6 +40,49 @@ class BaseParser:
         """Advances the current position."""
         self.current_position += 1
 
+    def _expression_index(self):
+        """
+        Sorted token indexes at which a new expression starts, built once per
+        token list. The expression number at token index `pos` is one more
+        than the count of boundaries at or before it, so lookups are a
+        bisect rather than a rescan of self.token_list.
+
+        """
+        if self._expr_bounds is not None:
+            return self._expr_bounds
+
+        bounds = array('I')
+        tokens = self.token_list
+        if isinstance(tokens, TokenStream):
+            # read the columns directly instead of building a view per token
+            lexemes = map(tokens.lexeme, range(len(tokens)))
+            ttypes = map(tokens.token_type, range(len(tokens)))
+            lines = tokens.lines
+        else:
+            lexemes = (getattr(tok, "lexeme", None) for tok in tokens)
+            ttypes = (getattr(tok, "token_type", None) for tok in tokens)
+            lines = (getattr(tok, "line", None) for tok in tokens)
+
+        prev_line = None
+        for i, (lex, ttype, ln) in enumerate(zip(lexemes, ttypes, lines)):
+            if ttype == "delimiter" or lex in _STMT_DELIMS:
+                # the delimiter closes its expression; the next token opens
+                # a new one
+                bounds.append(i + 1)
+                prev_line = None
+                continue
+
+            if prev_line is None:
+                prev_line = ln
+            else:
+                if (ln is not None and prev_line \
+                    is not None and ln != prev_line):
+                    bounds.append(i)
+                prev_line = ln
+
+        self._expr_bounds = bounds
+        return bounds
+
     def _expression_number(self, pos=None):
         """
         Return the 1-based expression number at token index `pos` in
@@ -32,12 +95,8 @@ class BaseParser:
         if pos is None:
             pos = self.current_position
 
-        stmt_delims = {';', '.', ',', '$$'}
-        expr_no = 1
-        prev_line = None
-
         if not self.token_list:
-            return expr_no
+            return 1
 
         try:
             pos = int(pos)
@@ -45,33 +104,14 @@ class BaseParser:
             pos = self.current_position
 
         if pos < 0:
-            return expr_no
+            return 1
         if pos >= len(self.token_list):
             pos = len(self.token_list) - 1
 
-        for i in range(0, pos + 1):
-            tok = self.token_list[i]
-            lex = getattr(tok, "lexeme", None)
-            ttype = getattr(tok, "token_type", None)
-
-            if ttype == "delimiter" or lex in stmt_delims:
-                if i < pos:
-                    expr_no += 1
-                prev_line = None
-                continue
-
-            ln = getattr(tok, "line", None)
-            if prev_line is None:
-                prev_line = ln
-            else:
-                if (ln is not None and prev_line \
-                    is not None and ln != prev_line):
-                    expr_no += 1
-                prev_line = ln
-
-        return expr_no
+        return 1 + bisect_right(self._expression_index(), pos)
 
     def _expr_loc(self, expr_no, col=None):
+        expr_no += self.expr_offset
         if col is None:
             return f"Expression {expr_no}"
         return f"Expression {expr_no}, column {col}"
@@ -103,341 +143,14 @@ class BaseParser:
         """
         Recursively ensure every infix operator has an operand on both sides
         within the same container (list). Also enforces the strict '/' pattern.
-        Raises Errors on the first violation.
-    
+        Raises Errors on the first violation, otherwise returns the number of
+        expressions the container spans.
+
         All location references are reported as expression numbers (1-based),
         rather than source line numbers.
 
         """
-        # extend if you add more unary prefixes
-        prefix_ops = {'¬', '!', '∀', '∃', '¬∀', '¬∃', '!∀', '!∃'}
-
-        # delimiters that separate expressions/statements
-        stmt_delims = {';', '.', ',', '$$'}
-
-        def is_operand_node(n):
-            # a nested list is a complete subexpression;
-            # a dict with these token_types is an operand
-            return (
-                isinstance(n, list) or
-                (isinstance(n, dict) and n.get('token_type') in
-                    (
-                    'identifier',
-                    'boolean',
-                    'number',
-                    'container',
-                    'set',
-                    )
-                )
-            )
-
-        def is_prefix_dict(d):
-            return (
-                isinstance(d, dict) and d.get('token_type') == 'operator' and
-                d.get('lexeme') in prefix_ops
-            )
-
-        def is_infix_dict(d):
-            if not (isinstance(d, dict) and d.get('token_type') == 'operator'):
-                return False
-            lx = d.get('lexeme')
-            # any operator in the precedence table that is not a prefix op
-            # is treated as infix here
-            return (lx in op_prec_dict) and (lx not in prefix_ops)
-
-        def is_stmt_delim_dict(d):
-            return (
-                isinstance(d, dict) and (
-                    d.get('token_type') == 'delimiter' or
-                    d.get('lexeme') in stmt_delims
-                )
-            )
-
-        def first_leaf_dict(n):
-            if isinstance(n, dict):
-                return n
-            if isinstance(n, list):
-                for item in n:
-                    got = first_leaf_dict(item)
-                    if got is not None:
-                        return got
-            return None
-
-        def last_leaf_dict(n):
-            if isinstance(n, dict):
-                return n
-            if isinstance(n, list):
-                for item in reversed(n):
-                    got = last_leaf_dict(item)
-                    if got is not None:
-                        return got
-            return None
-
-        def node_first_line(n):
-            d = first_leaf_dict(n)
-            return d.get('line') if isinstance(d, dict) else None
-
-        def node_last_line(n):
-            d = last_leaf_dict(n)
-            return d.get('line') if isinstance(d, dict) else None
-
-        def node_first_col(n):
-            d = first_leaf_dict(n)
-            return d.get('column') if isinstance(d, dict) else None
-
-        def expr_no_at_index(seq, idx):
-            """
-            1-based expression number within this container, based on statement
-            delimiters and (fallback) line changes when delimiters were consumed
-
-            """
-            expr_no = 1
-            prev_item = None
-
-            for p in range(0, idx + 1):
-                item = seq[p]
-
-                if is_stmt_delim_dict(item):
-                    if p < idx:
-                        expr_no += 1
-                    prev_item = None
-                    continue
-
-                if prev_item is not None:
-                    ll = node_last_line(prev_item)
-                    rl = node_first_line(item)
-                    if ll is not None and rl is not None and ll != rl:
-                        expr_no += 1
-
-                prev_item = item
-
-            return expr_no
-
-        def loc_for_index(seq, idx, tok=None):
-            expr_no = expr_no_at_index(seq, idx)
-            col = None
-            if isinstance(tok, dict):
-                col = tok.get('column')
-            if col is None:
-                col = node_first_col(seq[idx])
-            return self._expr_loc(expr_no, col)
-
-        def err_missing(side, seq, idx, tok):
-            op = tok.get('lexeme')
-            raise Errors(
-                f"{loc_for_index(seq, idx, tok)}: "
-                f"infix operator '{op}' is missing an operand on its "
-                f"{side} side."
-            )
-
-        # Recurse: lists are containers, dicts are leaves
-        if isinstance(node, list):
-            # first, validate each child container
-            for child in node:
-                if isinstance(child, list):
-                    self._check_infix_operands(child)
-
-            # then, validate infix operators within this list
-            i = 0
-            n = len(node)
-            while i < n:
-                cur = node[i]
-
-                if isinstance(cur, list):
-                    i += 1
-                    continue
-
-                if is_infix_dict(cur):
-                    cur_line = node_first_line(cur)
-
-                    # ---- check LEFT operand inside this same list ----
-                    j, left_ok = i - 1, False
-
-                    while j >= 0:
-                        left = node[j]
-                        if is_stmt_delim_dict(left):
-                            break
-
-                        if cur_line is not None:
-                            ll = node_last_line(left)
-                            if ll is not None and ll != cur_line:
-                                break
-
-                        if isinstance(left, list):
-                            left_ok = True
-                            break
-
-                        if isinstance(left, dict):
-
-                            if is_operand_node(left):
-                                left_ok = True
-                                break
-
-                            if is_prefix_dict(left):
-                                j -= 1
-                                continue
-
-                            # hit another operator without intervening operand
-                            if left.get('token_type') == 'operator':
-                                break
-
-                        j -= 1
-
-                    if not left_ok:
-                        err_missing('left', node, i, cur)
-
-                    # ---- check RIGHT operand inside this same list ----
-                    k, right_ok = i + 1, False
-                    # skip a chain of unary prefixes immediately to the right
-                    while k < n and is_prefix_dict(node[k]):
-                        if cur_line is not None:
-                            pl = node_first_line(node[k])
-                            if pl is not None and pl != cur_line:
-                                break
-                        k += 1
-
-                    if k < n:
-                        nxt = node[k]
-                        if cur_line is not None:
-                            nl = node_first_line(nxt)
-                            if nl is not None and nl != cur_line:
-                                nxt = None
-                        if (nxt is not None) and is_operand_node(nxt):
-                            right_ok = True
-
-                    if not right_ok:
-                        err_missing('right', node, i, cur)
-
-                    # strict substitution rule: '/' must be followed
-                    # immediately by id or (id), then ≡ or ↔
-                    if cur.get('lexeme') == '/':
-                        k = i + 1
-                        if k >= n:
-                            raise Errors(
-                                f"{loc_for_index(node, i, cur)}: "
-                                f"substitution '/' is missing the target "
-                                f"variable."
-                            )
-
-                        nxt = node[k]
-                        if cur_line is not None:
-                            nl = node_first_line(nxt)
-                            if nl is not None and nl != cur_line:
-                                raise Errors(
-                                    f"{loc_for_index(node, i, cur)}: "
-                                    f"substitution '/' is missing the target "
-                                    f"variable."
-                                )
-
-                        # Case A: '/x'
-                        if (isinstance(nxt, dict) and nxt.get('token_type') == \
-                            'identifier'):
-                            k2 = k + 1
-                            if (
-                                k2 >= n or not (
-                                    isinstance(node[k2], dict) and
-                                    node[k2].get('token_type') == 'operator' and
-                                    node[k2].get('lexeme') in {'≡', '↔'}
-                                )
-                            ):
-                                raise Errors(
-                                    f"{loc_for_index(node, i, cur)}: "
-                                    f"substitution '/{nxt.get('lexeme','?')}' "
-                                    f"must be "
-                                    f"immediately followed by '≡' or '↔'."
-                                )
-
-                        # Case B: '/(x)' – represented here as a child list
-                        # containing exactly one identifier
-                        elif isinstance(nxt, list):
-                            if not (
-                                len(nxt) == 1 and isinstance(nxt[0], dict) and
-                                nxt[0].get('token_type') == 'identifier'
-                            ):
-                                raise Errors(
-                                    f"{loc_for_index(node, i, cur)}: "
-                                    f"substitution '/' expects a single "
-                                    f"identifier in parentheses "
-                                    f"immediately after '/'."
-                                )
-
-                            k2 = k + 1
-                            if (
-                                k2 >= n or not (
-                                    isinstance(node[k2], dict) and
-                                    node[k2].get('token_type') == 'operator' and
-                                    node[k2].get('lexeme') in {'≡', '↔'}
-                                )
-                            ):
-                                raise Errors(
-                                    f"{loc_for_index(node, i, cur)}: "
-                                    f"substitution "
-                                    f"'/({nxt[0].get('lexeme','?')})' must be "
-                                    f"immediately followed by '≡' or '↔'."
-                                )
-
-                        else:
-                            raise Errors(
-                                f"{loc_for_index(node, i, cur)}: "
-                                f"substitution '/' must be immediately "
-                                f"followed by an "
-                                f"identifier or a parenthesized identifier."
-                            )
-
-                i += 1
-
-            # ---- check for adjacent operands (missing infix operator) ----
-            # If an operand is immediately followed by another operand (or a
-            # prefix-chain that leads to an operand), then an infix operator is
-            # missing between them. Statement delimiters are allowed.
-            p = 0
-            while p < n - 1:
-                left = node[p]
-
-                if not is_operand_node(left):
-                    p += 1
-                    continue
-
-                right = node[p + 1]
-
-                # Treat a line change as an implicit expression boundary
-                ll = node_last_line(left)
-                rl = node_first_line(right)
-                if ll is not None and rl is not None and ll != rl:
-                    p += 1
-                    continue
-
-                # allow statement delimiters between expressions
-                if is_stmt_delim_dict(right):
-                    p += 1
-                    continue
-
-                # operand immediately followed by operand
-                if is_operand_node(right):
-                    loc = loc_for_index(node, p + 1, right \
-                        if isinstance(right, dict) else None)
-                    raise Errors(f"{loc}: two adjacent operands; "
-                        f"missing infix operator between them.")
-
-                # operand followed by unary prefix chain and then an operand
-                if is_prefix_dict(right):
-                    q = p + 1
-                    while q < n and is_prefix_dict(node[q]):
-                        q += 1
-                    if q < n and is_operand_node(node[q]):
-                        loc = loc_for_index(node, q, node[q] \
-                        if isinstance(node[q], dict) else None)
-                        raise Errors(f"{loc}: two adjacent operands; "
-                        f"missing infix operator between them.")
-
-                p += 1
-
-            return
-
-        # dict (leaf) → nothing to do
-        return
-
-        # no additional return needed here; success = no exception
+        return _InfixChecker(self).check(node)
 
     def _flatten(self, seq):
         stmt_delims = {';', '.', ',', '$$'}
@@ -490,3 +203,277 @@ class BaseParser:
             return False
 
         return True
+
+class _InfixChecker:
+    """
+    Internal helper so BaseParser._check_infix_operands() stays small (pylint).
+
+    Every container is walked once up front: each element is classified, the
+    first and last leaf token of nested lists come back from validating
+    them, and the expression number at every index is counted in the same
+    pass. The operand checks and error locations then read these tables
+    instead of rescanning the container.
+
+    """
+
+    def __init__(self, parser):
+        self.parser = parser
+
+    def check(self, node):
+        """Validate node and its nested lists; return its expression count."""
+        if not isinstance(node, list):
+            # dict (leaf) → nothing to do
+            return 1
+        return self._container(node)[2]
+
+    @staticmethod
+    def _kind(item):
+        if isinstance(item, list):
+            return _LIST
+        if not isinstance(item, dict):
+            return _OTHER
+        ttype = item.get('token_type')
+        lex = item.get('lexeme')
+        # set lexemes are dicts themselves, so test membership on strings only
+        if ttype == 'delimiter' or (isinstance(lex, str) and lex in
+            _STMT_DELIMS):
+            return _DELIM
+        if ttype in _OPERAND_TYPES:
+            return _OPERAND
+        if ttype == 'operator':
+            op = operator_of(item)
+            if op is None:
+                return _OPERATOR
+            if op.arity == 1:
+                return _PREFIX
+            # any operator with a precedence that is not a prefix op is
+            # treated as infix here
+            if op.prec is not None:
+                return _INFIX
+            return _OPERATOR
+        return _OTHER
+
+    def _container(self, node):
+        """
+        Validate one container, children first. Returns its first and last
+        leaf dicts and the number of expressions it spans.
+        """
+        kinds = []
+        firsts = []     # first leaf dict of each element
+        lasts = []      # last leaf dict of each element
+        for item in node:
+            if isinstance(item, list):
+                first, last, _ = self._container(item)
+                kinds.append(_LIST)
+                firsts.append(first)
+                lasts.append(last)
+            else:
+                kinds.append(self._kind(item))
+                leaf = item if isinstance(item, dict) else None
+                firsts.append(leaf)
+                lasts.append(leaf)
+
+        first_lines = [d.get('line') if d is not None else None for d in firsts]
+        last_lines = [d.get('line') if d is not None else None for d in lasts]
+        expr_nos = self._expression_numbers(kinds, first_lines, last_lines)
+
+        tables = (node, kinds, firsts, first_lines, last_lines, expr_nos)
+        for i, kind in enumerate(kinds):
+            if kind == _INFIX:
+                self._check_infix(tables, i)
+        self._check_adjacent(tables)
+
+        first = next((d for d in firsts if d is not None), None)
+        last = next((d for d in reversed(lasts) if d is not None), None)
+        return first, last, (expr_nos[-1] if expr_nos else 1)
+
+    @staticmethod
+    def _expression_numbers(kinds, first_lines, last_lines):
+        """
+        1-based expression number of every element, based on statement
+        delimiters and (fallback) line changes when delimiters were consumed
+
+        """
+        expr_nos = []
+        expr_no = 1
+        prev_line = None
+        have_prev = False
+
+        for i, kind in enumerate(kinds):
+            if kind == _DELIM:
+                expr_nos.append(expr_no)
+                expr_no += 1
+                have_prev = False
+                continue
+
+            rl = first_lines[i]
+            if (have_prev and prev_line is not None and rl is not None and
+                prev_line != rl):
+                expr_no += 1
+            expr_nos.append(expr_no)
+            prev_line = last_lines[i]
+            have_prev = True
+
+        return expr_nos
+
+    def _loc(self, tables, idx, tok=None):
+        _, _, firsts, _, _, expr_nos = tables
+        col = tok.get('column') if isinstance(tok, dict) else None
+        if col is None and firsts[idx] is not None:
+            col = firsts[idx].get('column')
+        return self.parser._expr_loc(expr_nos[idx], col)
+
+    def _check_infix(self, tables, i):
+        node, kinds, _, first_lines, last_lines, _ = tables
+        cur = node[i]
+        cur_line = first_lines[i]
+
+        # ---- check LEFT operand inside this same list ----
+        j, left_ok = i - 1, False
+        while j >= 0:
+            kind = kinds[j]
+            if kind == _DELIM:
+                break
+            if cur_line is not None:
+                ll = last_lines[j]
+                if ll is not None and ll != cur_line:
+                    break
+            if kind in (_LIST, _OPERAND):
+                left_ok = True
+                break
+            # hit another operator without intervening operand
+            if kind in (_INFIX, _OPERATOR):
+                break
+            j -= 1
+
+        if not left_ok:
+            self._missing('left', tables, i, cur)
+
+        # ---- check RIGHT operand inside this same list ----
+        n = len(node)
+        k = i + 1
+        # skip a chain of unary prefixes immediately to the right
+        while k < n and kinds[k] == _PREFIX:
+            if cur_line is not None:
+                pl = first_lines[k]
+                if pl is not None and pl != cur_line:
+                    break
+            k += 1
+
+        right_ok = False
+        if k < n and kinds[k] in (_LIST, _OPERAND):
+            nl = first_lines[k]
+            right_ok = cur_line is None or nl is None or nl == cur_line
+
+        if not right_ok:
+            self._missing('right', tables, i, cur)
+
+        if cur.get('lexeme') == '/':
+            self._check_substitution(tables, i)
+
+    def _missing(self, side, tables, idx, tok):
+        op = tok.get('lexeme')
+        raise Errors(
+            f"{self._loc(tables, idx, tok)}: "
+            f"infix operator '{op}' is missing an operand on its "
+            f"{side} side."
+        )
+
+    def _check_substitution(self, tables, i):
+        """
+        strict substitution rule: '/' must be followed
+        immediately by id or (id), then ≡ or ↔
+        """
+        node, _, _, first_lines, _, _ = tables
+        cur = node[i]
+        cur_line = first_lines[i]
+        n = len(node)
+        loc = self._loc(tables, i, cur)
+
+        k = i + 1
+        if k >= n:
+            raise Errors(f"{loc}: substitution '/' is missing the target "
+                f"variable.")
+
+        nxt = node[k]
+        if cur_line is not None:
+            nl = first_lines[k]
+            if nl is not None and nl != cur_line:
+                raise Errors(f"{loc}: substitution '/' is missing the target "
+                    f"variable.")
+
+        def followed_by_equivalence(k2):
+            return (
+                k2 < n and isinstance(node[k2], dict) and
+                node[k2].get('token_type') == 'operator' and
+                node[k2].get('lexeme') in {'≡', '↔'}
+            )
+
+        # Case A: '/x'
+        if isinstance(nxt, dict) and nxt.get('token_type') == 'identifier':
+            if not followed_by_equivalence(k + 1):
+                raise Errors(
+                    f"{loc}: substitution '/{nxt.get('lexeme','?')}' must be "
+                    f"immediately followed by '≡' or '↔'."
+                )
+
+        # Case B: '/(x)' – represented here as a child list
+        # containing exactly one identifier
+        elif isinstance(nxt, list):
+            if not (
+                len(nxt) == 1 and isinstance(nxt[0], dict) and
+                nxt[0].get('token_type') == 'identifier'
+            ):
+                raise Errors(
+                    f"{loc}: substitution '/' expects a single identifier in "
+                    f"parentheses immediately after '/'."
+                )
+            if not followed_by_equivalence(k + 1):
+                raise Errors(
+                    f"{loc}: substitution '/({nxt[0].get('lexeme','?')})' "
+                    f"must be immediately followed by '≡' or '↔'."
+                )
+
+        else:
+            raise Errors(
+                f"{loc}: substitution '/' must be immediately followed by an "
+                f"identifier or a parenthesized identifier."
+            )
+
+    def _check_adjacent(self, tables):
+        """
+        If an operand is immediately followed by another operand (or a
+        prefix-chain that leads to an operand), then an infix operator is
+        missing between them. Statement delimiters are allowed.
+        """
+        node, kinds, _, first_lines, last_lines, _ = tables
+        n = len(node)
+        for p in range(n - 1):
+            if kinds[p] not in (_LIST, _OPERAND):
+                continue
+
+            # Treat a line change as an implicit expression boundary
+            ll = last_lines[p]
+            rl = first_lines[p + 1]
+            if ll is not None and rl is not None and ll != rl:
+                continue
+
+            right_kind = kinds[p + 1]
+
+            # operand immediately followed by operand
+            if right_kind in (_LIST, _OPERAND):
+                self._adjacent(tables, p + 1)
+
+            # operand followed by unary prefix chain and then an operand
+            if right_kind == _PREFIX:
+                q = p + 1
+                while q < n and kinds[q] == _PREFIX:
+                    q += 1
+                if q < n and kinds[q] in (_LIST, _OPERAND):
+                    self._adjacent(tables, q)
+
+    def _adjacent(self, tables, idx):
+        item = tables[0][idx]
+        loc = self._loc(tables, idx, item if isinstance(item, dict) else None)
+        raise Errors(f"{loc}: two adjacent operands; "
+            f"missing infix operator between them.")
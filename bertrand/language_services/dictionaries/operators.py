@@ -0,0 +1,99 @@
+"""
+Operator registry. Every operator gets one record, built once at import
+from the token tables, carrying an integer opcode and everything the
+scanner, parser and evaluator need to know about it.
+
+"""
+from .tokens import token_dict, op_prec_dict, op_assoc
+
+# Opcode of every token that is not an operator
+NOT_AN_OPERATOR = 0
+
+# The form each symbol takes under a leading '¬' or '!'
+NEGATIONS = {'∧': '↑', '&': '↑', '∨': '↓', '⨁': '≡', '≡': '⨁',
+    '↓': '∨', '↑': '∧', 'T': 'F', 'F': 'T', '⊤': '⊥', '⊥': '⊤',
+    '∃': '¬∀', '∀': '¬∃','∈': '∉','∉': '∈',
+    '∅': 'T', '0': 'T', '1': 'F'
+}
+
+# extend if you add more unary prefixes
+_UNARY = ('¬', '!', '∃', '∀', '¬∃', '¬∀', '!∃', '!∀')
+
+# Name of the Knuth method that evaluates each operator
+_EVALUATORS = {
+    '¬': 'neg',
+    '!': 'neg',
+    '∃': 'exists',
+    '¬∃': 'not_exists',
+    '!∃': 'not_exists',
+    '∀': 'for_all',
+    '¬∀': 'not_for_all',
+    '!∀': 'not_for_all',
+    '∧': 'and_',
+    '∨': 'inc_or',
+    '↑': 'nand',
+    '↓': 'nor',
+    '⨁': 'exc_or',
+    '→': 'imp',
+    '↔': 'bi_imp',
+    '≡': 'eqv',
+    '/': 'subst',
+    '∈': 'memb',
+    '∉': 'memb',
+}
+
+# pylint: disable=too-few-public-methods
+class Operator:
+    """
+    One operator: its opcode, lexeme, arity, precedence (lower binds
+    tighter; None when it has none), associativity, negated form (None when
+    it has none) and the name of the Knuth method that evaluates it (None
+    when it cannot be evaluated yet).
+    """
+    __slots__ = ("opcode", "lexeme", "arity", "prec", "assoc", "negated",
+        "evaluator")
+
+    def __init__(self, opcode, lexeme):
+        self.opcode = opcode
+        self.lexeme = lexeme
+        self.arity = 1 if lexeme in _UNARY else 2
+        self.prec = op_prec_dict.get(lexeme)
+        self.assoc = op_assoc.get(lexeme) or 'L'
+        self.negated = NEGATIONS.get(lexeme)
+        self.evaluator = _EVALUATORS.get(lexeme)
+
+    def __repr__(self):
+        return f"Operator({self.opcode}, {self.lexeme!r})"
+
+def _build():
+    # Operators the parser can see: everything with a precedence, plus the
+    # single-character operators without one. Two-character negations such
+    # as '¬∧' are folded by the scanner and never reach the parser.
+    lexemes = list(op_prec_dict)
+    lexemes += [lex for lex, token_type in token_dict.items() if
+        token_type == 'operator' and len(lex) == 1 and lex not in op_prec_dict]
+
+    by_opcode = [None]  # NOT_AN_OPERATOR
+    for lex in lexemes:
+        by_opcode.append(Operator(len(by_opcode), lex))
+    return {op.lexeme: op for op in by_opcode[1:]}, tuple(by_opcode)
+
+# lexeme -> Operator, and opcode -> Operator (None at NOT_AN_OPERATOR)
+OPERATORS, BY_OPCODE = _build()
+
+def opcode_of(lexeme):
+    """Opcode of lexeme, or NOT_AN_OPERATOR."""
+    if not isinstance(lexeme, str):
+        return NOT_AN_OPERATOR
+    op = OPERATORS.get(lexeme)
+    return op.opcode if op is not None else NOT_AN_OPERATOR
+
+def operator_of(tok):
+    """
+    The Operator of a token dict, read from its 'opcode' when the scanner
+    stamped one, else looked up by lexeme. None for non-operators.
+    """
+    code = tok.get('opcode')
+    if code is None:
+        code = opcode_of(tok.get('lexeme'))
+    return BY_OPCODE[code]
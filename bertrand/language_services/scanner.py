@@ -3,7 +3,178 @@ Step 1 in the process: scanning.
 
 """
 # pylint: disable=too-many-instance-attributes
+import re
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
 from .dictionaries.errors import Errors
+from .dictionaries.operators import NEGATIONS, opcode_of
+from .token_stream import TokenStream, TokenView
+
+# Selectable lexers; "vonneumann" is the original per-character engine and is
+# kept for parity testing against "thompson".
+SCAN_ENGINES = ("thompson", "vonneumann")
+
+# Two-character negations folded by boolean_conv() at scan time.
+_NEGATION_PAIRS = frozenset({
+    '¬¬','!¬','¬!','!!','¬T','¬F','!T','!F','¬⊤','¬⊥','!⊤','!⊥','¬∧',
+    '¬∨','¬⨁','¬↓','¬↑','¬&','¬≡','!∧','!∨','!⨁','!↓','!↑','!&','!≡',
+    '¬∃','¬∀','!∃','!∀','¬∈','!∈','¬∉', '!∉',
+    '¬∅', '!∅', '¬0', '!0', '¬1', '!1'
+})
+
+# Line endings to normalize and block comments to drop, in one scan; an
+# unterminated comment runs to the end of the source.
+_PREPROCESS = re.compile(r"\r\n?|/\*.*?(?:\*/|\Z)", re.S)
+
+class SymbolTable:
+    """
+    Longest-match trie over the symbol lexemes of a token_dict (those that do
+    not start with a word character), compiled once per token_dict. Each
+    entry carries the canonical lexeme the scanner emits, its token type and
+    its negated form, so one walk from the cursor decides the whole token.
+    """
+    _tables = {}
+
+    def __init__(self, token_dict):
+        self.entries = {}
+        self.root = {}
+        for lex, token_type in token_dict.items():
+            if not lex or lex[0].isalnum() or lex[0] == "_" or \
+                any(ch.isspace() for ch in lex):
+                continue
+            canonical = lex
+            if lex in _NEGATION_PAIRS:
+                canonical = Shannon.boolean_conv(lex)
+                token_type = token_dict.get(canonical, "operator")
+            elif lex in ('∅', '⊥'):
+                canonical = "False"
+            elif lex == '⊤':
+                canonical = "True"
+            entry = (canonical, token_type,
+                NEGATIONS.get(lex if canonical in ("True", "False")
+                    else canonical))
+            self.entries[lex] = entry
+
+            node = self.root
+            for ch in lex:
+                node = node.setdefault(ch, {})
+            node[""] = entry   # "" never occurs as a character key
+
+    @classmethod
+    def compile(cls, token_dict):
+        """Return the (cached) table for token_dict."""
+        key = tuple(token_dict.items())
+        table = cls._tables.get(key)
+        if table is None:
+            table = cls._tables[key] = cls(token_dict)
+        return table
+
+    def match(self, src, pos):
+        """
+        Longest symbol at src[pos:], as (length, (canonical, token_type,
+        negated)), or None.
+        """
+        node = self.root
+        best = None
+        i = pos
+        n = len(src)
+        while i < n:
+            node = node.get(src[i])
+            if node is None:
+                break
+            i += 1
+            entry = node.get("")
+            if entry is not None:
+                best = (i - pos, entry)
+        return best
+
+class OffsetMap:
+    """
+    Maps positions in the preprocessed source back to the original text.
+    Only the points where the shift changes are stored: starts[k] is a
+    preprocessed offset and origins[k] the original offset it came from.
+    An empty map is the identity.
+    """
+    __slots__ = ("starts", "origins")
+
+    def __init__(self):
+        self.starts = array('I')
+        self.origins = array('I')
+
+    def add(self, start, origin):
+        """Record that preprocessed offset start came from origin."""
+        self.starts.append(start)
+        self.origins.append(origin)
+
+    def original(self, pos):
+        """Original offset of preprocessed offset pos."""
+        k = bisect_right(self.starts, pos) - 1
+        if k < 0:
+            return pos
+        return self.origins[k] + pos - self.starts[k]
+
+    def column(self, pos, line_start):
+        """Original column of pos on the line starting at line_start."""
+        return self.original(pos) - self.original(line_start)
+
+    def remap(self, tokens):
+        """
+        Rewrite the column and position of lexed token tuples. A token is
+        stamped just past its last character, so that character is mapped;
+        a comment right after the token must not move the stamp.
+        """
+        original = self.original
+        for lexeme, token_type, line, column, position in tokens:
+            line_start = original(position - column)
+            position = original(position - 1) + 1
+            yield (lexeme, token_type, line, position - line_start, position)
+
+    def __len__(self):
+        return len(self.starts)
+
+class LineCache:
+    """
+    LRU cache of scanned physical lines for Thompson. A line is keyed by its
+    text after the line number prefix (comments already stripped), and maps
+    to its token run with lines and columns relative to the line start, plus
+    the number of logical lines its ',' and ';' separators add. Replaying a
+    run only shifts the line numbers and positions.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._runs = OrderedDict()
+
+    def get(self, key):
+        """Return the cached (tokens, line_delta) for key, or None."""
+        run = self._runs.get(key)
+        if run is not None:
+            try:
+                self._runs.move_to_end(key)
+            except KeyError:    # evicted by a concurrent request
+                pass
+        return run
+
+    def put(self, key, run):
+        """Store a run, evicting the least recently used ones past maxsize."""
+        self._runs[key] = run
+        try:
+            self._runs.move_to_end(key)
+        except KeyError:        # evicted by a concurrent request
+            pass
+        while len(self._runs) > self.maxsize:
+            try:
+                self._runs.popitem(last=False)
+            except KeyError:    # emptied by a concurrent request
+                break
+
+    def clear(self):
+        """Drop every cached run."""
+        self._runs.clear()
+
+    def __len__(self):
+        return len(self._runs)
 
 class Shannon:
     """
@@ -11,13 +182,16 @@ class Shannon:
     lexer.
     """
 
-    def __init__(self, token_dict):
+    def __init__(self, token_dict, engine="thompson", cache_lines=True):
         self.token_dict = token_dict
+        self.engine = engine
+        self.cache_lines = cache_lines
         self.current_position = -1  # This compensates for first two
         self.current_line = 0       # characters taken by line number and period
         self.current_column = 1     # column gets reset to 1 on each line anyway
         self.token_list = []
         self.source = ""
+        self.offset_map = None      # set by prepare_source()
         self.token = {
             "lexeme": "",
             "token_type": "",
@@ -33,10 +207,39 @@ class Shannon:
         This is the primary function for managing the scanning process.
 
         """
-        # normalize line endings
-        self.source = source.replace('\r\n', '\n').replace('\r', '\n')
+        self.prepare_source(source)
+
+        # ensure we accumulate a fresh list for this run
+        self.token_list = []
+
+        # run the scan and RETURN the entire list to the caller
+        scanned_token_list = self.begin_scan()
+        return scanned_token_list
+
+    def iter_tokens(self, source):
+        """
+        Lazy counterpart of scan_source(): yield one token at a time, ending
+        with the '$$' EOF token, so callers never hold the whole list.
+
+        """
+        self.prepare_source(source)
+        lexer = self.spawn_lexer()
+
+        if isinstance(lexer, Thompson):
+            for tok in lexer.lex_original():
+                yield TokenView(*tok)
+            return
+
+        while True:
+            tok = lexer.lexer()
+            if tok.lexeme != '':
+                yield self.restore_offsets(tok)
+            if tok.lexeme == "$$":
+                return
 
-        self.source = self.strip_block_comments(self.source)
+    def prepare_source(self, source):
+        """Normalize the source and position the cursor on the first line."""
+        self.source, self.offset_map = self.preprocess(source)
 
         # enforce your "$$" terminator rule
         if not self.source.endswith("$$"):
@@ -45,33 +248,42 @@ class Shannon:
         # prepare first line (your existing logic)
         self.handle_newline()  # only affects the first newline/line-number case
 
-        # ensure we accumulate a fresh list for this run
-        self.token_list = []
-
-        # run the scan and RETURN the entire list to the caller
-        scanned_token_list = self.begin_scan()
-        return scanned_token_list
+    def spawn_lexer(self):
+        """Build the selected lexer and sync the scan cursor into it."""
+        lexer_cls = {"thompson": Thompson, "vonneumann": VonNeumann}.get(
+            self.engine)
+        if lexer_cls is None:
+            raise Errors(f"Unknown scanner engine '{self.engine}'; expected " +
+                f"one of {', '.join(SCAN_ENGINES)}")
+
+        lexer = lexer_cls(self.token_dict)
+        lexer.source = self.source
+        lexer.offset_map = self.offset_map
+        if not self.cache_lines:
+            lexer.line_cache = None
+
+        # >>> sync the scan cursor from Shannon to the lexer <<<
+        lexer.current_position = self.current_position
+        lexer.current_line = self.current_line
+        lexer.current_column = self.current_column
+        return lexer
 
     def begin_scan(self):
         """It all starts here."""
-        vn = VonNeumann(self.token_dict)
-        vn.source = self.source
-
-        # >>> sync the scan cursor from Shannon to VonNeumann <<<
-        vn.current_position = self.current_position
-        vn.current_line = self.current_line
-        vn.current_column = self.current_column
+        vn = self.spawn_lexer()
+        if isinstance(vn, Thompson):
+            return vn.scan()
 
         tokens = []
         while True:
             self.token = vn.lexer()  # lexer returns a token object
 
             if self.token.lexeme == "$$":   # stop at EOF sentinel
-                tokens.append(self.token)
+                tokens.append(self.restore_offsets(self.token))
                 break
 
             if self.token.lexeme != '':     # collect non-empty tokens
-                tokens.append(self.token)
+                tokens.append(self.restore_offsets(self.token))
 
         return tokens  # full list for the caller
 
@@ -203,53 +415,53 @@ class Shannon:
 
         return identifier_token
 
-    def strip_block_comments(self, source: str) -> str:
-        """
-        Comment stripper
+    @staticmethod
+    def preprocess(source):
         """
-        out = []
-        i = 0
-        n = len(source)
-        in_comment = False
-
-        while i < n:
-            # Start of comment: "/*"
-            if not in_comment and source[i:i+2] == '/*':
-                in_comment = True
-                i += 2
-                continue
-
-            # End of comment: "*/"
-            if in_comment and source[i:i+2] == '*/':
-                in_comment = False
-                i += 2
-                continue
+        Normalize line endings and strip block comments in a single pass.
+        Returns the text to lex and the OffsetMap back to source; when there
+        is nothing to rewrite, source itself is returned uncopied.
 
-            # Inside a comment: skip characters
-            if in_comment:
-                i += 1
-                continue
-
-            # Normal character
-            out.append(source[i])
-            i += 1
-
-        return ''.join(out)
-
-    def boolean_conv(self, bool_lex):
+        """
+        offset_map = OffsetMap()
+        parts = []
+        last = size = shift = 0
+
+        for m in _PREPROCESS.finditer(source):
+            chunk = source[last:m.start()]
+            parts.append(chunk)
+            size += len(chunk)
+            if m.group()[0] == '\r':
+                parts.append('\n')
+                size += 1
+            last = m.end()
+            if last - size != shift:
+                shift = last - size
+                offset_map.add(size, last)
+
+        if not parts:
+            return source, offset_map
+
+        parts.append(source[last:])
+        return ''.join(parts), offset_map
+
+    def restore_offsets(self, tok):
+        """Point a VonNeumann token's column and position at the source."""
+        if self.offset_map:
+            line_start = self.offset_map.original(tok.position - tok.column)
+            tok.position = self.offset_map.original(tok.position - 1) + 1
+            tok.column = tok.position - line_start
+        return tok
+
+    @staticmethod
+    def boolean_conv(bool_lex):
         """Negation eliminator."""
         if (len(bool_lex) == 2 and bool_lex[0] in {'¬', '!'} and bool_lex[1] in
             {'¬', '!'}):
             return ''  # double-negation cases
 
-        base = {'∧': '↑', '&': '↑', '∨': '↓', '⨁': '≡', '≡': '⨁',
-                '↓': '∨', '↑': '∧', 'T': 'F', 'F': 'T', '⊤': '⊥', '⊥': '⊤',
-                '∃': '¬∀', '∀': '¬∃','∈': '∉','∉': '∈',
-                '∅': 'T', '0': 'T', '1': 'F'
-        }
-
         if len(bool_lex) == 2 and bool_lex[0] in {'¬', '!'}:
-            return base.get(bool_lex[1], bool_lex)
+            return NEGATIONS.get(bool_lex[1], bool_lex)
 
         return bool_lex  # unchanged if it doesn't match the pattern
 
@@ -257,6 +469,7 @@ class VonNeumann(Shannon):
     """ These are the routines that perform the primary scanning functions."""
     def __init__(self, token_dict):
         super().__init__(token_dict)
+        self.symbols = SymbolTable.compile(token_dict)
         self.c = ""
         self.lexeme = ""
         self.token_type = ""
@@ -279,8 +492,7 @@ class VonNeumann(Shannon):
             # Detect tokens in this order; if nothing matched, don't return None
             tok = (self.letters()
                     or self.digits()
-                    or self.dual_tokens()
-                    or self.lexicon_tokens())
+                    or self.symbol_tokens())
 
             return tok
 
@@ -316,47 +528,19 @@ class VonNeumann(Shannon):
 
         return None
 
-    def dual_tokens(self):
-        """Lexer for dual tokens."""
-        # Two-char tokens and comment start
-        if self.current_position + 1 >= len(self.source):
-            return None
-
-        if self.c == ".":  # prevent ".$" from being tokenized.
-            length = 1
-            self.token_type = self.token_dict[self.c]
-            self.lexeme = "."
-            self.advance_position()
-            return self.tokenizer()
-
-        # IMPORTANT: do not advance position when peeking ahead
-        next_char = self.source[self.current_position + 1]
-        two_char_key = self.c + next_char
-        if next_char.isspace() or two_char_key not in self.token_dict:
+    def symbol_tokens(self):
+        """
+        Lexer for symbol tokens of any length: one longest-match walk of the
+        symbol trie yields the canonical lexeme and type, with negation pairs
+        already folded.
+        """
+        hit = self.symbols.match(self.source, self.current_position)
+        if hit is None:
             return None
 
-        if two_char_key in (
-            '¬¬','!¬','¬!','!!','¬T','¬F','!T','!F','¬⊤','¬⊥','!⊤','!⊥','¬∧',
-            '¬∨','¬⨁','¬↓','¬↑','¬&','¬≡','!∧','!∨','!⨁','!↓','!↑','!&','!≡',
-            '¬∃','¬∀','!∃','!∀','¬∈','!∈','¬∉', '!∉'
-            '¬∅', '!∅', '¬0', '!0', '¬1', '!1'
-        ):
-            mapped = self.boolean_conv(two_char_key)
-            self.lexeme = mapped
-            # type should match the mapped lexeme (e.g., 'T'/'F'/'⊤'/'⊥' => boolean)
-            self.token_type = self.token_dict.get(mapped, "operator")
-            self.advance_position(2)
-            return self.tokenizer()
-
-        if two_char_key in self.token_dict:
-            length = 2
-            self.token_type = self.token_dict[two_char_key]
-            self.lexeme = self.source[self.current_position:
-                self.current_position + length]
-            self.advance_position(length)  # was: advance_position() only once
-            return self.tokenizer()
-
-        return None
+        length, (self.lexeme, self.token_type, _) = hit
+        self.advance_position(length)
+        return self.tokenizer()
 
     # Follow the "maximal munch" rule for identifiers and numbers.
     def letters(self):
@@ -440,6 +624,185 @@ class VonNeumann(Shannon):
 
         return self.token # Returns fully completed token for appending to list.
 
+class Thompson(Shannon):
+    """
+    Table-driven lexer. A single master pattern compiled from token_dict
+    matches a whole lexeme per step, so the source is walked once and emits
+    the same tokens (lexeme, type, line, column, position) as VonNeumann.
+    """
+    _tables = {}
+
+    def __init__(self, token_dict):
+        super().__init__(token_dict)
+        self.pattern, self.symbols, self.line_cache = self._compile(token_dict)
+
+    def _compile(self, token_dict):
+        """
+        Build (and cache) the master pattern, the symbol table and the line
+        cache shared by every scan with this token_dict.
+        """
+        key = tuple(token_dict.items())
+        if key in Thompson._tables:
+            return Thompson._tables[key]
+
+        # Symbol lexemes start with a non-word character; words and numbers
+        # are looked up in token_dict after a maximal munch, as letters() and
+        # digits() do.
+        symbols = {lex: entry[:2] for lex, entry in
+            SymbolTable.compile(token_dict).entries.items()}
+
+        alternation = "|".join(re.escape(lex) for lex in
+            sorted(symbols, key=len, reverse=True))
+        pattern = re.compile(
+            r"(?P<space>[^\S\n]+)"
+            r"|(?P<newline>\n)"
+            r"|(?P<separator>[,;])"
+            r"|(?P<number>\d+)"
+            r"|(?P<word>[^\W\d][\w']*)"
+            rf"|(?P<symbol>{alternation})"
+        )
+        Thompson._tables[key] = (pattern, symbols, LineCache())
+        return Thompson._tables[key]
+
+    def scan(self):
+        """
+        Scan self.source from the current cursor through the '$$' EOF and
+        return the tokens as a TokenStream.
+        """
+        tokens = TokenStream()
+        emit = tokens.append
+        for tok in self.lex_original():
+            emit(*tok)
+        return tokens
+
+    def lex_original(self):
+        """lex(), with columns and positions pointing at the original text."""
+        if self.offset_map:
+            return self.offset_map.remap(self.lex())
+        return self.lex()
+
+    def _column(self, pos, line_start):
+        """Original column of pos, for error messages."""
+        if self.offset_map:
+            return self.offset_map.column(pos, line_start)
+        return pos - line_start
+
+    def lex(self):
+        """
+        Yield (lexeme, token_type, line, column, position) tuples from the
+        current cursor through the '$$' EOF. Physical lines found in the line
+        cache are replayed instead of rescanned.
+        """
+        src = self.source
+        last = len(src) - 1
+        match = self.pattern.match
+        token_dict = self.token_dict
+        symbols = self.symbols
+        cache = self.line_cache
+
+        pos = self.current_position
+        line = self.current_line
+        # Columns count from the first space after the line number, which
+        # is where handle_newline() leaves the cursor.
+        line_start = pos
+        # key, first logical line and recorded tokens of a physical line that
+        # missed the cache; run stays None while nothing is being recorded
+        key = run_line = run = None
+        line_head = cache is not None
+
+        while True:
+            if line_head:
+                line_head = False
+                end = src.find("\n", line_start)
+                key = src[line_start:end if end >= 0 else len(src)]
+                cached = cache.get(key)
+                if cached is None:
+                    run_line, run = line, []
+                else:
+                    tokens, line_delta = cached
+                    for lexeme, token_type, dline, column in tokens:
+                        yield (lexeme, token_type, line + dline, column,
+                            line_start + column)
+                    if tokens and tokens[-1][0] == "$$":
+                        return
+                    line += line_delta
+                    pos = end
+
+            m = match(src, pos)
+            if m is None:
+                raise Errors(f"Token not yet defined or implemented "
+                    f"'{src[pos]}' at line {line}, column "
+                    f"{self._column(pos, line_start)}")
+
+            kind = m.lastgroup
+            end = m.end()
+
+            if kind == "space":
+                pos = end
+                continue
+
+            if kind == "newline":
+                if run is not None:
+                    cache.put(key, (tuple(run), line - run_line))
+                    run = None
+                self.current_position = pos
+                self.current_line = line
+                self.handle_newline()
+                line = self.current_line
+                line_start = self.current_position
+                pos = line_start + 1
+                line_head = cache is not None
+                continue
+
+            if kind == "separator":  # ',' and ';' end a logical line
+                line += 1
+                pos = end
+                continue
+
+            if kind == "word" and not (src[pos].isalpha() or src[pos] == "_"):
+                # \w admits numerals such as '²' that str.isalpha() rejects
+                if not src[pos].isdigit():
+                    raise Errors(f"Token not yet defined or implemented "
+                        f"'{src[pos]}' at line {line}, column "
+                        f"{self._column(pos, line_start)}")
+                kind, end = "number", pos + 1
+
+            if kind == "number":
+                while end < last and src[end].isdigit():
+                    end += 1
+                lexeme = src[pos:end]
+                token_type = "number"
+                if lexeme == "0":
+                    lexeme, token_type = "False", "boolean"
+                elif lexeme == "1":
+                    lexeme, token_type = "True", "boolean"
+
+            elif kind == "word":
+                lexeme = m.group()
+                token_type = token_dict.get(lexeme, "identifier")
+                if token_type == "boolean" and lexeme in ("T", "F"):
+                    lexeme = "True" if lexeme == "T" else "False"
+
+            else:
+                lexeme, token_type = symbols[m.group()]
+
+            # VonNeumann stamps each token after advancing past it
+            at = end if end < last else last
+            pos = end
+            if lexeme == "":
+                continue  # double negation folded away
+
+            if run is not None:
+                run.append((lexeme, token_type, line - run_line,
+                    at - line_start))
+
+            yield (lexeme, token_type, line, at - line_start, at)
+
+            if lexeme == "$$":
+                if run is not None:
+                    cache.put(key, (tuple(run), line - run_line))
+                return
+
 class Grieg(Shannon):
     """ The token and dictionary factory."""
     def __init__(self, tok):
@@ -450,6 +813,7 @@ class Grieg(Shannon):
         self.line = tok.get("line", 0)
         self.column = tok.get("column", 0)
         self.position = tok.get("position", -1)
+        self.opcode = opcode_of(self.lexeme)
 
     def to_map(self):
         """Returns a dictionary representation of the token."""
@@ -459,4 +823,5 @@ class Grieg(Shannon):
             "line": self.line,
             "column": self.column,
             "value": "unknown",
+            "opcode": self.opcode,
         }
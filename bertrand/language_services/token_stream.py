@@ -0,0 +1,111 @@
+"""
+Compact token storage handed from the scanner to the parser.
+
+"""
+from array import array
+from .dictionaries.operators import opcode_of
+
+class TokenView:
+    """
+    A read-only, Grieg-compatible snapshot of one token in a TokenStream.
+    Views are cheap to build and are only created where the parser asks for
+    a token object.
+    """
+    __slots__ = ("lexeme", "token_type", "line", "column", "position",
+        "opcode")
+
+    def __init__(self, lexeme, token_type, line, column, position,
+        opcode=None):
+        self.lexeme = lexeme
+        self.token_type = token_type
+        self.line = line
+        self.column = column
+        self.position = position
+        self.opcode = opcode_of(lexeme) if opcode is None else opcode
+
+    def to_map(self):
+        """Returns a dictionary representation of the token."""
+        return {
+            "lexeme": self.lexeme,
+            "token_type": self.token_type,
+            "line": self.line,
+            "column": self.column,
+            "value": "unknown",
+            "opcode": self.opcode,
+        }
+
+    def __repr__(self):
+        return (f"TokenView({self.lexeme!r}, {self.token_type!r}, "
+            f"line={self.line}, column={self.column})")
+
+class TokenStream:
+    """
+    Struct-of-arrays token list. Lexemes and token types are interned once
+    per stream; each token costs one small integer per column instead of a
+    Python object. A lexeme's opcode is resolved once, when it is interned.
+    """
+    __slots__ = ("lexemes", "opcodes", "types", "lexeme_ids", "type_codes",
+        "lines", "columns", "positions", "_lexeme_index", "_type_index")
+
+    def __init__(self):
+        self.lexemes = []        # interned lexeme table, indexed by lexeme id
+        self.opcodes = array('B')   # operator opcode, indexed by lexeme id
+        self.types = []          # token type table, indexed by type code
+        self.lexeme_ids = array('I')
+        self.type_codes = array('B')
+        self.lines = array('I')
+        self.columns = array('I')
+        self.positions = array('I')
+        self._lexeme_index = {}
+        self._type_index = {}
+
+    def append(self, lexeme, token_type, line, column, position):
+        """Append one token, interning its lexeme and type."""
+        lex_id = self._lexeme_index.get(lexeme)
+        if lex_id is None:
+            lex_id = self._lexeme_index[lexeme] = len(self.lexemes)
+            self.lexemes.append(lexeme)
+            self.opcodes.append(opcode_of(lexeme))
+
+        type_code = self._type_index.get(token_type)
+        if type_code is None:
+            type_code = self._type_index[token_type] = len(self.types)
+            self.types.append(token_type)
+
+        self.lexeme_ids.append(lex_id)
+        self.type_codes.append(type_code)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.positions.append(position)
+
+    def lexeme(self, index):
+        """Lexeme of the token at index, without building a view."""
+        return self.lexemes[self.lexeme_ids[index]]
+
+    def opcode(self, index):
+        """Opcode of the token at index, without building a view."""
+        return self.opcodes[self.lexeme_ids[index]]
+
+    def token_type(self, index):
+        """Token type of the token at index, without building a view."""
+        return self.types[self.type_codes[index]]
+
+    def __len__(self):
+        return len(self.lexeme_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        lex_id = self.lexeme_ids[index]
+        return TokenView(
+            self.lexemes[lex_id],
+            self.types[self.type_codes[index]],
+            self.lines[index],
+            self.columns[index],
+            self.positions[index],
+            self.opcodes[lex_id],
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
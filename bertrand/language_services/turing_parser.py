@@ -4,10 +4,13 @@ Step 2. Parse the tokens. Generate an execution list for evaluation.
 """
 # pylint: disable=relative-beyond-top-level
 
-import ast
 from .dictionaries.errors import Errors
 from .dictionaries.tokens import op_prec_dict, op_assoc
+from .dictionaries.operators import operator_of
 from .base_parser import BaseParser
+from .token_stream import TokenView
+
+RPN_ENGINES = ("climb", "sort")
 
 # pylint: disable=too-few-public-methods
 class _SetContainerParser:
@@ -212,8 +215,15 @@ class _SetContainerParser:
 class Turing(BaseParser):
     """Primary parser for handling tokens."""
 
-    def parse(self):
-        """The primary departure point for parsing."""
+    rpn_engine = "climb"
+
+    def parse(self, final=True):
+        """
+        The primary departure point for parsing. With final=False the token
+        list is one statement of a streamed document: it ends at an EOF
+        sentinel and does not carry the terminal period.
+
+        """
         parsed_obj_list = []
         turbo_spec = TurboSpec()
 
@@ -230,14 +240,16 @@ class Turing(BaseParser):
                 if parser_obj:
                     if self.token_list[self.current_position - 1].lexeme == ".":
                         tokens = list(self._flatten(parser_obj))
-                        self._check_infix_operands(tokens)
+                        self.expression_count = self._check_infix_operands(
+                            tokens)
                         parsed_obj_list.extend([parser_obj])
-                        if (self.current_position + 1) < len(self.token_list):
+                        if ((self.current_position + 1) < len(self.token_list)
+                            or not final):
                             raise Errors("Premature termination by period")
                         break
 
                     tokens = list(self._flatten(parser_obj))
-                    self._check_infix_operands(tokens)
+                    self.expression_count = self._check_infix_operands(tokens)
                     parsed_obj_list.extend([parser_obj])
 
                 else:
@@ -247,13 +259,71 @@ class Turing(BaseParser):
             except RuntimeError as e:
                 raise Errors(f"parsing error: {e}") from e
 
-        if not self.only_whitespace_after_last_period():
+        if final and not self.only_whitespace_after_last_period():
             raise Errors("Terminal period missing from end of last statement")
 
-        finished_list = turbo_spec.prep_bracket_list(parsed_obj_list)
+        if self.rpn_engine == "climb":
+            finished_list = turbo_spec.compile_rpn(parsed_obj_list)
+        elif self.rpn_engine == "sort":
+            finished_list = turbo_spec.prep_bracket_list(parsed_obj_list)
+        else:
+            raise Errors(f"Unknown RPN engine '{self.rpn_engine}', expected " +
+                f"one of {', '.join(RPN_ENGINES)}")
 
         return finished_list
 
+    @classmethod
+    def parse_stream(cls, tokens):
+        """
+        Streaming counterpart of parse(). Tokens are drawn lazily and each
+        statement's RPN list is yielded as soon as the statement is complete,
+        so only one statement is held at a time.
+
+        The scanner consumes the ',' and ';' delimiters and starts a new
+        logical line instead, so a statement ends where the line number
+        changes outside any open '(' or '{'. The terminal period and the '$$'
+        EOF token stay with the last statement.
+        """
+        statement = []
+        depth = 0
+        expr_offset = 0
+
+        for tok in tokens:
+            lex = tok.lexeme
+            if (statement and depth <= 0 and lex not in (".", "$$") and
+                tok.line != statement[-1].line):
+                rpn_lines, expr_offset = cls._parse_statement(
+                    statement, expr_offset, final=False)
+                yield from rpn_lines
+                statement = []
+
+            statement.append(tok)
+            if lex in ("(", "{"):
+                depth += 1
+            elif lex in (")", "}"):
+                depth -= 1
+
+        if statement:
+            rpn_lines, _ = cls._parse_statement(statement, expr_offset,
+                final=True)
+            yield from rpn_lines
+
+    @classmethod
+    def _parse_statement(cls, statement, expr_offset, final):
+        """
+        Parse one streamed statement. Returns its RPN lines and the expression
+        offset for the statement that follows it.
+        """
+        if not final:
+            last = statement[-1]
+            statement.append(TokenView("$$", "delimeter", last.line,
+                last.column, last.position))
+
+        parser = cls(statement)
+        parser.expr_offset = expr_offset
+        rpn_lines = parser.parse(final=final)
+        return rpn_lines, expr_offset + parser.expression_count
+
     def try_parsers(self):
         """The hub for postfix and sub-group container parsing."""
         parsers = [self.parse_postfix_delim, self.parse_containing_delim]
@@ -291,8 +361,8 @@ class Turing(BaseParser):
                 continue
 
             if lex == ")":
-                raise Errors("Closing parentheses without matching opening " \
-                    "parentheses")
+                self._raise_expr_error("Closing parentheses without matching " \
+                    "opening parentheses", token)
 
             if lex == "(":
                 sub_obj_list = self.parse_containing_delim()
@@ -342,8 +412,8 @@ class Turing(BaseParser):
             token = self.current_token()
 
             if token.lexeme in ('.',';'):
-                raise Errors("Unexpected termination of token list with " + \
-                    "open parentheses")
+                self._raise_expr_error("Unexpected termination of token " + \
+                    "list with open parentheses", token)
 
             if token.lexeme not in ["(", ")"]:
                 if token.token_type != "statement":
@@ -367,7 +437,8 @@ class Turing(BaseParser):
 
             if token.lexeme == ")":
                 if not stack:
-                    raise Errors(f"Unmatched closing delimiter: {token.lexeme}")
+                    self._raise_expr_error("Unmatched closing delimiter: " +
+                        f"{token.lexeme}", token)
                 stack.pop()  # Pop the current list
 
                 if stack:
@@ -607,253 +678,265 @@ class _RpnGenerator:
                 out.append(val)
             # stray LPAREN (malformed input) is ignored on purpose
 
-# pylint: disable=too-few-public-methods
-# pylint: disable=too-many-instance-attributes
-class _PrepBracketList:
-    """Internal helper so TurboSpec.prep_bracket_list() stays small (pylint)."""
-
-    i: int
-    j: int
-    k: int
-    tree: dict
-    gpad: dict
-    pig_stack: list
-    previous_direction: str
-    new_string: str
-    wrapper_flag: bool
-    eof_flag: bool
-    curly_depth: int
-    item_wrapper_active: bool
-    last_sig_char: object
-    string_list: str
+_OPEN = object()    # group markers laid down by _RpnCompiler._line_runs()
+_CLOSE = object()
+_GROUP = object()    # _RpnCompiler: an expression inside a group
 
-    def __init__(self, turbo_spec, object_list):
-        object.__setattr__(self, "turbo_spec", turbo_spec)
-        object.__setattr__(self, "_state", {
-            "string_list": repr(object_list),
-
-            "i": -1,
-            "j": -1,
-            "k": -1,
-            "tree": {},   # depth -> { group_index(i) -> last_item_index(k) }
-            "gpad": {},   # "group position at depth"
-            "pig_stack": [],
-
-            "previous_direction": "[",
-            "new_string": "",
-            "wrapper_flag": False,
-            "eof_flag": False,
-
-            # Track nesting of curly dicts so we only wrap true top-level dicts
-            "curly_depth": 0,
-            "item_wrapper_active": False,
-
-            # last non-whitespace character we appended
-            # (to detect ':' just before '{')
-            "last_sig_char": None,
-        })
-
-    def __getattr__(self, name):
-        state = object.__getattribute__(self, "_state")
-        try:
-            return state[name]
-        except KeyError as e:
-            raise AttributeError(name) from e
+class _RpnCompiler:
+    """
+    Internal helper so TurboSpec.compile_rpn() stays small (pylint).
+
+    Emits RPN straight from the nested lists the parser builds, in a single
+    pass and without sorting:
+      - Every nested list is a parenthesized group, marked where it opens
+        and closes while the tree is walked in source order.
+      - The walk is cut into one run per logical line, like _RpnGenerator.
+        A group that spans lines is closed at the end of one run and
+        reopened at the start of the next.
+      - Each run is compiled by precedence climbing over the operator
+        registry, read through each token's opcode: LOWER precedence
+        numbers bind tighter, associativity defaults to 'L' and an operator
+        where an operand is expected is a prefix operator of its own
+        precedence.
 
-    def __setattr__(self, name, value):
-        if name in ("turbo_spec", "_state") or name.startswith("_"):
-            object.__setattr__(self, name, value)
-            return
-        state = object.__getattribute__(self, "_state")
-        state[name] = value
+    Returns: list[list[dict]]  # one RPN list per input line
 
-    def generate(self):
-        """ I don't remember what this function is for """
-        self._walk()
-        new_string = self._finalize()
-        new_list = self.turbo_spec.string_to_list(new_string)
-        new_list = self.turbo_spec.precedence_list_maker(new_list)
-        return self.turbo_spec.rpn_generator(new_list)
+    """
 
-    # ------------------------- core loop -------------------------
+    def __init__(self, object_list):
+        self.object_list = object_list
+        self.items = []
+        self.pos = 0
 
-    def _walk(self):
-        for m in self.string_list:
-            action = self._handle_eof(m)
-            if action == "break":
-                break
-            if action == "continue":
-                continue
+    def compile(self):
+        """Compile every logical line of the tree to its RPN list."""
+        final = []
+        for run in self._line_runs():
+            self.items, self.pos = run, 0
+            out = []
+            while self.pos < len(self.items):
+                start = self.pos
+                self._expression(out)
+                if self.pos == start:
+                    self.pos += 1   # a stray close marker
+            final.append(out)
+        return final
 
-            self._latch_first_wrapper(m)
+    # ------------------------- tree walk -------------------------
 
-            if self._open_group(m):
-                continue
-            if self._close_group(m):
+    def _line_runs(self):
+        runs = []
+        run = None
+        line = None
+        closes = 0      # groups closed since the last token
+        opens = 0       # groups opened since the last token
+        stack = [iter(self.object_list)]
+
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+                if len(stack) > 0:
+                    closes, opens = self._close_group(closes, opens)
                 continue
-            if self._open_item(m):
+            if isinstance(item, list):
+                if item:
+                    stack.append(iter(item))
+                    opens += 1
                 continue
-            if self._close_item(m):
+            if not isinstance(item, dict):
                 continue
+            if item.get("lexeme") in ("{", "}"):
+                raise Errors(f"Unmatched set delimiter: {item['lexeme']} "
+                    f"at line {item.get('line')}, column "
+                    f"{item.get('column')}")
+
+            if run is None or item.get("line") != line:
+                if run is not None:
+                    run.extend([_CLOSE] * closes)
+                    runs.append(self._balance(run))
+                    closes = 0
+                run = []
+                line = item.get("line")
+            run.extend([_CLOSE] * closes)
+            run.extend([_OPEN] * opens)
+            closes = opens = 0
+
+            if self._is_operand(item) or self._is_operator(item):
+                run.append(item)
+            # ignore anything else (delimiters shouldn't be here at this stage)
+
+        if run is not None:
+            run.extend([_CLOSE] * closes)
+            runs.append(self._balance(run))
+        return runs
 
-            self._passthrough(m)
-
-    # ------------------------- steps -------------------------
-
-    def _handle_eof(self, m):
-        # --- EOF handling (unchanged) ---
-        if self.j < 0:
-            if m == "$" or self.eof_flag is True:
-                if m == "$":
-                    self.eof_flag = True
-                    return "continue"
-            elif self.eof_flag is True:
-                if m == "$":
-                    return "break"
-        return None
-
-    def _latch_first_wrapper(self, m):
-        # latch the very first wrapper
-        if self.wrapper_flag is False and m == "[":
-            self.wrapper_flag = True
-            self.new_string += m
-            self.last_sig_char = "["
-
-    def _open_group(self, m):
-        # OPEN GROUP
-        if m != "[" or self.wrapper_flag is not True:
-            return False
-
-        # ensure a comma between sibling lists
-        if self.previous_direction == "]":
-            self._ensure_sibling_comma()
-
-        # count this nested group as an item in its parent group
-        if self.j >= 0:
-            self._count_nested_group_in_parent()
-
-        # descend one depth
-        self.j += 1
-
-        # next group index at this depth
-        self.i = self.gpad.get(self.j, -1) + 1
-        self.gpad[self.j] = self.i
-
-        # Start a fresh per-group item counter at the child depth
-        self.pig_stack.append(-1)
-        self.k = -1
-
-        if self.j not in self.tree:
-            self.tree[self.j] = {}
-        self.tree[self.j][self.i] = -1
-
-        self.previous_direction = "["
-        self.new_string += f"[{self.j},{self.i},{m}"
-        self.last_sig_char = "["
-        return True
-
-    def _close_group(self, m):
-        # CLOSED GROUP
-        if m != "]":
-            return False
-
-        self._trim_trailing_commas()
-        self.new_string += "]]"  # close the actual group list and its wrapper
-
-        if self.pig_stack:
-            self.pig_stack.pop()
+    @staticmethod
+    def _close_group(closes, opens):
+        # A group closed before any token was seen in it cancels its opening
+        if opens:
+            return closes, opens - 1
+        return closes + 1, opens
 
-        self.j -= 1
-        self.j = max(self.j, -1)
-        self.previous_direction = "]"
-        self.last_sig_char = "]"
-        return True
+    @staticmethod
+    def _balance(run):
+        # Reopen groups continued from an earlier line, close groups that
+        # continue on a later one
+        depth = 0
+        reopen = 0
+        for item in run:
+            if item is _OPEN:
+                depth += 1
+            elif item is _CLOSE:
+                if depth:
+                    depth -= 1
+                else:
+                    reopen += 1
+        if not reopen and not depth:
+            return run
+        return [_OPEN] * reopen + run + [_CLOSE] * depth
 
-    def _open_item(self, m):
-        # OPEN ITEM
-        if m != "{":
-            return False
+    # ------------------------- token classification -------------------------
 
-        # Only wrap as a top-level item dict when:
-        #  - we are NOT currently inside any dict (curly_depth == 0),and
-        #  - the previous significant char is NOT a colon
-        #    (so this isn't a dict value)
-        if self.curly_depth == 0 and self.last_sig_char != ":":
-            if self.previous_direction == "]":
-                self._ensure_sibling_comma()
+    @staticmethod
+    def _is_operand(t):
+        return t.get("token_type") in ("identifier", "boolean", "number", "set")
 
-            if not self.pig_stack:
-                self.pig_stack.append(-1)
+    @staticmethod
+    def _is_operator(t):
+        if t.get("token_type") == "operator":
+            return True
+        op = operator_of(t)
+        return op is not None and op.prec is not None
 
-            self.k = self.pig_stack.pop() + 1
-            self.pig_stack.append(self.k)
+    @staticmethod
+    def _prec(t):
+        # Lower number = tighter (higher binding power)
+        op = operator_of(t)
+        return 10**6 if op is None or op.prec is None else op.prec
 
-            self.i = self.gpad.get(self.j, -1)
+    @staticmethod
+    def _assoc(t):
+        op = operator_of(t)
+        return 'L' if op is None else op.assoc
 
-            if self.j not in self.tree:
-                self.tree[self.j] = {}
-            self.tree[self.j][self.i] = self.k
+    # ------------------------- precedence climbing -------------------------
 
-            self.new_string += f"[{self.j},{self.i},{self.k},{m}"
-            self.item_wrapper_active = True
-        else:
-            # This is a dict VALUE (e.g., the set dict in 'lexeme'):
-            # do not wrap
-            self.new_string += m
+    def _expression(self, out):
+        """
+        Compile one expression by precedence climbing, iteratively, so
+        nesting depth is bounded by memory and not by the recursion limit.
+
+        The stack holds one precedence limit per expression in progress (the
+        precedence of the operator waiting on it, None when nothing is
+        waiting), each under what to do when it is complete: emit the
+        operator waiting on it, or, for _GROUP, go on with the group it
+        belongs to. An operator joins an operand only if it binds tighter
+        than the limit, or as tight and right-associative.
+        """
+        items = self.items
+        end = len(items)
+        stack = [None]
+        operand = False     # False: an operand is expected next
 
-        self.curly_depth += 1
-        self.last_sig_char = "{"
-        return True
+        while True:
+            if not operand:
+                # an operand: a token, a group or a prefix operator with
+                # what binds tighter than it
+                operand = True
+                if self.pos >= end or items[self.pos] is _CLOSE:
+                    continue
+                tok = items[self.pos]
+                self.pos += 1
+                if tok is _OPEN:
+                    if self.pos < end and items[self.pos] is not _CLOSE:
+                        stack += (_GROUP, None)
+                        operand = False
+                    else:
+                        self.pos += 1
+                elif self._is_operator(tok):
+                    stack += (tok, self._prec(tok))
+                    operand = False
+                else:
+                    out.append(tok)
+                continue
 
-    def _close_item(self, m):
-        # CLOSED ITEM
-        if m != "}":
-            return False
+            tok = items[self.pos] if self.pos < end else _CLOSE
+            if tok is not _OPEN and tok is not _CLOSE and \
+                self._is_operator(tok):
+                op = operator_of(tok)
+                if op is not None and op.arity == 1:
+                    raise Errors(f"Prefix operator {tok.get('lexeme')} used "
+                        f"as a binary operator at line {tok.get('line')}, "
+                        f"column {tok.get('column')}")
+                prec = self._prec(tok)
+                limit = stack[-1]
+                if limit is None or prec < limit or (prec == limit and
+                    self._assoc(tok) == 'R'):
+                    self.pos += 1
+                    stack += (tok, prec)
+                    operand = False
+                    continue
 
-        self.new_string += m
-        self.curly_depth = max(0, self.curly_depth - 1)
+            # the expression on top is complete
+            stack.pop()
+            if not stack:
+                return
+            waiting = stack[-1]
+            if waiting is not _GROUP:
+                stack.pop()
+                out.append(waiting)
+            elif self.pos < end and items[self.pos] is not _CLOSE:
+                stack.append(None)
+                operand = False
+            else:
+                stack.pop()
+                self.pos += 1
 
-        if self.curly_depth == 0 and self.item_wrapper_active:
-            self.new_string += "]"
-            self.item_wrapper_active = False
+# pylint: disable=too-few-public-methods
+class _PrepBracketList:
+    """
+    Internal helper so TurboSpec.prep_bracket_list() stays small (pylint).
 
-        self.last_sig_char = "}"
-        return True
+    Walks the parsed list/dict tree once, wrapping every nested list as
+    [depth, GPAD, [...]] and every token dict as [depth, GPAD, PIG, {...}]:
+      - depth: nesting level, the outer object list being 0
+      - GPAD:  group position at depth, counting lists left to right per depth
+      - PIG:   position in the group, counting tokens and nested lists alike
 
-    def _passthrough(self, m):
-        # passthrough for non-delimiters
-        self.new_string += m
-        if m.strip():
-            self.last_sig_char = m  # track ':' and other significant separators
+    """
 
-    # ------------------------- helpers -------------------------
+    def __init__(self, turbo_spec, object_list):
+        self.turbo_spec = turbo_spec
+        self.object_list = object_list
+        self.gpad = {}  # depth -> GPAD of the last group opened at that depth
 
-    def _trim_trailing_commas(self):
-        while self.new_string and self.new_string[-1] in " ,":
-            self.new_string = self.new_string[:-1]
+    def generate(self):
+        """Annotate the tree, then order it and generate the RPN lists."""
+        bracket_list = [self._wrap_group(self.object_list, 0)]
+        new_list = self.turbo_spec.precedence_list_maker(bracket_list)
+        return self.turbo_spec.rpn_generator(new_list)
 
-    def _ensure_sibling_comma(self):
-        self._trim_trailing_commas()
-        self.new_string += ", "
+    def _wrap_group(self, group, depth):
+        gpad = self.gpad.get(depth, -1) + 1
+        self.gpad[depth] = gpad
 
-    def _count_nested_group_in_parent(self):
-        if self.pig_stack:
-            k_parent = self.pig_stack.pop() + 1
-            self.pig_stack.append(k_parent)
-        else:
-            k_parent = 0
-            self.pig_stack.append(k_parent)
+        wrapped = []
+        pig = -1
+        for item in group:
+            if isinstance(item, list):
+                pig += 1
+                wrapped.append(self._wrap_group(item, depth + 1))
 
-        i_parent = self.gpad.get(self.j, -1)
-        if self.j not in self.tree:
-            self.tree[self.j] = {}
-        self.tree[self.j][i_parent] = k_parent
+            elif isinstance(item, dict):
+                if item.get("lexeme") in ("{", "}"):
+                    raise Errors(f"Unmatched set delimiter: {item['lexeme']} "
+                        f"at line {item.get('line')}, column "
+                        f"{item.get('column')}")
+                pig += 1
+                wrapped.append([depth, gpad, pig, item])
 
-    def _finalize(self):
-        if self.new_string and self.new_string[-1] == ",":
-            self.new_string = self.new_string[:-1]
-        self.new_string = self.new_string + "]"
-        return self.new_string
+        return [depth, gpad, wrapped]
 
 class TurboSpec:
     """
@@ -862,22 +945,6 @@ class TurboSpec:
     bottom-up evaluation
 
     """
-    def string_to_list(self, new_string):
-        ''' Convert the string back to a list '''
-
-        try:
-            obj = ast.literal_eval(new_string)
-        except SyntaxError as e:
-            raise Errors(f"String is not a list/tuple literal: {e}") from e
-
-        if isinstance(obj, list):
-            return obj
-
-        if isinstance(obj, tuple):  # allow tuples, coerce to list
-            return list(obj)
-
-        return None
-
     def precedence_list_maker(self, bracket_list):
         """
         Sort the dicts by depth, group position at depth (GPAD), position in
@@ -927,21 +994,24 @@ class TurboSpec:
 
                     precedence_list.append(new_dict)
 
-                if not bracket_list:
-                    if stack[-1] == "$$":
-                        precedence_list = sorted(precedence_list, key=lambda d:
-                            (d["line"],
+            # checked once bracket_list is drained, so that empty groups
+            # (e.g. "(())") are popped instead of spinning forever
+            if stack[-1] == "$$":
+                precedence_list = sorted(precedence_list, key=lambda d:
+                    (d["line"],
+
+                    d["depth"],
 
-                            d["depth"],
+                    d["gpad"],
 
-                            d["gpad"],
+                    d["pig"],
+                    ))
 
-                            d["pig"],
-                            ))
+                return precedence_list
 
-                        return precedence_list
+            bracket_list = stack.pop()
 
-                    bracket_list = stack.pop()
+        return precedence_list
 
     def rpn_generator(self, object_list):
         """
@@ -950,16 +1020,23 @@ class TurboSpec:
         """
         return _RpnGenerator(object_list).generate()
 
+    def compile_rpn(self, object_list):
+        """
+        Compile the parsed tree to per-line RPN lists in one pass, reading the
+        nesting of the lists directly instead of annotating, sorting and
+        rebuilding it with virtual parentheses.
+        (implementation lives in _RpnCompiler to satisfy pylint limits)
+        """
+        return _RpnCompiler(object_list).compile()
+
     def prep_bracket_list(self, object_list):
         """
         This is the hub of the RPN execution list generation.
-        Here the content, having been converted from a list into a string, gets 
-        an extra wrapper for each nested list, and the inner list will be 
-        prepended with numbers designating the nested list's left-to-right 
-        position at its nesting depth (GPAD) and a number for the depth itself, 
-        both starting at zero. Any "stranded" non-list items not actually in a  
-        list, particularly those between nestings and not at level zero (which 
-        otherwise end up getting skipped during stack storage) will get their  
-        own single wrapping with prepending of the dimension numbers.        
+        Here the parsed tree gets an extra wrapper for each nested list, and
+        the inner list will be prepended with numbers designating the nested
+        list's left-to-right position at its nesting depth (GPAD) and a number
+        for the depth itself, both starting at zero. Every token dict gets its
+        own wrapping with the same numbers plus its position in the group
+        (PIG), so that no item is skipped during stack storage.
         """
         return _PrepBracketList(self, object_list).generate()
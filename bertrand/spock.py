@@ -2,45 +2,47 @@
 The I/O for language processing and code interpretation. Spock's engine.
 
 """
-from flask import Blueprint, request, jsonify
+import codecs
+import json
+import re
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from bertrand.language_services import Chomsky
 
 bp = Blueprint('spock', __name__)
 
+def _undecodable(exc):
+    """
+    Codec error handler: replace each byte the UTF-8 decoder rejects with an
+    [UNDECODABLE:n] marker and resume after it.
+
+    """
+    if not isinstance(exc, UnicodeDecodeError):
+        raise exc
+    bad = exc.object[exc.start:exc.end]
+    return ''.join(f"[UNDECODABLE:{b}]" for b in bad), exc.end
+
+codecs.register_error('spock_undecodable', _undecodable)
+
+# lone surrogates are the only code points a str can carry that do not
+# survive a UTF-8 round trip
+_SURROGATES = re.compile('[\ud800-\udfff]')
+
 def process_string(input_string):
     """
     Process the input string to handle encoding and decode UTF-8 characters 
-    properly.
+    properly. Accepts str, or bytes-like uploads (bytes, bytearray,
+    memoryview), which are decoded in place without copying.
     
     """
     if not input_string:
         return {'success': False, 'message': "Input text cannot be empty."}, 400
 
-    processed_content = []
-    input_bytes = input_string.encode('utf-8', errors='surrogateescape') \
-        if isinstance(input_string, str) else input_string
-
-    i = 0
-    while i < len(input_bytes):
-        try:
-            char = input_bytes[i:i+1].decode("utf-8")
-            processed_content.append(char)
-            i += 1
-        except UnicodeDecodeError:
-            try:
-                char = input_bytes[i:i+2].decode("utf-8")
-                processed_content.append(char)
-                i += 2
-            except UnicodeDecodeError:
-                try:
-                    char = input_bytes[i:i+3].decode("utf-8")
-                    processed_content.append(char)
-                    i += 3
-                except UnicodeDecodeError:
-                    processed_content.append(f"[UNDECODABLE:{input_bytes[i]}]")
-                    i += 1
-
-    processed_source = ''.join(processed_content)
+    if isinstance(input_string, str):
+        if _SURROGATES.search(input_string) is None:
+            return input_string + "$$" # Add the EOF characters
+        input_string = input_string.encode('utf-8', errors='surrogateescape')
+
+    processed_source = str(input_string, 'utf-8', 'spock_undecodable')
     processed_source += "$$" # Add the EOF characters
     return processed_source
 
@@ -49,6 +51,7 @@ def analysis_route():
     """
     Handles POST requests to the /analysis endpoint.
     Extracts textInput, processes it, and generates a conclusion report.
+    The optional evalEngine field selects the evaluator.
     
     """
     try:
@@ -59,7 +62,8 @@ def analysis_route():
 
         source = process_string(input_string)
 
-        result = Chomsky.chomsky(source)
+        result = Chomsky.chomsky(source, request.form.get('evalEngine',
+            'knuth'))
 
         return jsonify({
             'success': True,
@@ -70,3 +74,90 @@ def analysis_route():
     except RuntimeError as e:
         return jsonify({'success': False, 'message': f"""Error processing input:
             {str(e)}"""}), 500
+
+@bp.route('/analysis/stream', methods=['POST'])
+def analysis_stream_route():
+    """
+    Streaming counterpart of /analysis. Writes one NDJSON record per
+    evaluated statement as soon as it is ready; an error ends the stream
+    with the same error record /analysis would return.
+
+    """
+    input_string = request.form.get('textInput', '')
+    if not input_string:
+        return jsonify({'success': False, 'message': \
+            'Input text cannot be empty.'}), 400
+
+    source = process_string(input_string)
+    eval_engine = request.form.get('evalEngine', 'knuth')
+
+    def generate():
+        for item in Chomsky.chomsky_stream(source, eval_engine):
+            if not isinstance(item, dict):
+                item = {'success': True, 'conclusion': item}
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return Response(stream_with_context(generate()),
+        mimetype='application/x-ndjson')
+
+@bp.route('/analysis/truth_table', methods=['POST'])
+def truth_table_route():
+    """
+    Pages through the truth table of one statement. Takes textInput, and
+    optionally statement (1-based, default 1), page (default 0) and
+    pageSize (default 256); writes the page as NDJSON, a header record
+    followed by one record per row, in Gray-code order.
+
+    """
+    input_string = request.form.get('textInput', '')
+    if not input_string:
+        return jsonify({'success': False, 'message': \
+            'Input text cannot be empty.'}), 400
+
+    try:
+        statement = int(request.form.get('statement', 1))
+        page = int(request.form.get('page', 0))
+        page_size = int(request.form.get('pageSize', 256))
+    except ValueError:
+        return jsonify({'success': False, 'message': \
+            'statement, page and pageSize must be integers.'}), 400
+
+    source = process_string(input_string)
+
+    def generate():
+        for item in Chomsky.chomsky_truth_table(source, page, page_size,
+            statement):
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return Response(stream_with_context(generate()),
+        mimetype='application/x-ndjson')
+
+@bp.route('/analysis/batch', methods=['POST'])
+def batch_route():
+    """
+    Grades a batch of assignments against one statement in a single
+    vectorized pass. Takes textInput, assignments (a JSON array of rows of
+    truth values), and optionally identifiers (a JSON array naming the
+    columns) and statement (1-based, default 1); returns one result per
+    row.
+
+    """
+    input_string = request.form.get('textInput', '')
+    if not input_string:
+        return jsonify({'success': False, 'message': \
+            'Input text cannot be empty.'}), 400
+
+    try:
+        statement = int(request.form.get('statement', 1))
+        assignments = json.loads(request.form.get('assignments', '[]'))
+        identifiers = request.form.get('identifiers')
+        if identifiers is not None:
+            identifiers = json.loads(identifiers)
+    except ValueError:
+        return jsonify({'success': False, 'message': \
+            'statement must be an integer and assignments and identifiers '
+            'JSON arrays.'}), 400
+
+    source = process_string(input_string)
+    return jsonify(Chomsky.chomsky_batch(source, assignments, identifiers,
+        statement))
@@ -0,0 +1,71 @@
+"""
+Marks the repository root for pytest, so the tests import the bertrand
+package from this checkout, and holds the fixtures the tests share.
+
+"""
+import random
+import pytest
+from bertrand.language_services.scanner import Shannon
+from bertrand.language_services.turing_parser import Turing
+from bertrand.language_services.dictionaries.tokens import token_dict
+from bertrand.analytical_engine.babbage_eval import Knuth
+
+_CONNECTIVES = ("∧", "∨", "→", "↔", "≡", "⨁", "↑", "↓")
+
+def _parse(source):
+    return Turing(Shannon(token_dict).scan_source(source)).parse()
+
+def _formula(rng, leaves, depth):
+    if not depth or rng.random() < 0.2:
+        return rng.choice(leaves)
+    if rng.random() < 0.15:
+        return "¬" + _formula(rng, leaves, depth - 1)
+    return f"({_formula(rng, leaves, depth - 1)} " + \
+        f"{rng.choice(_CONNECTIVES)} {_formula(rng, leaves, depth - 1)})"
+
+@pytest.fixture(name="statement")
+def fixture_statement():
+    """RPN of a formula, parsed as the only statement of a source."""
+    return lambda formula: _parse(f"1.  {formula}.$$")[0]
+
+@pytest.fixture(name="formulas")
+def fixture_formulas():
+    """
+    formulas(seed, count, leaves, depth=5): count random formulas over the
+    leaves (identifiers or constants), ¬ and the binary connectives.
+    """
+    def formulas(seed, count, leaves, depth=5):
+        rng = random.Random(seed)
+        return [_formula(rng, leaves, depth) for _ in range(count)]
+    return formulas
+
+@pytest.fixture(name="interpret")
+def fixture_interpret():
+    """
+    The value Knuth.eval_rpn() gives an RPN statement with its identifiers
+    assigned: interpret(rpn, {identifier: bool}) -> bool.
+    """
+    def interpret(rpn, assignment):
+        tokens = [dict(tok, value=assignment[tok['lexeme']]) if
+            tok['token_type'] == 'identifier' else dict(tok) for tok in rpn]
+        return Knuth([]).eval_rpn(tokens)[-1]['value']
+    return interpret
+
+@pytest.fixture(name="counted_run")
+def fixture_counted_run():
+    """
+    Evaluate a source with the interpreter alone (no compiled statements,
+    no simplification), counting the calls to one operator method:
+    counted_run(method, source) -> (printed result, calls).
+    """
+    def run(method, source):
+        calls = []
+
+        def counted(self, *args):
+            calls.append(args)
+            return getattr(Knuth, method)(self, *args)
+
+        counting = type("Counting", (Knuth,), {"jit": None, "simplifier":
+            None, method: counted})
+        return counting(_parse(source)).engine(), len(calls)
+    return run
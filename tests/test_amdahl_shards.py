@@ -0,0 +1,69 @@
+"""
+Sharded model counts against the truth table, for worker counts whose
+shards do not fall on block boundaries.
+
+"""
+import pytest
+from bertrand.language_services.Chomsky import chomsky
+from bertrand.language_services.scanner import Shannon
+from bertrand.language_services.turing_parser import Turing
+from bertrand.language_services.dictionaries.tokens import token_dict
+from bertrand.analytical_engine.babbage_eval import Knuth
+from bertrand.analytical_engine.amdahl_shards import (Amdahl, _count,
+    _prepare, _shards, _BLOCK_BITS)
+
+# 21 identifiers: 2^21 rows, so three or six workers get shards of a
+# fractional number of 2^16-row blocks before rounding
+SOURCE = "1.  " + " ∧ ".join(f"(x{i} ∨ ¬x{i + 1} ∨ x{(i * 7) % 21})" for i
+    in range(20)) + ".$$"
+
+def _rpn():
+    return Turing(Shannon(token_dict).scan_source(SOURCE)).parse()[0]
+
+def _statement(amdahl):
+    return amdahl._statement(_rpn(), amdahl.max_variables)[1]
+
+@pytest.fixture(name="expected")
+def fixture_expected():
+    return Knuth([]).truth_tables().table(_rpn()).satisfying
+
+@pytest.mark.parametrize("workers", [3, 5, 6, 7])
+def test_shards_are_whole_blocks(workers):
+    rows = 1 << 21
+    ranges = _shards(rows, workers)
+    assert ranges[0][0] == 0 and ranges[-1][1] == rows
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert all(lo % (1 << _BLOCK_BITS) == 0 for lo, _ in ranges)
+
+@pytest.mark.parametrize("workers", [3, 6])
+def test_sharded_count_matches_table(workers, expected):
+    amdahl = Amdahl(Knuth([]).truth_tables(), workers)
+    prepared = _prepare(*_statement(amdahl))
+    parts = [_count(prepared, bounds) for bounds in _shards(1 << 21, workers)]
+    assert sum(part[0] for part in parts) == expected
+
+def test_partial_block_stops_at_hi():
+    amdahl = Amdahl(Knuth([]).truth_tables(), 1)
+    prepared = _prepare(*_statement(amdahl))
+    block = 1 << _BLOCK_BITS
+    whole = _count(prepared, (0, 3 * block))
+    head = _count(prepared, (0, 2 * block + 1000))
+    tail = _count(prepared, (2 * block, 3 * block))
+    rest = _count(prepared, (2 * block, 2 * block + 1000))
+    assert head[0] == whole[0] - tail[0] + rest[0]
+
+def test_pool_with_three_workers(expected):
+    amdahl = Amdahl(Knuth([]).truth_tables(), 3)
+    amdahl.parallel_threshold = 20
+    count = amdahl.count_batch(_rpn())
+    assert count.satisfying == expected
+    assert count.rows == 1 << 21
+
+def test_boole_engine_shards_past_the_truth_table_limit(monkeypatch):
+    # 13 independent pairs over 26 identifiers: 3^13 of 2^26 rows are true
+    source = "1.  " + " ∧ ".join(f"(y{2 * i} ∨ y{2 * i + 1})" for i in
+        range(13)) + ".$$"
+    amdahl = Amdahl(Knuth([]).truth_tables(), 3)
+    monkeypatch.setattr(Knuth, "_amdahl", amdahl)
+    report = chomsky(source, "boole")
+    assert report.startswith(f"contingency ({3 ** 13} of {1 << 26} rows true)")
@@ -0,0 +1,52 @@
+"""
+Truth tables against the interpreter, row by row.
+
+"""
+import pytest
+from bertrand.language_services.Chomsky import chomsky
+from bertrand.language_services.dictionaries.errors import Errors
+from bertrand.analytical_engine.babbage_eval import Knuth
+from bertrand.analytical_engine.boole_table import variable_mask
+
+@pytest.mark.parametrize("seed", range(3))
+def test_mask_matches_eval_rpn(seed, statement, formulas, interpret):
+    boole = Knuth([]).truth_tables()
+    for formula in formulas(seed, 40, ("a", "b", "c", "d", "⊤", "⊥")):
+        rpn = statement(formula)
+        table = boole.table(rpn)
+        assert table.satisfying == bin(table.mask).count("1")
+        for row in range(table.rows):
+            assignment, result = table.row(row)
+            assert result == bool((table.mask >> row) & 1)
+            assert interpret(rpn, dict(zip(table.identifiers,
+                assignment))) is result
+
+def test_rows_put_the_first_identifier_highest(statement):
+    table = Knuth([]).truth_tables().table(statement("p ∧ ¬q"))
+    assert table.identifiers == ("p", "q") and table.rows == 4
+    assert [table.row(row) for row in range(4)] == [((False, False), False),
+        ((False, True), False), ((True, False), True), ((True, True), False)]
+
+def test_variable_masks():
+    assert variable_mask(0, 3) == 0b11110000
+    assert variable_mask(1, 3) == 0b11001100
+    assert variable_mask(2, 3) == 0b10101010
+
+def test_report(statement):
+    boole = Knuth([]).truth_tables()
+    assert boole.table(statement("p → q")).report() == \
+        "contingency (3 of 4 rows true)"
+    assert boole.table(statement("p ∨ ¬p")).report() == \
+        "tautology (2 of 2 rows true)"
+    assert boole.table(statement("(p ∧ q) ∧ ¬p")).to_map() == {
+        "identifiers": ["p", "q"], "rows": 4, "satisfying": 0,
+        "verdict": "contradiction"}
+    assert chomsky("1.  p ∨ ¬p;\n2.  p ∧ ¬p.$$", "boole") == \
+        "tautology (2 of 2 rows true)\ncontradiction (0 of 2 rows true)\n"
+
+def test_statements_without_a_table(statement):
+    boole = Knuth([]).truth_tables()
+    assert boole.table(statement("set {a} ∈ b")) is None
+    with pytest.raises(Errors):
+        boole.table(statement(" ∧ ".join(f"x{i}" for i in range(
+            boole.max_variables + 1))))
@@ -0,0 +1,43 @@
+"""
+Decision diagrams against the truth tables, and the canonical forms the
+bryant engine reports.
+
+"""
+import random
+import pytest
+from bertrand.language_services import Chomsky
+from bertrand.analytical_engine.babbage_eval import Knuth
+from bertrand.analytical_engine.bryant_bdd import Bryant, TRUE
+
+@pytest.mark.parametrize("seed", range(4))
+def test_counts_and_canonical_forms(seed, statement, formulas):
+    rng = random.Random(seed)
+    boole = Knuth([]).truth_tables()
+    for formula in formulas(seed, 50, "abcdef"):
+        rpn = statement(formula)
+        table = boole.table(rpn)
+        bdd = Bryant(boole, order=rng.sample("abcdef", 6))
+        node = bdd.build(rpn)
+        assert bdd.count(node, table.identifiers) == table.satisfying
+        form = bdd.canonical(node)
+        if not isinstance(form, bool):
+            # the canonical form has the same node, under the same manager
+            assert bdd.build(statement(form)) == node
+
+def test_equivalent_statements_share_a_node(statement):
+    bdd = Bryant(Knuth([]).truth_tables())
+    assert bdd.equivalent(statement("p → q"), statement("¬q → ¬p"))
+    assert not bdd.equivalent(statement("p → q"), statement("q → p"))
+    assert bdd.build(statement("(p ∧ q) ∨ (p ∧ ¬q)")) == bdd.variable("p")
+    assert bdd.build(statement("p ∨ ¬p")) == TRUE
+
+def test_bryant_engine_reports_canonical_forms():
+    source = "1.  (p → q) ≡ (¬p ∨ q);\n2.  (p ∧ q) ∨ (p ∧ ¬q);\n" + \
+        "3.  p ∧ ¬p.$$"
+    assert Chomsky.chomsky(source, "bryant") == "True\np\nFalse\n"
+
+def test_chomsky_equivalence():
+    result = Chomsky.chomsky_equivalence("1.  p → q;\n2.  ¬q → ¬p.$$")
+    assert result["equivalent"] and result["models"] == [3, 3]
+    result = Chomsky.chomsky_equivalence("1.  p → q;\n2.  q → p.$$")
+    assert result["success"] and not result["equivalent"]
@@ -0,0 +1,99 @@
+"""
+The SAT engine against the truth tables, and the CDCL solver's unit
+propagation and conflict-driven backjumping.
+
+"""
+import pytest
+from bertrand.language_services.Chomsky import chomsky
+from bertrand.analytical_engine.babbage_eval import Knuth
+from bertrand.analytical_engine.davis_sat import Solver
+
+def _holds(table, assignment):
+    # the truth table's result for an identifier -> bool assignment
+    count = len(table.identifiers)
+    row = sum(assignment[name] << (count - 1 - i) for i, name in
+        enumerate(table.identifiers))
+    return bool((table.mask >> row) & 1)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_engine_agrees_with_truth_tables(seed, statement, formulas):
+    knuth = Knuth([])
+    boole = knuth.truth_tables()
+    davis = knuth.sat_solver()
+    for formula in formulas(seed, 50, ("a", "b", "c", "d", "e", "⊤", "⊥")):
+        rpn = statement(formula)
+        table = boole.table(rpn)
+        if table is None or not table.identifiers:
+            continue
+        assert davis.is_tautology(rpn) == (table.verdict == "tautology")
+        assert davis.is_satisfiable(rpn) == (table.verdict != "contradiction")
+        assert davis.report(rpn).split(";")[0] == table.verdict
+
+        model = davis.find_model(rpn)
+        if model is not None:
+            assert _holds(table, model)
+        counterexample = davis.find_counterexample(rpn)
+        if counterexample is not None:
+            assert not _holds(table, counterexample)
+
+def test_report_names_a_counterexample(statement):
+    davis = Knuth([]).sat_solver()
+    assert davis.report(statement("p → q")) == \
+        "contingency; counterexample: p=True, q=False"
+    assert davis.report(statement("set {a} ∈ b")) is None
+    assert chomsky("1.  (p → q) ↔ (¬q → ¬p);\n2.  p ∧ ¬p.$$", "davis") == \
+        "tautology\ncontradiction\n"
+
+def test_past_the_truth_table_limit(statement):
+    davis = Knuth([]).sat_solver()
+    names = [f"x{i}" for i in range(40)]
+    chain = " ∧ ".join(f"({a} → {b})" for a, b in zip(names, names[1:]))
+    assert davis.is_tautology(statement(f"({chain}) → (x0 → x39)"))
+    # the chain holds with x39 False only if every identifier is False
+    counterexample = davis.find_counterexample(statement(f"({chain}) → x39"))
+    assert counterexample == dict.fromkeys(names, False)
+
+def test_conjunctive_normal_form_encodes_to_its_own_clauses(statement):
+    cnf = Knuth([]).sat_solver().cnf(statement("(a ∨ ¬b) ∧ (b ∨ c)"))
+    assert cnf.variables == 3 and not cnf.clauses
+    assert cnf.assert_root(True) == [[1, -2], [2, 3]]
+
+def test_unit_clauses_propagate():
+    assert Solver(3, [[1], [-1, 2], [-2, 3]]).solve() == \
+        {1: True, 2: True, 3: True}
+    assert Solver(2, [[1], [-1, 2], [-2]]).solve() is None
+    solver = Solver(2, [[1, 2]])
+    assert solver.solve([-1]) == {1: False, 2: True}
+    assert solver.solve([-2]) is None
+
+class _Jumping(Solver):
+    """Solver recording each backjump as (from level, to level)."""
+
+    def __init__(self, variables, clauses):
+        self.jumps = []
+        super().__init__(variables, clauses)
+
+    def _backjump(self, level):
+        self.jumps.append((len(self.trail_lim), level))
+        super()._backjump(level)
+
+def test_conflicts_backjump_past_unrelated_decisions():
+    # x1, x2 and x3 are decided False in that order; x3 then forces x4 both
+    # ways, and the learnt clause (x1 ∨ x3) jumps back over x2's level
+    solver = _Jumping(4, [[1, 3, 4], [1, 3, -4]])
+    model = solver.solve()
+    assert (3, 1) in solver.jumps
+    assert model[3] and not model[1]
+
+    # a learnt unit clause jumps to the top level
+    solver = _Jumping(4, [[3, 4], [3, -4]])
+    model = solver.solve()
+    assert (3, 0) in solver.jumps
+    assert model[3]
+
+def test_pigeonhole_is_unsatisfiable():
+    # three pigeons, two holes: pigeon p in hole h is variable 2p + h + 1
+    clauses = [[2 * p + 1, 2 * p + 2] for p in range(3)]
+    clauses += [[-(2 * p + h + 1), -(2 * q + h + 1)] for h in range(2) for
+        p in range(3) for q in range(p + 1, 3)]
+    assert Solver(6, clauses).solve() is None
@@ -0,0 +1,67 @@
+"""
+Parity of the selectable engines over a small corpus: the Thompson and
+VonNeumann scanners, the climb and sort RPN compilers, and the Knuth
+interpreter, its Lovelace compiled functions and the Jacquard VM.
+
+"""
+import pytest
+from bertrand.language_services.Chomsky import chomsky
+from bertrand.language_services.scanner import Shannon
+from bertrand.language_services.turing_parser import Turing
+from bertrand.language_services.dictionaries.tokens import token_dict
+from bertrand.analytical_engine.babbage_eval import Knuth
+from bertrand.analytical_engine.lovelace_compile import Lovelace
+
+CORPUS = [
+    "1.  p ∧ q.$$",
+    "1.  p ∨ ¬p;\n2.  p ∧ ¬p.$$",
+    "1.  ((p → q) ∧ (q → r)) → (p → r).$$",
+    "1.  (p ↔ q) ≡ ((p → q) ∧ (q → p)).$$",
+    "1.  p ⨁ q ⨁ r;\n2.  p ↑ (q ↓ r).$$",
+    "1.  ⊤ ∧ p;\n2.  ⊥ ∨ (p ∧ ⊥);\n3.  T → F.$$",
+    "1.  ¬(p ∧ q) ↔ (¬p ∨ ¬q).$$",
+    "1.  ∀p → ∃q;\n2.  ¬∃p ∧ ¬∀q.$$",
+    "1.  !p ∨ !(q ∧ r).$$",
+    "1.  set {a, b} ∈ c.$$",
+    "1.  (p ∧ q) / r ≡ ⊥;\n2.  q ∧ p.$$",
+    "1.  p / q ≡ ⊤;\n2.  q ∧ p.$$",
+    "1.  p → (q → (r → (s → (t → p)))).$$",
+]
+
+def _tokens(source, engine):
+    return [(tok.lexeme, tok.token_type, tok.line, tok.column) for tok in
+        Shannon(token_dict, engine, cache_lines=False).scan_source(source)]
+
+def _rpn(source, engine, monkeypatch):
+    monkeypatch.setattr(Turing, "rpn_engine", engine)
+    tokens = Shannon(token_dict).scan_source(source)
+    return [[tok.get("lexeme") for tok in statement] for statement in
+        Turing(tokens).parse()]
+
+@pytest.mark.parametrize("source", CORPUS)
+def test_scanners_agree(source):
+    assert _tokens(source, "thompson") == _tokens(source, "vonneumann")
+
+@pytest.mark.parametrize("source", CORPUS)
+def test_rpn_compilers_agree(source, monkeypatch):
+    assert _rpn(source, "climb", monkeypatch) == \
+        _rpn(source, "sort", monkeypatch)
+
+@pytest.mark.parametrize("source", CORPUS)
+def test_evaluators_agree(source, monkeypatch):
+    monkeypatch.setattr(Knuth, "jit", None)
+    interpreted = chomsky(source)
+    assert chomsky(source, "jacquard") == interpreted
+
+    # promoted on first sight, then served compiled and verbatim
+    monkeypatch.setattr(Knuth, "jit", Lovelace(threshold=1))
+    assert chomsky(source) == interpreted
+    assert chomsky(source) == interpreted
+
+def test_vm_assembles_each_shape_once():
+    first, second = Turing(Shannon(token_dict).scan_source(
+        "1.  p ∧ (q ∨ ⊤);\n2.  r ∧ (s ∨ ⊥).$$")).parse()
+    vm = Knuth([]).vm()
+    assert vm.lower(first).code is vm.lower(second).code
+    assert vm.run(first)[0]["lexeme"] == "(p ∧ True)"
+    assert vm.run(second)[0]["lexeme"] == "(r ∧ (s ∨ False))"
@@ -0,0 +1,34 @@
+"""
+Interned residual terms: sharing, and the text they print.
+
+"""
+from bertrand.language_services import Chomsky
+from bertrand.language_services.scanner import Shannon
+from bertrand.language_services.turing_parser import Turing
+from bertrand.language_services.dictionaries.tokens import token_dict
+from bertrand.analytical_engine.babbage_eval import Knuth
+from bertrand.analytical_engine.frege_terms import Frege, Term
+
+def test_equal_terms_are_one_object():
+    terms = Frege()
+    a = terms.term(" ∧ ", "p", terms.term("¬", "q"))
+    assert a is terms.term(" ∧ ", "p", terms.term("¬", "q"))
+    assert a is not terms.term(" ∨ ", "p", terms.term("¬", "q"))
+    assert str(a) == "(p ∧ (¬q))"
+
+def test_residuals_are_terms_until_printed():
+    source = "1.  (p ∧ r) ∨ ¬q;\n2.  (p ∧ r) ∨ ¬q.$$"
+    evaluator = Knuth(Turing(Shannon(token_dict).scan_source(source)).parse())
+    evaluator.jit = None
+    first, second = (evaluator.eval_statement(rpn)[-1]['lexeme'] for rpn in
+        evaluator.code)
+    assert isinstance(first, Term) and first is second
+    assert evaluator.pretty_print([[{'lexeme': first, 'token_type':
+        'identifier'}]]) == "((p ∧ r) ∨ (¬q))\n"
+
+def test_deep_residual_prints_whole():
+    count = 5000
+    source = "1.  " + " ∧ ".join(f"x{i}" for i in range(count)) + ".$$"
+    text = Chomsky.chomsky(source).strip()
+    assert text.startswith("(" * (count - 1) + "x0 ∧ x1)")
+    assert text.endswith(f" ∧ x{count - 1})")
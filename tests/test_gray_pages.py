@@ -0,0 +1,72 @@
+"""
+Gray-code truth-table pages: every row exactly once, neighbours one
+identifier apart, and results as the interpreter gives them.
+
+"""
+import pytest
+from bertrand.language_services.Chomsky import chomsky_truth_table
+from bertrand.language_services.dictionaries.errors import Errors
+from bertrand.analytical_engine.babbage_eval import Knuth
+from bertrand.analytical_engine.gray_pages import Gray, gray_mask
+
+def _pages(pager, lowered, page_size):
+    rows = []
+    page = 0
+    while True:
+        rows_out = list(pager.page(lowered, page, page_size))
+        if not rows_out:
+            return rows
+        rows += rows_out
+        page += 1
+
+@pytest.mark.parametrize("page_size", [1, 3, 16, 100])
+def test_pages_cover_every_row_once(page_size, statement, interpret):
+    rpn = statement("(a ⨁ b) → (c ∨ ¬d)")
+    pager = Knuth([]).pager()
+    lowered = pager.lower(("test", 1), lambda: rpn)
+    identifiers = lowered[1]
+    rows = _pages(pager, lowered, page_size)
+
+    assert [row for row, _, _ in rows] == list(range(16))
+    assignments = [tuple(values) for _, values, _ in rows]
+    assert len(set(assignments)) == 16
+    for (_, before, _), (_, after, _) in zip(rows, rows[1:]):
+        assert sum(x != y for x, y in zip(before, after)) == 1
+    for _, values, result in rows:
+        assert interpret(rpn, dict(zip(identifiers, values))) is result
+
+def test_gray_mask_matches_the_gray_code():
+    for bit in range(4):
+        for start in range(0, 40, 7):
+            mask = gray_mask(bit, start, 9)
+            assert [bool((mask >> j) & 1) for j in range(9)] == [bool((
+                (k ^ (k >> 1)) >> bit) & 1) for k in range(start, start + 9)]
+
+def test_bad_pages(statement):
+    pager = Knuth([]).pager()
+    lowered = pager.lower(("test", 2), lambda: statement("p ∧ q"))
+    assert not list(pager.page(lowered, 5, 4))
+    for page, page_size in ((-1, 4), (0, 0), (0, pager.max_page_size + 1)):
+        with pytest.raises(Errors):
+            pager.page(lowered, page, page_size)
+
+def test_lowered_statements_are_cached(statement):
+    pager = Gray(Knuth([]).truth_tables(), maxsize=2)
+    lowerings = []
+
+    def rpn(formula):
+        return lambda: lowerings.append(formula) or statement(formula)
+
+    first = pager.lower("first", rpn("p"))
+    assert pager.lower("first", rpn("p")) is first
+    pager.lower("second", rpn("q"))
+    pager.lower("third", rpn("r"))
+    pager.lower("first", rpn("p"))
+    assert lowerings == ["p", "q", "r", "p"]
+
+def test_chomsky_truth_table():
+    records = list(chomsky_truth_table("1.  p → q.$$", page=0, page_size=3))
+    assert records[0] == {"success": True, "identifiers": ["p", "q"],
+        "rows": 4, "page": 0, "page_size": 3, "pages": 2}
+    assert [record["values"] for record in records[1:]] == [[False, False],
+        [False, True], [True, True]]
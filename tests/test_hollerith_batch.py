@@ -0,0 +1,57 @@
+"""
+Batch evaluation against the interpreter, with NumPy and with the
+pure-Python bitset fallback.
+
+"""
+import random
+import pytest
+from bertrand.language_services.dictionaries.errors import Errors
+from bertrand.analytical_engine.babbage_eval import Knuth
+from bertrand.analytical_engine import hollerith_batch
+from bertrand.analytical_engine.hollerith_batch import Hollerith
+
+@pytest.fixture(name="tabulator", params=[True, False], ids=["numpy",
+    "python"])
+def fixture_tabulator(request):
+    if request.param and hollerith_batch.np is None:
+        pytest.skip("NumPy is not installed")
+    tabulator = Hollerith(Knuth([]).truth_tables(), use_numpy=request.param)
+    assert tabulator.numpy == request.param
+    return tabulator
+
+@pytest.mark.parametrize("seed", range(3))
+def test_batch_matches_eval_rpn(seed, tabulator, statement, formulas,
+    interpret):
+    rng = random.Random(seed)
+    for formula in formulas(seed, 30, ("a", "b", "c", "d", "⊤", "⊥")):
+        rpn = statement(formula)
+        names = tabulator.identifiers(rpn)
+        rows = [[rng.random() < 0.5 for _ in names] for _ in range(20)]
+        results = tabulator.evaluate(rpn, rows)
+        assert [bool(result) for result in results] == [interpret(rpn,
+            dict(zip(names, row))) for row in rows]
+
+def test_columns_by_name(tabulator, statement):
+    # columns in any order, with one the statement does not use
+    results = tabulator.evaluate(statement("p ∧ ¬q"), [[True, False, True],
+        [False, True, True], [False, True, False]], ["q", "r", "p"])
+    assert [bool(result) for result in results] == [False, True, False]
+
+def test_empty_and_malformed_batches(tabulator, statement):
+    rpn = statement("p → q")
+    assert list(tabulator.evaluate(rpn, [])) == []
+    with pytest.raises(Errors):
+        tabulator.evaluate(rpn, [[True, False], [True]])
+    with pytest.raises(Errors):
+        tabulator.evaluate(rpn, [[True]], ["p"])
+    assert tabulator.evaluate(statement("set {a} ∈ b"), [[True]]) is None
+
+def test_table_chunks_match_the_truth_table(tabulator, statement):
+    rpn = statement("(a ⨁ b) → (c ∨ ¬d)")
+    table = Knuth([]).truth_tables().table(rpn)
+    rows = []
+    for start, chunk in tabulator.table_chunks(rpn, chunk_rows=3):
+        assert start == len(rows)
+        rows += [bool(result) for result in chunk]
+    assert rows == [bool((table.mask >> row) & 1) for row in
+        range(table.rows)]
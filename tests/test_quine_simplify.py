@@ -0,0 +1,63 @@
+"""
+Simplified statements against the statements as written: the same known
+results, and residuals with the same truth function.
+
+"""
+import random
+import pytest
+from bertrand.language_services import Chomsky
+from bertrand.language_services.scanner import Shannon
+from bertrand.language_services.turing_parser import Turing
+from bertrand.language_services.dictionaries.tokens import token_dict
+from bertrand.analytical_engine.babbage_eval import Knuth
+from bertrand.analytical_engine.bryant_bdd import Bryant
+from bertrand.analytical_engine.quine_simplify import Quine
+
+_OPERATORS = ("∧", "∨", "→", "↔", "≡", "⨁", "↑", "↓")
+
+def _parse(source):
+    return Turing(Shannon(token_dict).scan_source(source)).parse()
+
+def _formula(rng, depth):
+    if not depth or rng.random() < 0.2:
+        return rng.choice(("p", "q", "r", "⊤", "⊥"))
+    if rng.random() < 0.15:
+        return "¬" + _formula(rng, depth - 1)
+    return f"({_formula(rng, depth - 1)} {rng.choice(_OPERATORS)} " + \
+        f"{_formula(rng, depth - 1)})"
+
+def _evaluate(source, simplifier):
+    evaluator = Knuth(_parse(source))
+    evaluator.jit = None
+    evaluator.simplifier = simplifier
+    return evaluator.engine().splitlines()
+
+@pytest.mark.parametrize("seed", range(4))
+def test_simplified_results_agree(seed):
+    rng = random.Random(seed)
+    bdd = Bryant(Knuth([]).truth_tables())
+    formulas = [_formula(rng, 5) for _ in range(60)]
+    source = "".join(f"{n + 1}.  {formula};\n" for n, formula in
+        enumerate(formulas))[:-2] + ".$$"
+    for written, simplified in zip(_evaluate(source, None),
+        _evaluate(source, Quine())):
+        if written in ("True", "False"):
+            assert simplified == written
+            continue
+        assert simplified not in ("True", "False")
+        assert len(simplified) <= len(written)
+        assert bdd.equivalent(*(_parse(f"1.  {text}.$$")[0] for text in
+            (written, simplified)))
+
+def test_rules():
+    source = "1.  (p ∧ ⊤) ∨ ¬q;\n2.  ¬p ∧ ¬q;\n3.  p ∧ (p ∨ q);\n" + \
+        "4.  (p → ⊥) ∨ (r ∧ r);\n5.  ⊥ ∧ (p ∨ q ∨ r);\n6.  ¬(¬p ∧ ¬q).$$"
+    assert Chomsky.chomsky(source) == "(p ∨ (¬q))\n(¬(p ∨ q))\np\n" + \
+        "((¬p) ∨ r)\nFalse\n(p ∨ q)\n"
+
+def test_budget_bounds_rules():
+    rpn = _parse("1.  ((p ∧ ⊤) ∧ ⊤) ∧ ⊤.$$")[0]
+    vm = Knuth([]).vm()
+    assert [tok['lexeme'] for tok in Quine(budget=2).simplify(rpn, vm)] == \
+        ["p", "True", "∧"]
+    assert Quine(budget=0).simplify(rpn, vm) is rpn
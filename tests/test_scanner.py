@@ -0,0 +1,85 @@
+"""
+Scanner regressions: the line cache replays only unchanged lines, and
+columns point into the text as submitted.
+
+"""
+import pytest
+from bertrand.language_services.scanner import Shannon, Thompson, LineCache, \
+    OffsetMap
+from bertrand.language_services.dictionaries.tokens import token_dict
+
+def _scan(source, cache_lines=True):
+    return [(tok.lexeme, tok.token_type, tok.line, tok.column) for tok in
+        Shannon(token_dict, cache_lines=cache_lines).scan_source(source)]
+
+@pytest.fixture(name="line_cache")
+def fixture_line_cache():
+    # the line cache every Thompson lexer over token_dict shares
+    cache = Thompson(token_dict).line_cache
+    cache.clear()
+    yield cache
+    cache.clear()
+
+def test_edited_line_is_rescanned(line_cache):
+    source = "1.  p ∧ q;\n2.  (p → r), s;\n3.  ¬p.$$"
+    assert _scan(source) == _scan(source, cache_lines=False)
+    assert len(line_cache) == 3
+    # a replay, then the same lines with the second one edited
+    assert _scan(source) == _scan(source, cache_lines=False)
+    edited = source.replace("(p → r), s", "(p → t), s ∨ r")
+    assert _scan(edited) == _scan(edited, cache_lines=False)
+    assert len(line_cache) == 4
+
+def test_replayed_line_moves_with_its_line_number(line_cache):
+    _scan("1.  p ∧ q;\n2.  r, s.$$")
+    moved = "1.  t;\n2.  u, v;\n3.  p ∧ q;\n4.  r, s.$$"
+    assert _scan(moved) == _scan(moved, cache_lines=False)
+
+def test_least_recently_used_line_is_evicted():
+    cache = LineCache(maxsize=2)
+    cache.put("a", ((), 0))
+    cache.put("b", ((), 0))
+    cache.get("a")
+    cache.put("c", ((), 0))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.put("c", ((), 1))
+    assert len(cache) == 2 and cache.get("c") == ((), 1)
+
+@pytest.mark.parametrize("cache_lines", [True, False])
+def test_columns_after_stripped_comments(cache_lines, line_cache):
+    # a comment counts for its width, as if it were blanked out
+    source = "1.  p /* note */ ∧ q;\n2.  r /* x */ ∨ s.$$"
+    blanked = "1.  p            ∧ q;\n2.  r         ∨ s.$$"
+    assert _scan(source, cache_lines) == _scan(blanked, cache_lines)
+    assert ("∧", "operator", 1, 16) in [token[:4] for token in _scan(source,
+        cache_lines)]
+
+@pytest.mark.parametrize("cache_lines", [True, False])
+def test_columns_after_crlf(cache_lines, line_cache):
+    source = "1.  p ∧ q;\n2.  r /* x */ ∨ s.$$"
+    assert _scan(source.replace("\n", "\r\n"), cache_lines) == _scan(source,
+        cache_lines)
+
+def test_offset_map_original():
+    offsets = OffsetMap()
+    assert offsets.original(7) == 7
+    # four characters dropped before offset 5, two more before offset 9
+    offsets.add(5, 9)
+    offsets.add(9, 15)
+    assert [offsets.original(pos) for pos in (0, 4, 5, 8, 9, 12)] == [0, 4,
+        9, 12, 15, 18]
+    assert offsets.column(12, 5) == 9
+
+@pytest.mark.parametrize("engine", ["thompson", "vonneumann"])
+def test_negations_fold_alike(engine):
+    # '!' folds exactly as '¬' does, including the '!∉' pair
+    for symbol in ("¬", "∧", "∨", "⨁", "↓", "↑", "≡", "∃", "∀", "∈", "∉",
+        "⊤", "⊥"):
+        tokens = [[(tok.lexeme, tok.token_type, tok.column) for tok in
+            Shannon(token_dict, engine=engine, cache_lines=False).scan_source(
+            f"1.  a {negation}{symbol} b.$$")] for negation in ("¬", "!")]
+        assert tokens[0] == tokens[1]
+    folded = Shannon(token_dict, engine=engine, cache_lines=False
+        ).scan_source("1.  a !∉ b.$$")
+    assert (folded[1].lexeme, folded[1].column) == ("∈", 6)
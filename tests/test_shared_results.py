@@ -0,0 +1,26 @@
+"""
+Results shared within a document: repeated statements and subterms are
+evaluated once, and substitution keeps its rewrites.
+
+"""
+import pytest
+
+@pytest.fixture(name="run")
+def fixture_run(counted_run):
+    # output and number of implications evaluated
+    return lambda source: counted_run("imp", source)
+
+def test_repeated_statement_is_evaluated_once(run):
+    assert run("1.  (p → q) ∧ r;\n2.  (p → q) ∧ r;\n3.  (p → q) ∧ r.$$") \
+        == ("((p → q) ∧ r)\n" * 3, 1)
+
+def test_repeated_subterm_is_evaluated_once(run):
+    assert run("1.  (p → q) ∧ r;\n2.  s ∨ ((p → q) ∧ r);\n" +
+        "3.  (p → q) ⨁ s.$$") == ("((p → q) ∧ r)\n(s ∨ ((p → q) ∧ r))\n" +
+        "((p → q) ⨁ s)\n", 1)
+
+def test_substitution_is_not_shared(run):
+    # ⊤ / p rewrites p in its own statement only
+    written, calls = run("1.  (p → q) ∧ (⊤ / p ≡ q);\n2.  p → q.$$")
+    assert written.splitlines()[1] == "(p → q)"
+    assert calls == 2
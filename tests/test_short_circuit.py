@@ -0,0 +1,23 @@
+"""
+Operands a decided left operand makes irrelevant are skipped, except where
+skipping would lose a substitution.
+
+"""
+import pytest
+
+@pytest.fixture(name="run")
+def fixture_run(counted_run):
+    # output and number of disjunctions evaluated
+    return lambda source: counted_run("inc_or", source)
+
+def test_decided_operand_is_skipped(run):
+    assert run("1.  ⊥ ∧ ((p ∨ q) ∨ r);\n2.  (⊥ → (p ∨ q)) ∧ ⊥.$$") == \
+        ("False\nFalse\n", 0)
+    assert run("1.  ⊤ ∧ (p ∨ q).$$") == ("(True ∧ (p ∨ q))\n", 1)
+
+def test_chained_connectives_are_skipped_together(run):
+    assert run("1.  ((⊤ ∨ (p ∨ q)) ∨ (q ∨ r)) ∨ r.$$") == ("True\n", 0)
+
+def test_substitution_in_skipped_operand_still_happens(run):
+    # ⊤ / p rewrites the p after it, which decides the disjunction
+    assert run("1.  (⊥ ∧ (⊤ / p ≡ q)) ∨ p.$$")[0] == "True\n"
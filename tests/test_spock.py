@@ -0,0 +1,30 @@
+"""
+Decoding of submitted text: four-byte characters survive, and every byte
+the UTF-8 decoder rejects becomes an [UNDECODABLE:n] marker.
+
+"""
+import pytest
+from bertrand.spock import process_string
+
+@pytest.mark.parametrize("text", ["1.  𝔭 ∧ q.", "1.  p ∧ q."])
+def test_text_decodes_to_itself(text):
+    assert process_string(text) == text + "$$"
+    assert process_string(text.encode("utf-8")) == text + "$$"
+    assert process_string(bytearray(text.encode("utf-8"))) == text + "$$"
+    assert process_string(memoryview(text.encode("utf-8"))) == text + "$$"
+
+def test_undecodable_bytes_are_marked_one_by_one():
+    # a stray byte, then a four-byte sequence cut short
+    assert process_string(b"p \xff\xf0\x9d\x94") == "p [UNDECODABLE:255]" + \
+        "[UNDECODABLE:240][UNDECODABLE:157][UNDECODABLE:148]$$"
+    # a lead byte without its continuation does not swallow the next one
+    assert process_string(b"\xf0p") == "[UNDECODABLE:240]p$$"
+
+def test_smuggled_bytes_in_str_are_marked():
+    # bytes carried in a str as lone surrogates (surrogateescape)
+    text = b"p \xff \xf0\x9d\x94\xad".decode("utf-8", "surrogateescape")
+    assert process_string(text) == "p [UNDECODABLE:255] 𝔭$$"
+
+def test_empty_input_is_refused():
+    assert process_string("")[1] == 400
+    assert process_string(b"")[1] == 400
@@ -0,0 +1,33 @@
+"""
+Streaming evaluation keeps nothing across statements, so its memory does
+not grow with the length of the document.
+
+"""
+import gc
+import tracemalloc
+import pytest
+from bertrand.language_services.scanner import Shannon
+from bertrand.language_services.turing_parser import Turing
+from bertrand.language_services.dictionaries.tokens import token_dict
+from bertrand.analytical_engine.babbage_eval import Knuth
+
+def _peak(statements, engine):
+    # every statement is new, so nothing a cache keeps is ever reused
+    source = ";\n".join(f"{i + 1}.  (p{i} → q{i}) ∧ (r{i} ∨ p{i})" for i in
+        range(statements)) + ".$$"
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tokens = Shannon(token_dict, cache_lines=False).iter_tokens(source)
+        for _ in Knuth(Turing.parse_stream(tokens), engine).engine_stream():
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+@pytest.mark.parametrize("engine", ["knuth", "jacquard"])
+def test_stream_memory_stays_flat(monkeypatch, engine):
+    monkeypatch.setattr(Knuth, "jit", None)
+    _peak(10, engine)      # builds the scanner tables and the VM
+    short = _peak(500, engine)
+    assert _peak(2000, engine) < 1.5 * short
@@ -0,0 +1,31 @@
+"""
+Substitution through the per-statement position index, which must follow
+the identifiers substitutions respell.
+
+"""
+from bertrand.language_services import Chomsky
+from bertrand.analytical_engine.babbage_eval import Knuth
+
+def _tok(lexeme, **fields):
+    return {'lexeme': lexeme, 'token_type': 'identifier', 'value': "unknown",
+        **fields}
+
+def test_sequential_indexes_then_lexemes():
+    rpn = [_tok("x", index=2), _tok("y", index=1), _tok("z", index=2),
+        _tok("w", index=3)]
+    evaluator = Knuth([])
+    # index 1 at position 1, then index 2 and 3 from there on
+    evaluator.subst(rpn, _tok("v"), {'lexeme': 1, 'token_type': 'number',
+        'value': 1})
+    assert [tok['lexeme'] for tok in rpn] == ["x", "v", "v", "v"]
+    # the respelled identifiers are found by their new lexeme
+    evaluator.subst(rpn, _tok("u"), _tok("v"))
+    assert [tok['lexeme'] for tok in rpn] == ["x", "u", "u", "u"]
+    assert evaluator.subst(rpn, _tok("t"), _tok("v")) is not None
+    assert [tok['lexeme'] for tok in rpn] == ["x", "u", "u", "u"]
+
+def test_chained_substitutions():
+    source = "1.  (p / q ≡ q) ∧ (r / p ≡ (p ∨ q)) ∧ (⊤ / r ≡ r).$$"
+    # q is respelled p, then every p r; ⊤ / r sets r's value only
+    assert Chomsky.chomsky(source) == "((((p / q) ≡ p) ∧ ((r / p) ≡ " + \
+        "(r ∨ r))) ∧ ((True / r) ≡ r))\n"